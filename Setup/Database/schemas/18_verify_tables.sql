@@ -0,0 +1,47 @@
+-- Server-side table verification used by Setup/verify_databases.py
+-- Keep the expected table lists in sync with EXPECTED_TABLES there.
+
+DROP PROCEDURE IF EXISTS world_sim_simulations.sim_verify_tables;
+
+DELIMITER //
+
+-- Returns one (table_schema, table_name) row per expected table that is missing
+CREATE PROCEDURE world_sim_simulations.sim_verify_tables(
+    IN agents_db VARCHAR(64),
+    IN firms_db VARCHAR(64),
+    IN sim_db VARCHAR(64)
+)
+READS SQL DATA
+BEGIN
+    SELECT expected.table_schema, expected.table_name
+    FROM (
+        SELECT agents_db AS table_schema, 'agents' AS table_name
+        UNION ALL SELECT agents_db, 'agent_experiences'
+        UNION ALL SELECT agents_db, 'agent_personal_summaries'
+        UNION ALL SELECT agents_db, 'l2_agent_core'
+        UNION ALL SELECT agents_db, 'l2_geo'
+        UNION ALL SELECT agents_db, 'l2_location'
+        UNION ALL SELECT agents_db, 'l2_other_part_1'
+        UNION ALL SELECT agents_db, 'l2_other_part_2'
+        UNION ALL SELECT agents_db, 'l2_other_part_3'
+        UNION ALL SELECT agents_db, 'l2_other_part_4'
+        UNION ALL SELECT agents_db, 'l2_political_part_1'
+        UNION ALL SELECT agents_db, 'l2_political_part_2'
+        UNION ALL SELECT agents_db, 'l2_political_part_3'
+        UNION ALL SELECT firms_db, 'firms'
+        UNION ALL SELECT firms_db, 'firm_states'
+        UNION ALL SELECT sim_db, 'simulations'
+        UNION ALL SELECT sim_db, 'action_ledger'
+        UNION ALL SELECT sim_db, 'events'
+        UNION ALL SELECT sim_db, 'transactions'
+        UNION ALL SELECT sim_db, 'plans'
+        UNION ALL SELECT sim_db, 'plan_steps'
+        UNION ALL SELECT sim_db, 'fact_gdp_periods'
+    ) AS expected
+    LEFT JOIN information_schema.tables AS actual
+        ON actual.table_schema = expected.table_schema
+       AND actual.table_name = expected.table_name
+    WHERE actual.table_name IS NULL;
+END //
+
+DELIMITER ;
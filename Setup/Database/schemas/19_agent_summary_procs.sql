@@ -0,0 +1,29 @@
+-- Server-side summary write used by Utils/agent_summary_cache.py (upsert_summary)
+
+DROP PROCEDURE IF EXISTS world_sim_agents.upsert_agent_personal_summary;
+
+DELIMITER //
+
+-- Ensures the agent row exists (keeping any stored name) and inserts the
+-- summary unless the agent already has one, in a single call
+CREATE PROCEDURE world_sim_agents.upsert_agent_personal_summary(
+    IN p_agent_id VARCHAR(64),
+    IN p_name VARCHAR(255),
+    IN p_summary_type VARCHAR(100),
+    IN p_reasoning TEXT,
+    IN p_content TEXT,
+    IN p_metadata JSON
+)
+MODIFIES SQL DATA
+BEGIN
+    INSERT INTO world_sim_agents.agents (l2_voter_id, name)
+    VALUES (p_agent_id, p_name)
+    ON DUPLICATE KEY UPDATE name = COALESCE(name, p_name);
+
+    -- No-op update: an existing summary is left untouched
+    INSERT INTO world_sim_agents.agent_personal_summaries (agent_id, summary_type, reasoning, content, metadata)
+    VALUES (p_agent_id, p_summary_type, p_reasoning, p_content, p_metadata)
+    ON DUPLICATE KEY UPDATE agent_id = agent_id;
+END //
+
+DELIMITER ;
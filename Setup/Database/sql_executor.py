@@ -112,6 +112,8 @@ def execute_sql_files_in_order(connection, schema_dir, test_data=False, include_
         "09_l2_other_part_3.sql",
         "09_l2_other_part_4.sql",
         "11_conversations_channels.sql",
+        "18_verify_tables.sql",
+        "19_agent_summary_procs.sql",
     ]
     
     # Add geo database if requested
@@ -13,29 +13,43 @@ from dotenv import load_dotenv
 env_file = Path(__file__).resolve().parents[2] / '.env'
 load_dotenv(env_file)
 
-def switch_to_docker():
-    """Switch to Docker configuration."""
-    print("Switching to Docker configuration...")
-    
+# .env keys rewritten by each switcher; Qdrant always stays local (docker)
+TARGETS_DOCKER = {
+    'DATABASE_TARGET': 'docker',
+    'SERVICE_TARGET': 'docker',
+    'QDRANT_TARGET': 'docker',
+}
+TARGETS_NAS = {
+    'DATABASE_TARGET': 'nas',
+    'SERVICE_TARGET': 'nas',
+    'QDRANT_TARGET': 'docker',
+}
+
+def _rewrite_env_targets(targets):
+    """Rewrite the target keys in the .env file, leaving every other line untouched."""
     # Read current .env file
     with open(env_file, 'r') as f:
         lines = f.readlines()
     
-    # Update DATABASE_TARGET, SERVICE_TARGET and ensure QDRANT_TARGET is docker
+    # Single dict lookup per line on the key before '='
     updated_lines = []
     for line in lines:
-        if line.startswith('DATABASE_TARGET='):
-            updated_lines.append('DATABASE_TARGET=docker\n')
-        elif line.startswith('SERVICE_TARGET='):
-            updated_lines.append('SERVICE_TARGET=docker\n')
-        elif line.startswith('QDRANT_TARGET='):
-            updated_lines.append('QDRANT_TARGET=docker\n')
+        key, sep, _ = line.partition('=')
+        if sep and key in targets:
+            updated_lines.append(f"{key}={targets[key]}\n")
         else:
             updated_lines.append(line)
     
     # Write updated .env file
     with open(env_file, 'w') as f:
         f.writelines(updated_lines)
+
+def switch_to_docker():
+    """Switch to Docker configuration."""
+    print("Switching to Docker configuration...")
+    
+    # Update DATABASE_TARGET, SERVICE_TARGET and ensure QDRANT_TARGET is docker
+    _rewrite_env_targets(TARGETS_DOCKER)
     
     # Reset database manager to pick up new configuration
     try:
@@ -59,25 +73,8 @@ def switch_to_nas():
     """Switch to NAS configuration."""
     print("Switching to NAS configuration...")
     
-    # Read current .env file
-    with open(env_file, 'r') as f:
-        lines = f.readlines()
-    
     # Update DATABASE_TARGET and SERVICE_TARGET but keep QDRANT_TARGET as docker (local)
-    updated_lines = []
-    for line in lines:
-        if line.startswith('DATABASE_TARGET='):
-            updated_lines.append('DATABASE_TARGET=nas\n')
-        elif line.startswith('SERVICE_TARGET='):
-            updated_lines.append('SERVICE_TARGET=nas\n')
-        elif line.startswith('QDRANT_TARGET='):
-            updated_lines.append('QDRANT_TARGET=docker\n')  # Always keep Qdrant local
-        else:
-            updated_lines.append(line)
-    
-    # Write updated .env file
-    with open(env_file, 'w') as f:
-        f.writelines(updated_lines)
+    _rewrite_env_targets(TARGETS_NAS)
     
     # Reset database manager to pick up new configuration
     try:
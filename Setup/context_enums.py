@@ -20,6 +20,20 @@ class EventType(Enum):
     POLITICAL = "political"
     GENERAL = "general"
 
+# Plain-string aliases for hot-path comparisons (str == str, no Enum.__eq__)
+EVT_INTERACTION = EventType.INTERACTION.value
+EVT_OBSERVATION = EventType.OBSERVATION.value
+EVT_DECISION = EventType.DECISION.value
+EVT_EMOTIONAL = EventType.EMOTIONAL.value
+EVT_LEARNING = EventType.LEARNING.value
+EVT_GOAL_ACHIEVEMENT = EventType.GOAL_ACHIEVEMENT.value
+EVT_FAILURE = EventType.FAILURE.value
+EVT_SOCIAL = EventType.SOCIAL.value
+EVT_ECONOMIC = EventType.ECONOMIC.value
+EVT_POLITICAL = EventType.POLITICAL.value
+EVT_GENERAL = EventType.GENERAL.value
+
+
 class Environment(Enum):
     """Environment types for memories."""
     HOME = "home"
@@ -29,6 +43,14 @@ class Environment(Enum):
     VIRTUAL = "virtual"
     UNKNOWN = "unknown"
 
+ENV_HOME = Environment.HOME.value
+ENV_WORK = Environment.WORK.value
+ENV_SOCIAL = Environment.SOCIAL.value
+ENV_PUBLIC = Environment.PUBLIC.value
+ENV_VIRTUAL = Environment.VIRTUAL.value
+ENV_UNKNOWN = Environment.UNKNOWN.value
+
+
 class EmotionalState(Enum):
     """Emotional states for memories."""
     HAPPY = "happy"
@@ -47,6 +69,23 @@ class EmotionalState(Enum):
     PROUD = "proud"
     ASHAMED = "ashamed"
 
+EMO_HAPPY = EmotionalState.HAPPY.value
+EMO_SAD = EmotionalState.SAD.value
+EMO_ANGRY = EmotionalState.ANGRY.value
+EMO_FEARFUL = EmotionalState.FEARFUL.value
+EMO_SURPRISED = EmotionalState.SURPRISED.value
+EMO_DISGUSTED = EmotionalState.DISGUSTED.value
+EMO_NEUTRAL = EmotionalState.NEUTRAL.value
+EMO_EXCITED = EmotionalState.EXCITED.value
+EMO_ANXIOUS = EmotionalState.ANXIOUS.value
+EMO_CONTENT = EmotionalState.CONTENT.value
+EMO_FRUSTRATED = EmotionalState.FRUSTRATED.value
+EMO_HOPEFUL = EmotionalState.HOPEFUL.value
+EMO_DISAPPOINTED = EmotionalState.DISAPPOINTED.value
+EMO_PROUD = EmotionalState.PROUD.value
+EMO_ASHAMED = EmotionalState.ASHAMED.value
+
+
 class MemoryType(Enum):
     """Types of memories."""
     EPISODIC = "episodic"  # Specific events
@@ -57,6 +96,15 @@ class MemoryType(Enum):
     SPATIAL = "spatial"  # Spatial information
     TEMPORAL = "temporal"  # Time-based information
 
+MEM_EPISODIC = MemoryType.EPISODIC.value
+MEM_SEMANTIC = MemoryType.SEMANTIC.value
+MEM_PROCEDURAL = MemoryType.PROCEDURAL.value
+MEM_EMOTIONAL = MemoryType.EMOTIONAL.value
+MEM_SOCIAL = MemoryType.SOCIAL.value
+MEM_SPATIAL = MemoryType.SPATIAL.value
+MEM_TEMPORAL = MemoryType.TEMPORAL.value
+
+
 class AnalysisType(Enum):
     """Types of memory analysis."""
     AUTOMATIC = "automatic"
@@ -3,19 +3,19 @@
 Drop World_Sim databases script
 Drops all world_sim databases on both NAS and Docker targets.
 """
-import sys
 import os
 import argparse
-from pathlib import Path
 
 from Utils.path_manager import initialize_paths
 initialize_paths()
 
-from Database.connection_manager import get_db_manager, execute_query
-
 
 def drop_databases(target):
     """Drop all world_sim databases for the specified target."""
+    # Deferred so that `--help` and argument errors don't pay for the driver import
+    import mysql.connector
+    from Utils.environment_config import EnvironmentConfig
+
     print(f"Dropping databases on {target.upper()}...")
     
     # Set environment variable
@@ -36,7 +36,9 @@ def drop_databases(target):
             user=db_config['user'],
             password=db_config['password'],
             charset='utf8mb4',
-            collation='utf8mb4_unicode_ci'
+            collation='utf8mb4_unicode_ci',
+            # DROP DATABASE is DDL and commits implicitly; no explicit commit needed
+            autocommit=True
         )
         
         cursor = connection.cursor()
@@ -51,7 +53,6 @@ def drop_databases(target):
             except Exception as e:
                 print(f"  [WARNING] Error dropping {db_name}: {e}")
         
-        connection.commit()
         print(f"[SUCCESS] Successfully dropped databases on {target.upper()}")
         
     except Exception as e:
@@ -4,9 +4,12 @@ Embedding Module for Text Vectorization
 Handles text embedding generation for memory storage and retrieval.
 """
 
+import functools
+import hashlib
 import os
+import struct
 import time
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 import numpy as np
 
 # Sentence transformers is no longer used - we use OpenAI embeddings only
@@ -22,6 +25,29 @@ except ImportError:
     openai = None
     OPENAI_AVAILABLE = False
 
+SIMPLE_EMBEDDING_SIZE = 384
+
+
+@functools.lru_cache(maxsize=2048)
+def _simple_embedding(text: str) -> Tuple[float, ...]:
+    """
+    Deterministic hash-based embedding for a text string.
+
+    Pure function of ``text``, so results are memoized; recurring strings
+    (system prompts, agent templates) skip the SHA-256 and unpack entirely.
+    """
+    # Create a hash of the text
+    text_hash = hashlib.sha256(text.encode('utf-8')).digest()
+    
+    # Convert each 4-byte chunk to a big-endian float
+    embedding = struct.unpack('>%df' % (len(text_hash) // 4), text_hash)
+    
+    # Pad or truncate to desired size
+    if len(embedding) < SIMPLE_EMBEDDING_SIZE:
+        embedding += (0.0,) * (SIMPLE_EMBEDDING_SIZE - len(embedding))
+    return embedding[:SIMPLE_EMBEDDING_SIZE]
+
+
 class EmbeddingModule:
     """Handles text embedding generation."""
     
@@ -90,30 +116,8 @@ class EmbeddingModule:
     
     def _get_simple_embedding(self, text: str) -> List[float]:
         """Get a simple hash-based embedding as fallback."""
-        import hashlib
-        import struct
-        
-        # Create a hash of the text
-        text_hash = hashlib.sha256(text.encode('utf-8')).digest()
-        
-        # Convert to float values
-        embedding = []
-        for i in range(0, len(text_hash), 4):
-            if i + 4 <= len(text_hash):
-                # Convert 4 bytes to float
-                value = struct.unpack('>f', text_hash[i:i+4])[0]
-                embedding.append(value)
-        
-        # Pad or truncate to desired size
-        target_size = 384
-        if len(embedding) < target_size:
-            # Pad with zeros
-            embedding.extend([0.0] * (target_size - len(embedding)))
-        elif len(embedding) > target_size:
-            # Truncate
-            embedding = embedding[:target_size]
-        
-        return embedding
+        # Callers may mutate the result, so hand out a fresh list each time
+        return list(_simple_embedding(text))
     
     def get_embeddings_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
         """
@@ -4,13 +4,24 @@ Qdrant Memory Database Implementation
 Handles vector-based memory storage and retrieval for agents.
 """
 
+import base64
+import hashlib
 import os
 import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Union, Tuple
+import dataclasses
 from dataclasses import dataclass, asdict
 import json
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+# The client logs every request at INFO; keep it quiet unless something goes wrong
+logging.getLogger("qdrant_client").setLevel(logging.WARNING)
 
 try:
     from qdrant_client import QdrantClient
@@ -18,7 +29,7 @@ try:
     from qdrant_client.http.models import Distance, VectorParams, PointStruct
     QDRANT_CLIENT_AVAILABLE = True
 except ImportError:
-    print("Warning: qdrant-client not available. Install with: pip install qdrant-client")
+    logger.warning("qdrant-client not available. Install with: pip install qdrant-client")
     QdrantClient = None
     models = None
     Distance = None
@@ -26,7 +37,10 @@ except ImportError:
     PointStruct = None
     QDRANT_CLIENT_AVAILABLE = False
 
-@dataclass
+# Embedding dimension of the memory collection
+_VECTOR_SIZE = 384
+
+@dataclass(slots=True)
 class Memory:
     """Memory object for storing agent memories."""
     memory_id: str
@@ -51,7 +65,7 @@ class Memory:
     learning_outcome: str = ""
     future_implications: str = ""
     context_tags: List[str] = None
-    vector_embedding: Optional[List[float]] = None
+    vector_embedding: Optional[Union[List[float], np.ndarray]] = None
 
     def __post_init__(self):
         if self.participants is None:
@@ -59,6 +73,108 @@ class Memory:
         if self.context_tags is None:
             self.context_tags = []
 
+# Payload key -> fallback for points missing that key, computed once from the
+# Memory fields. Required fields get the fallbacks readers have always used.
+_MEMORY_PAYLOAD_DEFAULTS = {
+    f.name: f.default
+    for f in dataclasses.fields(Memory)
+    if f.name not in ("memory_id", "vector_embedding")
+}
+_MEMORY_PAYLOAD_DEFAULTS.update(
+    agent_id="",
+    content="",
+    memory_type="general",
+    importance=0.0,
+    timestamp=0.0,
+    created_at=0.0,
+)
+
+# Memory attributes stored in the Qdrant payload (everything except id and vector)
+_PAYLOAD_FIELDS = tuple(_MEMORY_PAYLOAD_DEFAULTS)
+
+# Low-cardinality payload strings stored as small-int codes under "<field>_i"
+# (with an INTEGER payload index each). A value's code is its index, so only
+# ever append to these tuples. Values not listed are stored as plain strings
+# under the original key, which is also what points written before the codes
+# carry; decoding returns the shared tuple entries instead of a fresh string
+# per point.
+_PAYLOAD_CODES = {
+    "memory_type": (
+        "general", "episodic", "semantic", "procedural", "emotional",
+        "social", "spatial", "temporal",
+    ),
+    "event_type": (
+        "general", "interaction", "observation", "decision", "emotional", "learning",
+        "goal_achievement", "failure", "social", "economic", "political",
+    ),
+    "environment": ("unknown", "home", "work", "social", "public", "virtual"),
+    "emotional_state": (
+        "neutral", "happy", "sad", "angry", "fearful", "surprised", "disgusted", "excited",
+        "anxious", "content", "frustrated", "hopeful", "disappointed", "proud", "ashamed",
+    ),
+}
+_PAYLOAD_ENCODE = {
+    name: {value: code for code, value in enumerate(values)}
+    for name, values in _PAYLOAD_CODES.items()
+}
+
+def _l2_normalize(vector) -> np.ndarray:
+    """Scale a vector to unit length (zero vectors are returned unchanged)."""
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector if norm == 0 else vector / norm
+
+# Universal hash family h_i(x) = (a_i * x + b_i) mod p for MinHash signatures.
+# a_i, b_i < 2**32 and x < 2**32, so a_i * x + b_i fits in uint64 without overflow.
+# Only the low 16 bits of each minimum are kept (b-bit MinHash): 64 slots
+# base64-encode to 172 payload bytes, and chance collisions (1 in 65536 per
+# slot) barely move the Jaccard estimate.
+_MINHASH_NUM_HASHES = 64
+_MINHASH_PRIME = np.uint64((1 << 61) - 1)
+_MINHASH_RNG = np.random.RandomState(1)
+_MINHASH_A = _MINHASH_RNG.randint(1, 1 << 32, size=_MINHASH_NUM_HASHES, dtype=np.uint64)
+_MINHASH_B = _MINHASH_RNG.randint(0, 1 << 32, size=_MINHASH_NUM_HASHES, dtype=np.uint64)
+_MINHASH_EMPTY = np.full(_MINHASH_NUM_HASHES, np.iinfo(np.uint16).max, dtype=np.uint16)
+
+def _content_minhash(content: str) -> np.ndarray:
+    """b-bit MinHash signature (uint16[64]) of the lower-cased word set of ``content``."""
+    words = set(content.lower().split())
+    if not words:
+        return _MINHASH_EMPTY
+    word_hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(w.encode("utf-8"), digest_size=4).digest(), "little") for w in words),
+        dtype=np.uint64,
+        count=len(words)
+    )
+    hashed = (word_hashes[:, None] * _MINHASH_A + _MINHASH_B) % _MINHASH_PRIME
+    return (hashed.min(axis=0) & np.uint64(0xFFFF)).astype(np.uint16)
+
+def _encode_minhash(signature: np.ndarray) -> str:
+    """Compact payload form of a MinHash signature."""
+    return base64.b64encode(signature.astype("<u2").tobytes()).decode("ascii")
+
+def _decode_minhash(text: str) -> Optional[np.ndarray]:
+    """Inverse of _encode_minhash; None for signatures in another (older) format."""
+    try:
+        raw = base64.b64decode(text, validate=True)
+    except ValueError:
+        return None
+    if len(raw) != 2 * _MINHASH_NUM_HASHES:
+        return None
+    return np.frombuffer(raw, dtype="<u2")
+
+def _copy_memories(memories: List[Memory]) -> List[Memory]:
+    """Copies of cached memories (including their list fields) safe to hand to a caller."""
+    return [
+        dataclasses.replace(
+            m,
+            participants=list(m.participants),
+            context_tags=list(m.context_tags),
+            vector_embedding=list(m.vector_embedding) if isinstance(m.vector_embedding, list) else m.vector_embedding,
+        )
+        for m in memories
+    ]
+
 def create_memory_id() -> str:
     """Create a unique memory ID."""
     return str(uuid.uuid4())
@@ -66,31 +182,66 @@ def create_memory_id() -> str:
 class QdrantMemoryDB:
     """Qdrant-based memory database for agents."""
     
-    def __init__(self, host: str = "localhost", port: int = 1002, collection_name: str = "agent_memories"):
+    def __init__(self, host: str = "localhost", port: int = 1002, collection_name: str = "agent_memories",
+                 grpc_port: int = 1003, prefer_grpc: bool = True, prenormalize: bool = True,
+                 content_similarity: bool = False):
         """
         Initialize Qdrant memory database.
         
         Args:
             host: Qdrant server host
-            port: Qdrant server port
+            port: Qdrant server HTTP port
             collection_name: Name of the collection to use
+            grpc_port: Qdrant server gRPC port (docker maps 6334->1003)
+            prefer_grpc: Send requests over gRPC (packed protobuf vectors) instead of REST/JSON
+            prenormalize: L2-normalize vectors client-side and create new collections with DOT
+                distance (equal to cosine on unit vectors, without server-side normalization)
+            content_similarity: Store a MinHash signature of each memory's content, needed
+                by get_top_content_similar_memories (off by default: extra payload and hashing)
         """
         if not QDRANT_CLIENT_AVAILABLE:
             raise ImportError("qdrant-client not available. Install with: pip install qdrant-client")
         
         self.host = host
         self.port = port
+        self.grpc_port = grpc_port
+        self.prefer_grpc = prefer_grpc
+        self.prenormalize = prenormalize
+        self.content_similarity = content_similarity
         self.collection_name = collection_name
         self.client = None
-        self.vector_size = 384  # Default embedding size
+        self.vector_size = _VECTOR_SIZE  # Default embedding size
+        # Search on the INT8 vectors, then rescore the oversampled top candidates with FP32
+        self.search_params = models.SearchParams(
+            quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+        )
+        # Memory reads skip the MinHash signature (only get_top_content_similar_memories needs it)
+        self._memory_payload = models.PayloadSelectorExclude(exclude=["minhash"])
+        # (agent_id, vector digest, limit, with_vectors) -> (cached_at, results);
+        # short TTL, cleared on every write so results are never stale
+        self._search_cache: "OrderedDict[tuple, Tuple[float, List[Memory]]]" = OrderedDict()
+        self._search_cache_ttl = 2.0
+        self._search_cache_size = 4096
+        
+        # Local point count so hot loops don't need a server round trip
+        self._approx_count = 0
+        self._approx_count_refreshed = float("-inf")
+        self._count_max_age = 10.0
         
         self._connect()
         self._ensure_collection()
+        self._refresh_memory_count()
     
     def _connect(self):
         """Connect to Qdrant server."""
         try:
-            self.client = QdrantClient(host=self.host, port=self.port)
+            self.client = QdrantClient(
+                host=self.host,
+                port=self.port,
+                grpc_port=self.grpc_port,
+                prefer_grpc=self.prefer_grpc,
+                timeout=30
+            )
             # Test connection
             self.client.get_collections()
             # Connection successful (silent)
@@ -109,14 +260,71 @@ class QdrantMemoryDB:
                     collection_name=self.collection_name,
                     vectors_config=VectorParams(
                         size=self.vector_size,
-                        distance=Distance.COSINE
+                        distance=Distance.DOT if self.prenormalize else Distance.COSINE
+                    ),
+                    # Build per-payload HNSW links so agent-filtered search stays graph-based
+                    hnsw_config=models.HnswConfigDiff(payload_m=16),
+                    # INT8 copies kept in RAM (4x smaller than FP32) for the coarse search pass
+                    quantization_config=models.ScalarQuantization(
+                        scalar=models.ScalarQuantizationConfig(
+                            type=models.ScalarType.INT8,
+                            quantile=0.99,
+                            always_ram=True
+                        )
                     )
                 )
+            self._ensure_payload_indexes()
             # Collection ready (silent)
                 
         except Exception as e:
             raise RuntimeError(f"Failed to ensure collection {self.collection_name}: {e}")
     
+    def _ensure_payload_indexes(self):
+        """Index the payload fields queries filter or score on, and the enum code fields."""
+        for field_name, field_schema in (
+            ("agent_id", models.PayloadSchemaType.KEYWORD),
+            ("timestamp", models.PayloadSchemaType.FLOAT),
+            ("importance", models.PayloadSchemaType.FLOAT),
+        ) + tuple((name + "_i", models.PayloadSchemaType.INTEGER) for name in _PAYLOAD_CODES):
+            try:
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema
+                )
+            except Exception:
+                # Index already exists (e.g. after a restart), that's okay
+                pass
+    
+    def _point_to_memory(self, point) -> Memory:
+        """Build a Memory from a Qdrant point (search hit or scroll record)."""
+        payload = point.payload
+        fields = {name: payload.get(name, default) for name, default in _MEMORY_PAYLOAD_DEFAULTS.items()}
+        for name, values in _PAYLOAD_CODES.items():
+            code = payload.get(name + "_i")
+            # An unknown (e.g. newer) code keeps the string key or the default
+            if isinstance(code, int) and 0 <= code < len(values):
+                fields[name] = values[code]
+        if isinstance(fields["created_at"], str):
+            # Points written before created_at_iso existed stored an ISO string here
+            fields["created_at"] = datetime.fromisoformat(fields["created_at"]).timestamp()
+        return Memory(memory_id=point.id, vector_embedding=getattr(point, "vector", None), **fields)
+    
+    def _payload_of(self, memory: Memory) -> Dict[str, Any]:
+        """Build the Qdrant payload stored alongside a memory's vector."""
+        payload = {name: getattr(memory, name) for name in _PAYLOAD_FIELDS}
+        # created_at stays a float; the human-readable UTC form gets its own key
+        payload["created_at_iso"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(memory.created_at))
+        for name, codes in _PAYLOAD_ENCODE.items():
+            code = codes.get(payload[name])
+            if code is not None:
+                del payload[name]
+                payload[name + "_i"] = code
+        if self.content_similarity:
+            # Content signature for get_top_content_similar_memories
+            payload["minhash"] = _encode_minhash(_content_minhash(memory.content))
+        return payload
+    
     def add_memory(self, memory: Memory) -> bool:
         """
         Add a memory to the database.
@@ -127,58 +335,59 @@ class QdrantMemoryDB:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            if memory.vector_embedding is None:
-                print("Warning: Memory has no vector embedding, skipping vector storage")
-                return False
+        return self.add_memories([memory]) == 1
+    
+    def add_memories(self, memories: List[Memory], batch_size: int = 256, wait: bool = True) -> int:
+        """
+        Add many memories using one upsert per batch instead of one per memory.
+        
+        Args:
+            memories: Memory objects to add
+            batch_size: Maximum number of points sent per upsert request
+            wait: Whether each upsert waits for the server to apply it
             
-            vector = memory.vector_embedding
-            if len(vector) != self.vector_size:
-                print(f"Warning: Vector size {len(vector)} doesn't match expected size {self.vector_size}")
-                return False
+        Returns:
+            int: Number of memories stored
+        """
+        points = []
+        for memory in memories:
+            if memory.vector_embedding is None:
+                logger.debug("Skipping memory %s: missing vector embedding", memory.memory_id)
+                continue
+            # Pack as contiguous float32 here; the Memory keeps whatever the caller passed
+            vector = np.asarray(memory.vector_embedding, dtype=np.float32)
+            if vector.shape != (_VECTOR_SIZE,):
+                logger.debug("Skipping memory %s: wrong-size vector embedding", memory.memory_id)
+                continue
+            if self.prenormalize:
+                vector = _l2_normalize(vector)
             
-            point = PointStruct(
+            points.append(PointStruct(
                 id=memory.memory_id,
-                vector=vector,
-                payload={
-                    "agent_id": memory.agent_id,
-                    "content": memory.content,
-                    "memory_type": memory.memory_type,
-                    "importance": memory.importance,
-                    "timestamp": memory.timestamp,
-                    "created_at": memory.created_at,
-                    "event_type": memory.event_type,
-                    "environment": memory.environment,
-                    "location": memory.location,
-                    "source": memory.source,
-                    "target": memory.target,
-                    "participants": memory.participants,
-                    "emotional_state": memory.emotional_state,
-                    "impact_score": memory.impact_score,
-                    "analysis_type": memory.analysis_type,
-                    "personal_significance": memory.personal_significance,
-                    "personal_narrative": memory.personal_narrative,
-                    "context_description": memory.context_description,
-                    "learning_outcome": memory.learning_outcome,
-                    "future_implications": memory.future_implications,
-                    "context_tags": memory.context_tags,
-                    "content": memory.personal_narrative,
-                    "created_at": datetime.fromtimestamp(memory.created_at).isoformat()
-                }
-            )
-            
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=[point]
-            )
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error adding memory: {e}")
-            return False
+                # PointStruct validates a plain list of floats
+                vector=vector.tolist(),
+                payload=self._payload_of(memory)
+            ))
+        
+        stored = 0
+        for start in range(0, len(points), batch_size):
+            batch = points[start:start + batch_size]
+            try:
+                self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=batch,
+                    wait=wait
+                )
+                stored += len(batch)
+                self._approx_count += len(batch)
+                self._search_cache.clear()
+            except Exception:
+                logger.exception("Error adding memory")
+        
+        return stored
     
-    def search_memories(self, agent_id: str, query_vector: List[float], limit: int = 10) -> List[Memory]:
+    def search_memories(self, agent_id: str, query_vector: Union[List[float], np.ndarray], limit: int = 10,
+                        with_vectors: bool = False) -> List[Memory]:
         """
         Search for memories using vector similarity.
         
@@ -186,14 +395,31 @@ class QdrantMemoryDB:
             agent_id: ID of the agent to search memories for
             query_vector: Query vector for similarity search
             limit: Maximum number of results
+            with_vectors: Also return each memory's embedding (skipped by default to cut response size)
             
         Returns:
             List of Memory objects
         """
         try:
-            if len(query_vector) != self.vector_size:
-                print(f"Warning: Query vector size {len(query_vector)} doesn't match expected size {self.vector_size}")
+            query_vector = np.asarray(query_vector, dtype=np.float32)
+            if query_vector.shape[0] != _VECTOR_SIZE:
+                logger.debug("Query vector size %d doesn't match expected size %d", query_vector.shape[0], _VECTOR_SIZE)
                 return []
+            if self.prenormalize:
+                query_vector = _l2_normalize(query_vector)
+            
+            # Agents often repeat the same query within a tick; serve those from memory
+            now = time.monotonic()
+            cache_key = (
+                agent_id,
+                hashlib.blake2b(query_vector.tobytes(), digest_size=16).digest(),
+                limit,
+                with_vectors,
+            )
+            cached = self._search_cache.get(cache_key)
+            if cached is not None and now - cached[0] < self._search_cache_ttl:
+                self._search_cache.move_to_end(cache_key)
+                return _copy_memories(cached[1])
             
             results = self.client.search(
                 collection_name=self.collection_name,
@@ -206,104 +432,79 @@ class QdrantMemoryDB:
                         )
                     ]
                 ),
+                search_params=self.search_params,
+                with_payload=self._memory_payload,
+                with_vectors=with_vectors,
                 limit=limit
             )
             
-            memories = []
-            for result in results:
-                payload = result.payload
-                memory = Memory(
-                    memory_id=result.id,
-                    agent_id=payload.get("agent_id", ""),
-                    content=payload.get("content", ""),
-                    memory_type=payload.get("memory_type", "general"),
-                    importance=payload.get("importance", 0.0),
-                    timestamp=payload.get("timestamp", 0.0),
-                    created_at=payload.get("created_at", 0.0),
-                    event_type=payload.get("event_type", "general"),
-                    environment=payload.get("environment", "unknown"),
-                    location=payload.get("location", "unknown"),
-                    source=payload.get("source", "agent"),
-                    target=payload.get("target", "self"),
-                    participants=payload.get("participants", []),
-                    emotional_state=payload.get("emotional_state", "neutral"),
-                    impact_score=payload.get("impact_score", 0.0),
-                    analysis_type=payload.get("analysis_type", "automatic"),
-                    personal_significance=payload.get("personal_significance", 0.0),
-                    personal_narrative=payload.get("personal_narrative", ""),
-                    context_description=payload.get("context_description", ""),
-                    learning_outcome=payload.get("learning_outcome", ""),
-                    future_implications=payload.get("future_implications", ""),
-                    context_tags=payload.get("context_tags", []),
-                    vector_embedding=result.vector
-                )
-                memories.append(memory)
-            
-            return memories
+            memories = [self._point_to_memory(result) for result in results]
+            self._search_cache[cache_key] = (now, memories)
+            self._search_cache.move_to_end(cache_key)
+            if len(self._search_cache) > self._search_cache_size:
+                self._search_cache.popitem(last=False)
+            return _copy_memories(memories)
             
-        except Exception as e:
-            print(f"Error searching memories: {e}")
+        except Exception:
+            logger.exception("Error searching memories")
             return []
     
-    def get_agent_memories(self, agent_id: str, limit: int = 100) -> List[Memory]:
+    def iter_agent_memories(self, agent_id: str, page_size: int = 256, limit: Optional[int] = None,
+                            with_vectors: bool = False) -> Iterator[Memory]:
+        """
+        Lazily stream an agent's memories page by page via Qdrant scroll.
+        
+        Args:
+            agent_id: ID of the agent
+            page_size: Number of points fetched per scroll request
+            limit: Maximum number of memories to yield (None for all)
+            with_vectors: Also return each memory's embedding
+            
+        Yields:
+            Memory objects
+        """
+        scroll_filter = models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="agent_id",
+                    match=models.MatchValue(value=agent_id)
+                )
+            ]
+        )
+        offset = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                with_payload=self._memory_payload,
+                with_vectors=with_vectors,
+                limit=page_size if remaining is None else min(page_size, remaining),
+                offset=offset
+            )
+            for point in points:
+                yield self._point_to_memory(point)
+            if remaining is not None:
+                remaining -= len(points)
+            if offset is None:
+                return
+    
+    def get_agent_memories(self, agent_id: str, limit: int = 100, with_vectors: bool = False) -> List[Memory]:
         """
         Get all memories for a specific agent.
         
         Args:
             agent_id: ID of the agent
             limit: Maximum number of memories to return
+            with_vectors: Also return each memory's embedding (skipped by default to cut response size)
             
         Returns:
             List of Memory objects
         """
         try:
-            results = self.client.scroll(
-                collection_name=self.collection_name,
-                scroll_filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="agent_id",
-                            match=models.MatchValue(value=agent_id)
-                        )
-                    ]
-                ),
-                limit=limit
-            )
-            
-            memories = []
-            for point in results[0]:  # results is a tuple (points, next_page_offset)
-                payload = point.payload
-                memory = Memory(
-                    memory_id=point.id,
-                    agent_id=payload.get("agent_id", ""),
-                    content=payload.get("content", ""),
-                    memory_type=payload.get("memory_type", "general"),
-                    importance=payload.get("importance", 0.0),
-                    timestamp=payload.get("timestamp", 0.0),
-                    created_at=payload.get("created_at", 0.0),
-                    event_type=payload.get("event_type", "general"),
-                    environment=payload.get("environment", "unknown"),
-                    location=payload.get("location", "unknown"),
-                    source=payload.get("source", "agent"),
-                    target=payload.get("target", "self"),
-                    participants=payload.get("participants", []),
-                    emotional_state=payload.get("emotional_state", "neutral"),
-                    impact_score=payload.get("impact_score", 0.0),
-                    analysis_type=payload.get("analysis_type", "automatic"),
-                    personal_significance=payload.get("personal_significance", 0.0),
-                    personal_narrative=payload.get("personal_narrative", ""),
-                    context_description=payload.get("context_description", ""),
-                    learning_outcome=payload.get("learning_outcome", ""),
-                    future_implications=payload.get("future_implications", ""),
-                    context_tags=payload.get("context_tags", []),
-                    vector_embedding=point.vector
-                )
-                memories.append(memory)
-            
-            return memories
-            
-        except Exception as e:
-            print(f"Error getting agent memories: {e}")
+            return list(self.iter_agent_memories(agent_id, limit=limit, with_vectors=with_vectors))
+        except Exception:
+            logger.exception("Error getting agent memories")
             return []
     
     def delete_memory(self, memory_id: str) -> bool:
@@ -321,24 +522,39 @@ class QdrantMemoryDB:
                 collection_name=self.collection_name,
                 points_selector=models.PointIdsList(points=[memory_id])
             )
+            self._search_cache.clear()
+            self._approx_count = max(0, self._approx_count - 1)
             return True
-        except Exception as e:
-            print(f"Error deleting memory: {e}")
+        except Exception:
+            logger.exception("Error deleting memory")
             return False
     
-    def get_memory_count(self) -> int:
+    def get_memory_count(self, exact: bool = False) -> int:
         """
         Get the total number of memories in the database.
         
+        By default this returns a client-side count kept up to date by this
+        instance's writes, refreshed from the server when it is more than
+        _count_max_age seconds old (other writers, upserts of existing IDs).
+        
+        Args:
+            exact: Always ask the server instead of using the local count
+            
         Returns:
             int: Number of memories stored
         """
+        if exact or time.monotonic() - self._approx_count_refreshed > self._count_max_age:
+            self._refresh_memory_count()
+        return self._approx_count
+    
+    def _refresh_memory_count(self):
+        """Reload the point count from the server."""
         try:
             collection_info = self.client.get_collection(self.collection_name)
-            return collection_info.points_count
-        except Exception as e:
-            print(f"Error getting memory count: {e}")
-            return 0
+            self._approx_count = collection_info.points_count or 0
+            self._approx_count_refreshed = time.monotonic()
+        except Exception:
+            logger.exception("Error getting memory count")
     
     def health_check(self) -> bool:
         """Check if the database is healthy."""
@@ -351,25 +567,46 @@ class QdrantMemoryDB:
     def clear_collection(self) -> bool:
         """
         Clear all memories from the current collection.
-        This removes all points but keeps the collection structure.
+        
+        Dropping and recreating the collection is O(1) metadata work, unlike
+        deleting every point (which also rebuilds the HNSW graph incrementally).
+        The collection configuration and payload indexes are recreated as-is.
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self.reset_collection()
+
+    def clear_by_agent(self, agent_id: str) -> bool:
+        """
+        Delete every memory belonging to one agent.
+
+        Args:
+            agent_id: ID of the agent whose memories are removed
 
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            # Delete all points in the collection
             self.client.delete(
                 collection_name=self.collection_name,
                 points_selector=models.FilterSelector(
                     filter=models.Filter(
-                        must=[]  # Empty filter matches all points
+                        must=[
+                            models.FieldCondition(
+                                key="agent_id",
+                                match=models.MatchValue(value=agent_id)
+                            )
+                        ]
                     )
                 )
             )
-            print(f"Cleared all memories from collection '{self.collection_name}'")
+            self._search_cache.clear()
+            # Number of deleted points is unknown; reload on next get_memory_count()
+            self._approx_count_refreshed = float("-inf")
             return True
-        except Exception as e:
-            print(f"Error clearing collection: {e}")
+        except Exception:
+            logger.exception("Error clearing agent memories")
             return False
 
     def reset_collection(self) -> bool:
@@ -384,19 +621,22 @@ class QdrantMemoryDB:
             # Delete the collection if it exists
             try:
                 self.client.delete_collection(self.collection_name)
-                print(f"Deleted collection '{self.collection_name}'")
+                logger.debug("Deleted collection '%s'", self.collection_name)
             except Exception:
                 # Collection might not exist, that's okay
                 pass
             # Recreate the collection
             self._ensure_collection()
-            print(f"Reset collection '{self.collection_name}'")
+            self._search_cache.clear()
+            self._approx_count = 0
+            logger.debug("Reset collection '%s'", self.collection_name)
             return True
-        except Exception as e:
-            print(f"Error resetting collection: {e}")
+        except Exception:
+            logger.exception("Error resetting collection")
             return False
 
-    def search_memories_enhanced(self, query_vector: List[float], agent_id: str, k: int = 10) -> List[Memory]:
+    def search_memories_enhanced(self, query_vector: Union[List[float], np.ndarray], agent_id: str, k: int = 10,
+                                 with_vectors: bool = False) -> List[Memory]:
         """
         Enhanced search for memories using vector similarity with agent filtering.
 
@@ -404,13 +644,14 @@ class QdrantMemoryDB:
             query_vector: Query vector for similarity search
             agent_id: ID of the agent to search memories for
             k: Maximum number of results
+            with_vectors: Also return each memory's embedding
 
         Returns:
             List of Memory objects
         """
-        return self.search_memories(agent_id, query_vector, k)
+        return self.search_memories(agent_id, query_vector, k, with_vectors=with_vectors)
 
-    def get_scored_memories(self, query_vector: List[float], agent_id: str, k: int = 10,
+    def get_scored_memories(self, query_vector: Union[List[float], np.ndarray], agent_id: str, k: int = 10,
                           salience_param: float = 1.0, importance_param: float = 0.5,
                           time_decay_param: float = 1.0) -> List[Tuple[Memory, float]]:
         """
@@ -428,44 +669,71 @@ class QdrantMemoryDB:
             List of (Memory, score) tuples
         """
         try:
-            # Get basic search results
-            memories = self.search_memories(agent_id, query_vector, k)
-
-            # Apply enhanced scoring
-            scored_memories = []
-            current_time = time.time()
-
-            for memory in memories:
-                # Calculate semantic similarity score (from search results)
-                semantic_score = 1.0  # Placeholder - would come from search results
-
-                # Calculate importance score
-                importance_score = memory.importance
-
-                # Calculate time decay score (more recent = higher score)
-                time_diff = current_time - memory.timestamp
-                time_decay_score = max(0, 1.0 - (time_diff / 86400))  # Decay over 24 hours
-
-                # Combined score
-                total_score = (salience_param * semantic_score +
-                             importance_param * importance_score +
-                             time_decay_param * time_decay_score)
-
-                scored_memories.append((memory, total_score))
-
-            # Sort by score (descending)
-            scored_memories.sort(key=lambda x: x[1], reverse=True)
+            query_vector = np.asarray(query_vector, dtype=np.float32)
+            if query_vector.shape[0] != _VECTOR_SIZE:
+                logger.debug("Query vector size %d doesn't match expected size %d", query_vector.shape[0], _VECTOR_SIZE)
+                return []
+            if self.prenormalize:
+                query_vector = _l2_normalize(query_vector)
+
+            # Score on the server so the real similarity ($score) is used and no
+            # client-side re-sort is needed:
+            #   salience * $score + importance * importance + time_decay * lin_decay(timestamp)
+            # lin_decay with midpoint 0 is max(0, 1 - |now - timestamp| / 24h).
+            formula = models.SumExpression(sum=[
+                models.MultExpression(mult=[salience_param, "$score"]),
+                models.MultExpression(mult=[importance_param, "importance"]),
+                models.MultExpression(mult=[
+                    time_decay_param,
+                    models.LinDecayExpression(lin_decay=models.DecayParamsExpression(
+                        x="timestamp",
+                        target=time.time(),
+                        scale=86400.0,
+                        midpoint=0.0
+                    ))
+                ])
+            ])
+
+            response = self.client.query_points(
+                collection_name=self.collection_name,
+                prefetch=[
+                    models.Prefetch(
+                        # Prefetch is a pydantic model that validates a plain list of floats
+                        query=query_vector.tolist(),
+                        filter=models.Filter(
+                            must=[
+                                models.FieldCondition(
+                                    key="agent_id",
+                                    match=models.MatchValue(value=agent_id)
+                                )
+                            ]
+                        ),
+                        params=self.search_params,
+                        limit=k * 4
+                    )
+                ],
+                query=models.FormulaQuery(
+                    formula=formula,
+                    defaults={"importance": 0.0, "timestamp": 0.0}
+                ),
+                with_payload=self._memory_payload,
+                limit=k
+            )
 
-            return scored_memories[:k]
+            return [(self._point_to_memory(point), point.score) for point in response.points]
 
-        except Exception as e:
-            print(f"Error getting scored memories: {e}")
+        except Exception:
+            logger.exception("Error getting scored memories")
             return []
 
     def get_top_similar_memories(self, agent_id: str, k: int = 10) -> List[Tuple[Memory, float]]:
         """
         Get the top k most similar memories for an agent.
 
+        Similarity is computed on the server from the stored embeddings: the
+        agent's most recent memory seeds a recommendation query over the rest
+        of that agent's memories.
+
         Args:
             agent_id: ID of the agent
             k: Number of results to return
@@ -474,34 +742,108 @@ class QdrantMemoryDB:
             List of (Memory, similarity_score) tuples
         """
         try:
-            # Get all memories for the agent
-            memories = self.get_agent_memories(agent_id, limit=k*2)  # Get more to find similar ones
+            agent_filter = models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key="agent_id",
+                        match=models.MatchValue(value=agent_id)
+                    )
+                ]
+            )
 
-            if len(memories) < 2:
+            # Most recent memory is the seed (ordered via the timestamp payload index)
+            seed, _ = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=agent_filter,
+                order_by=models.OrderBy(key="timestamp", direction=models.Direction.DESC),
+                with_payload=False,
+                limit=1
+            )
+            if not seed:
                 return []
 
-            # Find similar memories by comparing content
-            scored_memories = []
-            for i, memory1 in enumerate(memories):
-                for memory2 in memories[i+1:]:
-                    # Simple similarity based on content overlap
-                    content1 = memory1.content.lower()
-                    content2 = memory2.content.lower()
+            # Example points are excluded from recommendation results
+            response = self.client.query_points(
+                collection_name=self.collection_name,
+                query=models.RecommendQuery(
+                    recommend=models.RecommendInput(positive=[seed[0].id])
+                ),
+                query_filter=agent_filter,
+                search_params=self.search_params,
+                with_payload=self._memory_payload,
+                limit=k
+            )
+            return [(self._point_to_memory(point), point.score) for point in response.points]
+
+        except Exception:
+            logger.exception("Error getting top similar memories")
+            return []
 
-                    # Calculate simple similarity score
-                    words1 = set(content1.split())
-                    words2 = set(content2.split())
+    def get_top_content_similar_memories(self, agent_id: str, k: int = 10,
+                                         candidates: int = 256) -> List[Tuple[Memory, float]]:
+        """
+        Get the top k memories whose content overlaps most with another memory.
 
-                    if words1 or words2:
-                        similarity = len(words1.intersection(words2)) / len(words1.union(words2))
-                        scored_memories.append((memory1, similarity))
+        Word-set Jaccard similarity is estimated from the MinHash signatures
+        stored in each payload, so only the signatures are fetched for the
+        comparison and full payloads only for the k winners. Signatures are
+        only written by a QdrantMemoryDB created with content_similarity=True.
 
-            # Sort by similarity and return top k
-            scored_memories.sort(key=lambda x: x[1], reverse=True)
-            return scored_memories[:k]
+        Args:
+            agent_id: ID of the agent
+            k: Number of results to return
+            candidates: Number of the agent's memories to compare
 
-        except Exception as e:
-            print(f"Error getting top similar memories: {e}")
+        Returns:
+            List of (Memory, estimated_jaccard) tuples
+        """
+        try:
+            points, _ = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key="agent_id",
+                            match=models.MatchValue(value=agent_id)
+                        )
+                    ]
+                ),
+                with_payload=models.PayloadSelectorInclude(include=["minhash"]),
+                limit=candidates
+            )
+            # Points stored without a (current-format) signature can't be compared
+            decoded = [(point, _decode_minhash(point.payload.get("minhash") or "")) for point in points]
+            decoded = [(point, signature) for point, signature in decoded if signature is not None]
+            if len(decoded) < 2:
+                return []
+            points = [point for point, _ in decoded]
+            signatures = np.stack([signature for _, signature in decoded])
+
+            # Fraction of matching signature slots estimates Jaccard similarity
+            similarity = (signatures[:, None, :] == signatures[None, :, :]).mean(axis=-1)
+            np.fill_diagonal(similarity, -1.0)
+            best = similarity.max(axis=1)
+            best[(signatures == _MINHASH_EMPTY).all(axis=1)] = -1.0
+            ranked = np.flatnonzero(best >= 0)
+            if ranked.size == 0:
+                return []
+            if ranked.size > k:
+                ranked = ranked[np.argpartition(best[ranked], -k)[-k:]]
+            ranked = ranked[np.argsort(best[ranked])[::-1]]
+
+            ids = [points[i].id for i in ranked]
+            records = {
+                record.id: record
+                for record in self.client.retrieve(collection_name=self.collection_name, ids=ids,
+                                                   with_payload=self._memory_payload)
+            }
+            return [
+                (self._point_to_memory(records[points[i].id]), float(best[i]))
+                for i in ranked if points[i].id in records
+            ]
+
+        except Exception:
+            logger.exception("Error getting top content-similar memories")
             return []
 
     def close(self):
@@ -509,6 +851,6 @@ class QdrantMemoryDB:
         if self.client:
             try:
                 self.client.close()
-            except Exception as e:
-                print(f"Error closing database: {e}")
+            except Exception:
+                logger.exception("Error closing database")
 
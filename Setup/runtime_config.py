@@ -16,36 +16,49 @@ Usage:
 
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class ServicesConfig:
     qdrant_host: str
     qdrant_http_port: int
+    qdrant_grpc_port: int
     phpmyadmin_port: int
     grafana_port: int
 
-    @property
+    # Fields never change after init_runtime(), so URLs are built once
+
+    @functools.cached_property
     def qdrant_base_url(self) -> str:
         # Docker maps 6333->1002 by default in this project
         return f"http://{self.qdrant_host}:{self.qdrant_http_port}"
 
     @property
+    def qdrant_grpc_endpoint(self) -> Tuple[str, int]:
+        # Docker maps 6334->1003 by default in this project
+        return (self.qdrant_host, self.qdrant_grpc_port)
+
+    @functools.cached_property
     def phpmyadmin_url(self) -> str:
         return f"http://localhost:{self.phpmyadmin_port}"
 
-    @property
+    @functools.cached_property
     def grafana_url(self) -> str:
         return f"http://localhost:{self.grafana_port}"
 
+    @functools.cached_property
+    def _qdrant_collections_url(self) -> str:
+        return self.qdrant_base_url + "/collections"
+
     def qdrant_collections_url(self) -> str:
-        return f"{self.qdrant_base_url}/collections"
+        return self._qdrant_collections_url
 
     def qdrant_collection_url(self, name: str) -> str:
-        return f"{self.qdrant_base_url}/collections/{name}"
+        return f"{self._qdrant_collections_url}/{name}"
 
 
 @dataclass
@@ -83,12 +96,14 @@ def init_runtime() -> RuntimeConfig:
     qdrant_host = os.getenv("QDRANT_HOST", "localhost")
     # In docker-compose we expose 1002->6333; prefer 1002
     qdrant_http_port = int(os.getenv("QDRANT_PORT", "1002"))
+    qdrant_grpc_port = int(os.getenv("QDRANT_GRPC_PORT", "1003"))
     phpmyadmin_port = int(os.getenv("PHPMYADMIN_PORT", "1005"))
     grafana_port = int(os.getenv("GRAFANA_PORT", "1006"))
 
     services = ServicesConfig(
         qdrant_host=qdrant_host,
         qdrant_http_port=qdrant_http_port,
+        qdrant_grpc_port=qdrant_grpc_port,
         phpmyadmin_port=phpmyadmin_port,
         grafana_port=grafana_port,
     )
@@ -4,13 +4,21 @@ Structured Memory System
 Handles structured memory creation and management for agents.
 """
 
+import os
+import sys
 import time
-import uuid
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Union
-from dataclasses import dataclass, asdict
+from dataclasses import InitVar, dataclass, asdict, field, fields
 from enum import Enum
 
+import numpy as np
+
+from Setup.context_enums import (
+    EVT_DECISION, EVT_EMOTIONAL, EVT_GENERAL, EVT_INTERACTION, EVT_LEARNING, EVT_OBSERVATION,
+    ENV_SOCIAL, ENV_UNKNOWN, EMO_NEUTRAL,
+)
+
 class EventType(Enum):
     """Types of events that can be stored as memories."""
     INTERACTION = "interaction"
@@ -52,9 +60,63 @@ class EmotionalState(Enum):
     PROUD = "proud"
     ASHAMED = "ashamed"
 
-@dataclass
+
+def _enum_value(value):
+    """Return an enum member's string value; plain strings pass through."""
+    return value.value if isinstance(value, Enum) else value
+
+# Precomputed narrative fragments for _generate_personal_narrative
+_FELT_TEMPLATE = "I felt {} during this event."
+_FELT_TEXT = {state.value: _FELT_TEMPLATE.format(state.value) for state in EmotionalState}
+_IMPACT_TEXT = (
+    "This was a routine event.",
+    "This was a moderately important event.",
+    "This was a highly significant event for me.",
+)
+_TYPE_SUFFIX = {
+    EVT_INTERACTION: "I interacted with others during this event.",
+    EVT_DECISION: "I made an important decision.",
+    EVT_LEARNING: "I learned something new from this experience.",
+    EVT_EMOTIONAL: "This event had a strong emotional impact on me.",
+}
+
+
+def _build_narrative(event_description: str, event_type: str, emotional_state: str, impact_score: float) -> str:
+    """Build the first-person narrative for a memory."""
+    narrative_parts = []
+    
+    # Add emotional context
+    if emotional_state != EMO_NEUTRAL:
+        felt = _FELT_TEXT.get(emotional_state)
+        narrative_parts.append(felt if felt is not None else _FELT_TEMPLATE.format(emotional_state))
+    
+    # Add impact context (>7 highly significant, >4 moderate, else routine)
+    narrative_parts.append(_IMPACT_TEXT[(impact_score > 4) + (impact_score > 7)])
+    
+    # Add event description
+    narrative_parts.append(f"The event involved: {event_description}")
+    
+    # Add type-specific context
+    suffix = _TYPE_SUFFIX.get(event_type)
+    if suffix is not None:
+        narrative_parts.append(suffix)
+    
+    return " ".join(narrative_parts)
+
+
+@dataclass(slots=True, frozen=True)
 class StructuredMemory:
-    """Structured memory object for agents."""
+    """
+    Structured memory object for agents.
+
+    Immutable and slotted (no per-instance __dict__); derive modified copies
+    with dataclasses.replace(memory, ...), e.g. to attach a vector_embedding.
+
+    personal_narrative is built from the event fields on first access and
+    cached, so memories that are never inspected never pay for it. Passing
+    personal_narrative= to the constructor supplies it instead (it is not
+    carried over by dataclasses.replace, so pass it again there).
+    """
     memory_id: str
     agent_id: str
     timestamp: float
@@ -69,12 +131,229 @@ class StructuredMemory:
     impact_score: float
     analysis_type: str
     personal_significance: float
-    personal_narrative: str
     context_description: str
     learning_outcome: str
     future_implications: str
     context_tags: List[str]
     vector_embedding: Optional[List[float]] = None
+    event_description: str = ""
+    personal_narrative: InitVar[Optional[str]] = None
+    _narrative: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self, personal_narrative: Optional[str]):
+        if personal_narrative is not None:
+            # Frozen dataclass: the cache slot is written around __setattr__
+            object.__setattr__(self, "_narrative", personal_narrative)
+    
+    def _personal_narrative(self) -> str:
+        """First-person narrative of the event (computed once)."""
+        narrative = self._narrative
+        if narrative is None:
+            narrative = _build_narrative(
+                self.event_description, self.event_type, self.emotional_state, self.impact_score
+            )
+            object.__setattr__(self, "_narrative", narrative)
+        return narrative
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert memory to a dictionary, including the personal narrative."""
+        data = asdict(self)
+        del data["_narrative"]
+        data["personal_narrative"] = self.personal_narrative
+        return data
+
+# Installed after the class is built: inside the body the name is taken by the
+# personal_narrative InitVar (whose None default __init__ has already captured)
+StructuredMemory.personal_narrative = property(StructuredMemory._personal_narrative)
+
+
+# Numeric StructuredMemory fields, laid out for columnar bulk builds. impact_score
+# stays float64 so rebuilt memories hit the same narrative thresholds (> 4, > 7)
+MEMORY_NUMERIC_DTYPE = np.dtype([
+    ("timestamp", "f8"),
+    ("created_at", "f8"),
+    ("impact_score", "f8"),
+    ("personal_significance", "f4"),
+])
+
+
+class MemoryBatch:
+    """
+    Columnar batch of memories produced by MemoryBuilder.create_many.
+
+    Numeric fields live in one structured array (MEMORY_NUMERIC_DTYPE); string
+    fields are parallel lists. StructuredMemory objects are only built when a
+    row is indexed or iterated.
+    """
+    __slots__ = ("agent_id", "memory_ids", "numeric", "event_descriptions",
+                 "event_types", "environments", "emotional_states")
+
+    def __init__(self, agent_id: str, memory_ids: List[str], numeric: np.ndarray,
+                 event_descriptions: List[str], event_types: List[str],
+                 environments: List[str], emotional_states: List[str]):
+        self.agent_id = agent_id
+        self.memory_ids = memory_ids
+        self.numeric = numeric
+        self.event_descriptions = event_descriptions
+        self.event_types = event_types
+        self.environments = environments
+        self.emotional_states = emotional_states
+
+    def __len__(self) -> int:
+        return len(self.memory_ids)
+
+    def __getitem__(self, i: int) -> StructuredMemory:
+        timestamp, created_at, impact_score, personal_significance = self.numeric[i].tolist()
+        return StructuredMemory(
+            memory_id=self.memory_ids[i],
+            agent_id=self.agent_id,
+            timestamp=timestamp,
+            created_at=created_at,
+            event_type=self.event_types[i],
+            environment=self.environments[i],
+            location="unknown",
+            source="agent",
+            target="self",
+            participants=[],
+            emotional_state=self.emotional_states[i],
+            impact_score=impact_score,
+            analysis_type="automatic",
+            personal_significance=personal_significance,
+            event_description=self.event_descriptions[i],
+            context_description="",
+            learning_outcome="",
+            future_implications="",
+            context_tags=[]
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+# Label columns stored as integer codes in MemoryStore, seeded with the enum vocabularies
+_STORE_LABELS = {
+    "event_type": tuple(e.value for e in EventType),
+    "environment": tuple(e.value for e in Environment),
+    "emotional_state": tuple(e.value for e in EmotionalState),
+}
+
+MEMORY_STORE_DTYPE = np.dtype(
+    MEMORY_NUMERIC_DTYPE.descr + [(name, "i2") for name in _STORE_LABELS]
+)
+
+# Remaining (non-columnar) StructuredMemory fields, kept per row as a tuple
+_STORE_OBJECT_FIELDS = tuple(
+    f.name for f in fields(StructuredMemory)
+    if f.init and f.name not in MEMORY_STORE_DTYPE.names
+)
+
+
+class MemoryStore:
+    """
+    Columnar (structure-of-arrays) store of memories for bulk analytics.
+
+    Numeric fields and label codes live in one contiguous MEMORY_STORE_DTYPE
+    array, so scans such as top-k by impact or counts by event type are single
+    NumPy operations. The other fields are kept per row and StructuredMemory
+    objects are rebuilt on demand with row(i). personal_significance is stored
+    as float32.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize an empty store.
+        
+        Args:
+            capacity: Initial number of rows to allocate (grows by doubling)
+        """
+        self._rows = np.empty(max(1, capacity), dtype=MEMORY_STORE_DTYPE)
+        self._size = 0
+        self._objects: List[tuple] = []
+        self._labels = {name: list(values) for name, values in _STORE_LABELS.items()}
+        self._codes = {name: {v: i for i, v in enumerate(values)} for name, values in _STORE_LABELS.items()}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _code(self, name: str, value: str) -> int:
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            # Labels outside the enum vocabulary get the next free code
+            code = codes[value] = len(self._labels[name])
+            self._labels[name].append(value)
+        return code
+
+    def append(self, memory: StructuredMemory) -> int:
+        """
+        Add a memory as a new row.
+        
+        Returns:
+            Row index of the memory
+        """
+        if self._size == len(self._rows):
+            grown = np.empty(2 * len(self._rows), dtype=MEMORY_STORE_DTYPE)
+            grown[:self._size] = self._rows[:self._size]
+            self._rows = grown
+        self._rows[self._size] = (
+            memory.timestamp,
+            memory.created_at,
+            memory.impact_score,
+            memory.personal_significance,
+            self._code("event_type", memory.event_type),
+            self._code("environment", memory.environment),
+            self._code("emotional_state", memory.emotional_state),
+        )
+        # The narrative rides along so a supplied (or already built) one survives row()
+        self._objects.append(tuple(getattr(memory, name) for name in _STORE_OBJECT_FIELDS) + (memory._narrative,))
+        self._size += 1
+        return self._size - 1
+
+    def extend(self, memories) -> None:
+        """Add each memory of an iterable (e.g. a MemoryBatch) as a row."""
+        for memory in memories:
+            self.append(memory)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a view of one MEMORY_STORE_DTYPE column over the stored rows."""
+        return self._rows[name][:self._size]
+
+    def row(self, i: int) -> StructuredMemory:
+        """Rebuild the StructuredMemory stored at row i."""
+        if not -self._size <= i < self._size:
+            raise IndexError(f"row {i} out of range for {self._size} memories")
+        i %= self._size
+        *objects, narrative = self._objects[i]
+        values = dict(zip(_STORE_OBJECT_FIELDS, objects))
+        record = self._rows[i]
+        for name in MEMORY_NUMERIC_DTYPE.names:
+            values[name] = record[name].item()
+        for name, labels in self._labels.items():
+            values[name] = labels[record[name]]
+        return StructuredMemory(**values, personal_narrative=narrative)
+
+    def where_event_type(self, event_type: Union[str, EventType]) -> np.ndarray:
+        """Row indices of memories with the given event type."""
+        code = self._codes["event_type"].get(_enum_value(event_type))
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self.column("event_type") == code)
+
+    def count_by_event_type(self) -> Dict[str, int]:
+        """Number of stored memories per event type (types with no memories omitted)."""
+        counts = np.bincount(self.column("event_type"), minlength=len(self._labels["event_type"]))
+        return {label: int(n) for label, n in zip(self._labels["event_type"], counts) if n}
+
+    def top_k_by_impact(self, k: int) -> np.ndarray:
+        """Row indices of the k highest-impact memories, highest first."""
+        scores = self.column("impact_score")
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        top = np.argpartition(scores, len(scores) - k)[len(scores) - k:]
+        return top[np.argsort(scores[top])[::-1]]
+
 
 class MemoryBuilder:
     """Builder for creating structured memories."""
@@ -90,13 +369,13 @@ class MemoryBuilder:
     
     def create_memory_from_event(self, 
                                 event_description: str,
-                                event_type: Union[str, EventType] = EventType.GENERAL,
-                                environment: Union[str, Environment] = Environment.UNKNOWN,
+                                event_type: Union[str, EventType] = EVT_GENERAL,
+                                environment: Union[str, Environment] = ENV_UNKNOWN,
                                 location: str = "unknown",
                                 source: str = "agent",
                                 target: str = "self",
                                 participants: List[str] = None,
-                                emotional_state: Union[str, EmotionalState] = EmotionalState.NEUTRAL,
+                                emotional_state: Union[str, EmotionalState] = EMO_NEUTRAL,
                                 impact_score: float = 0.0,
                                 personal_significance: float = 0.0,
                                 context_description: str = "",
@@ -130,24 +409,21 @@ class MemoryBuilder:
         if context_tags is None:
             context_tags = []
         
-        # Convert enums to strings
-        if isinstance(event_type, EventType):
-            event_type = event_type.value
-        if isinstance(environment, Environment):
-            environment = environment.value
-        if isinstance(emotional_state, EmotionalState):
-            emotional_state = emotional_state.value
-        
-        # Generate personal narrative
-        personal_narrative = self._generate_personal_narrative(
-            event_description, event_type, emotional_state, impact_score
-        )
+        # Convert enums to strings (defaults are already strings); interned so
+        # memories share one object per label from the small vocabulary
+        event_type = sys.intern(_enum_value(event_type))
+        environment = sys.intern(_enum_value(environment))
+        emotional_state = sys.intern(_enum_value(emotional_state))
         
+        # Both fields mean "creation time"; read the clock once
+        now_ts = time.time()
         memory = StructuredMemory(
-            memory_id=str(uuid.uuid4()),
+            # 32 random hex chars (128 random bits, vs 122 for uuid4) without the UUID object,
+            # and still a valid (simple-form) UUID string for Qdrant point IDs
+            memory_id=os.urandom(16).hex(),
             agent_id=self.agent_id,
-            timestamp=time.time(),
-            created_at=time.time(),
+            timestamp=now_ts,
+            created_at=now_ts,
             event_type=event_type,
             environment=environment,
             location=location,
@@ -158,7 +434,7 @@ class MemoryBuilder:
             impact_score=impact_score,
             analysis_type="automatic",
             personal_significance=personal_significance,
-            personal_narrative=personal_narrative,
+            event_description=event_description,
             context_description=context_description,
             learning_outcome=learning_outcome,
             future_implications=future_implications,
@@ -167,40 +443,71 @@ class MemoryBuilder:
         
         return memory
     
+    def create_many(self, events) -> MemoryBatch:
+        """
+        Create many memories at once from columnar event data.
+        
+        Intended for synthetic/test harnesses that generate thousands of
+        memories; rows share one clock read and one urandom call, and
+        narratives are only built for rows whose personal_narrative is read.
+        
+        Args:
+            events: pandas DataFrame or mapping of column name -> sequence.
+                Requires 'event_description'; optional 'event_type',
+                'environment', 'emotional_state', 'impact_score' and
+                'personal_significance' columns fall back to the
+                create_memory_from_event defaults.
+            
+        Returns:
+            MemoryBatch with numeric fields in a MEMORY_NUMERIC_DTYPE array
+        """
+        descriptions = [str(d) for d in events["event_description"]]
+        n = len(descriptions)
+        
+        def labels(column, default):
+            if column not in events:
+                return [default] * n
+            # Missing cells (None/NaN) and other non-strings fall back to the column default
+            values = (_enum_value(v) for v in events[column])
+            return [sys.intern(v) if isinstance(v, str) else default for v in values]
+        
+        def scores(column):
+            if column in events:
+                return np.asarray(events[column], dtype=np.float64)
+            return np.zeros(n, dtype=np.float64)
+        
+        event_types = labels("event_type", EVT_GENERAL)
+        environments = labels("environment", ENV_UNKNOWN)
+        emotional_states = labels("emotional_state", EMO_NEUTRAL)
+        impact_scores = scores("impact_score")
+        
+        numeric = np.empty(n, dtype=MEMORY_NUMERIC_DTYPE)
+        now_ts = time.time()
+        numeric["timestamp"] = now_ts
+        numeric["created_at"] = now_ts
+        numeric["impact_score"] = impact_scores
+        numeric["personal_significance"] = scores("personal_significance")
+        
+        raw_ids = os.urandom(16 * n).hex()
+        memory_ids = [raw_ids[i:i + 32] for i in range(0, 32 * n, 32)]
+        
+        return MemoryBatch(
+            agent_id=self.agent_id,
+            memory_ids=memory_ids,
+            numeric=numeric,
+            event_descriptions=descriptions,
+            event_types=event_types,
+            environments=environments,
+            emotional_states=emotional_states
+        )
+    
     def _generate_personal_narrative(self, 
                                    event_description: str, 
                                    event_type: str, 
                                    emotional_state: str, 
                                    impact_score: float) -> str:
         """Generate a personal narrative for the memory."""
-        narrative_parts = []
-        
-        # Add emotional context
-        if emotional_state != "neutral":
-            narrative_parts.append(f"I felt {emotional_state} during this event.")
-        
-        # Add impact context
-        if impact_score > 7:
-            narrative_parts.append("This was a highly significant event for me.")
-        elif impact_score > 4:
-            narrative_parts.append("This was a moderately important event.")
-        else:
-            narrative_parts.append("This was a routine event.")
-        
-        # Add event description
-        narrative_parts.append(f"The event involved: {event_description}")
-        
-        # Add type-specific context
-        if event_type == "interaction":
-            narrative_parts.append("I interacted with others during this event.")
-        elif event_type == "decision":
-            narrative_parts.append("I made an important decision.")
-        elif event_type == "learning":
-            narrative_parts.append("I learned something new from this experience.")
-        elif event_type == "emotional":
-            narrative_parts.append("This event had a strong emotional impact on me.")
-        
-        return " ".join(narrative_parts)
+        return _build_narrative(event_description, event_type, emotional_state, impact_score)
     
     def create_memory_from_interaction(self, 
                                      other_agent_id: str,
@@ -211,8 +518,8 @@ class MemoryBuilder:
         """Create a memory from an agent interaction."""
         return self.create_memory_from_event(
             event_description=f"Interaction with {other_agent_id}: {description}",
-            event_type=EventType.INTERACTION,
-            environment=Environment.SOCIAL,
+            event_type=EVT_INTERACTION,
+            environment=ENV_SOCIAL,
             source="agent",
             target=other_agent_id,
             participants=[other_agent_id],
@@ -229,8 +536,8 @@ class MemoryBuilder:
         """Create a memory from a decision made."""
         return self.create_memory_from_event(
             event_description=f"Decision: {decision_description}",
-            event_type=EventType.DECISION,
-            environment=Environment.UNKNOWN,
+            event_type=EVT_DECISION,
+            environment=ENV_UNKNOWN,
             source="agent",
             target="self",
             participants=[],
@@ -249,7 +556,7 @@ class MemoryBuilder:
         """Create a memory from an observation."""
         return self.create_memory_from_event(
             event_description=f"Observation: {observation}",
-            event_type=EventType.OBSERVATION,
+            event_type=EVT_OBSERVATION,
             environment=environment,
             location=location,
             emotional_state=emotional_state,
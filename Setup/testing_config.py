@@ -4,33 +4,48 @@ Testing Configuration
 Provides testing utilities and configuration for the World_Sim system.
 """
 
+import functools
 import os
 from typing import Any, Dict
 
+@functools.cache
 def is_testing_mode() -> bool:
-    """Check if the system is running in testing mode."""
+    """Check if the system is running in testing mode (cached; see refresh_testing_flags)."""
     return os.getenv('TESTING_MODE', 'false').lower() == 'true'
 
+@functools.cache
 def should_mock_llm() -> bool:
-    """Check if LLM should be mocked for testing."""
+    """Check if LLM should be mocked for testing (cached; see refresh_testing_flags)."""
     return os.getenv('MOCK_LLM', 'false').lower() == 'true'
 
+def refresh_testing_flags() -> None:
+    """Re-read TESTING_MODE / MOCK_LLM after changing them at runtime."""
+    is_testing_mode.cache_clear()
+    should_mock_llm.cache_clear()
+
 class MockEvent:
     """Mock event class for testing purposes."""
     
+    __slots__ = ('event_id', 'event_type', '_data')
+    
     def __init__(self, event_id: int, event_type: str, **kwargs):
         self.event_id = event_id
         self.event_type = event_type
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        self._data = kwargs
+    
+    def __getattr__(self, name: str) -> Any:
+        # Extra kwargs stay readable as attributes (only called for non-slot names);
+        # '_data' itself is unset while copy/pickle rebuild the object
+        if name == '_data':
+            raise AttributeError(name)
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert mock event to dictionary."""
-        return {
-            'event_id': self.event_id,
-            'event_type': self.event_type,
-            **{k: v for k, v in self.__dict__.items() if not k.startswith('_')}
-        }
+        return {'event_id': self.event_id, 'event_type': self.event_type, **self._data}
 
 # Set testing mode for this session
 os.environ['TESTING_MODE'] = 'true'
@@ -3,104 +3,149 @@
 Verify Database Tables Script
 Verifies that all required tables exist in both NAS and Docker environments.
 """
-import sys
-import os
 import argparse
-from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+import mysql.connector
+from mysql.connector import errorcode
 
 from Utils.path_manager import initialize_paths
 initialize_paths()
 
-from Database.connection_manager import get_db_manager
-from Database.database_manager import DatabaseConfig
-from Utils.environment_config import get_database_config
+from Utils.environment_config import EnvironmentConfig
 
+# Expected tables per logical database role; db_config maps '<role>_name' to the actual name.
+# Keep in sync with the sim_verify_tables procedure (Database/schemas/18_verify_tables.sql).
+EXPECTED_TABLES = {
+    'agents': frozenset({
+        'agents', 'agent_experiences', 'agent_personal_summaries',
+        'l2_agent_core', 'l2_geo', 'l2_location',
+        'l2_other_part_1', 'l2_other_part_2', 'l2_other_part_3', 'l2_other_part_4',
+        'l2_political_part_1', 'l2_political_part_2', 'l2_political_part_3'
+    }),
+    'firms': frozenset({'firms', 'firm_states'}),
+    'sim': frozenset({
+        'simulations', 'action_ledger', 'events', 'transactions',
+        'plans', 'plan_steps', 'fact_gdp_periods'
+    }),
+}
 
-def verify_database_tables(target):
-    """Verify that all required tables exist for the specified target."""
-    print(f"Verifying database tables on {target.upper()}...")
-    
-    # Set environment variable
-    os.environ['DATABASE_TARGET'] = target
+VERIFY_PROCEDURE = 'sim_verify_tables'
+
+
+def verify_database_tables(target, log=print):
+    """
+    Verify that all required tables exist for the specified target.
+
+    Args:
+        target: 'docker' or 'nas'
+        log: Callable receiving each output line (lets parallel runs buffer output)
+    """
+    log(f"Verifying database tables on {target.upper()}...")
     
-    # Get database configuration
-    env_config = get_database_config()
+    # Get database configuration for this target without touching os.environ,
+    # so both targets can be verified concurrently
+    env_config = EnvironmentConfig()
+    env_config.database_target = target
     db_config = env_config.get_database_config()
     
-    print(f"  Host: {db_config['host']}:{db_config['port']}")
-    print(f"  User: {db_config['user']}")
+    log(f"  Host: {db_config['host']}:{db_config['port']}")
+    log(f"  User: {db_config['user']}")
     
     try:
-        # Connect to database
-        connection = mysql.connector.connect(
+        # Connect to database; closed on exit even if a query fails
+        with closing(mysql.connector.connect(
             host=db_config['host'],
             port=db_config['port'],
             user=db_config['user'],
             password=db_config['password'],
             charset='utf8mb4',
             collation='utf8mb4_unicode_ci'
-        )
-        
-        cursor = connection.cursor()
+        )) as connection, closing(connection.cursor()) as cursor:
+            return _check_tables(cursor, db_config, target, log)
         
-        # Expected databases and their tables
-        expected_databases = {
-            db_config['agents_name']: [
-                'agents', 'agent_experiences', 'agent_personal_summaries',
-                'l2_agent_core', 'l2_geo', 'l2_location', 
-                'l2_other_part_1', 'l2_other_part_2', 'l2_other_part_3', 'l2_other_part_4',
-                'l2_political_part_1', 'l2_political_part_2', 'l2_political_part_3'
-            ],
-            db_config['firms_name']: ['firms', 'firm_states'],
-            db_config['sim_name']: [
-                'simulations', 'action_ledger', 'events', 'transactions',
-                'plans', 'plan_steps', 'fact_gdp_periods'
-            ]
+    except Exception as e:
+        log(f"[ERROR] Failed to connect to {target.upper()}: {e}")
+        return False
+
+def _check_tables(cursor, db_config, target, log):
+    """Compare the tables present on the server with the expected tables."""
+    expected_databases = {db_config[f'{role}_name']: tables for role, tables in EXPECTED_TABLES.items()}
+    
+    all_good = True
+    
+    found_tables = None
+    missing_by_db = _missing_tables_from_procedure(cursor, db_config)
+    if missing_by_db is None:
+        # Procedure not installed: one round trip for every database, diffed here
+        placeholders = ", ".join(["%s"] * len(expected_databases))
+        cursor.execute(
+            "SELECT table_schema, table_name FROM information_schema.tables "
+            f"WHERE table_schema IN ({placeholders})",
+            list(expected_databases)
+        )
+        found_tables = defaultdict(set)
+        for table_schema, table_name in cursor.fetchall():
+            found_tables[table_schema].add(table_name)
+        missing_by_db = {
+            db_name: expected_tables - found_tables[db_name]
+            for db_name, expected_tables in expected_databases.items()
         }
+    
+    for db_name, expected_tables in expected_databases.items():
+        log(f"\n  Database: {db_name}")
+        if found_tables is not None:
+            log(f"    Tables found: {len(found_tables[db_name])}")
         
-        all_good = True
-        
-        for db_name, expected_tables in expected_databases.items():
-            print(f"\n  Database: {db_name}")
-            try:
-                cursor.execute(f"USE {db_name}")
-                cursor.execute("SHOW TABLES")
-                actual_tables = [row[0] for row in cursor.fetchall()]
-                
-                print(f"    Tables found: {len(actual_tables)}")
-                
-                # Check each expected table
-                missing_tables = []
-                for expected_table in expected_tables:
-                    if expected_table in actual_tables:
-                        print(f"    [SUCCESS] {expected_table}")
-                    else:
-                        print(f"    [MISSING] {expected_table} - MISSING")
-                        missing_tables.append(expected_table)
-                        all_good = False
-                
-                if missing_tables:
-                    print(f"    [WARNING] Missing {len(missing_tables)} tables: {missing_tables}")
-                else:
-                    print(f"    [SUCCESS] All {len(expected_tables)} tables present")
-                    
-            except Exception as e:
-                print(f"    [ERROR] Error checking {db_name}: {e}")
-                all_good = False
+        missing_tables = sorted(missing_by_db[db_name])
+        for expected_table in sorted(expected_tables.difference(missing_tables)):
+            log(f"    [SUCCESS] {expected_table}")
+        for missing_table in missing_tables:
+            log(f"    [MISSING] {missing_table} - MISSING")
         
-        if all_good:
-            print(f"\n[SUCCESS] All tables verified successfully on {target.upper()}!")
+        if missing_tables:
+            log(f"    [WARNING] Missing {len(missing_tables)} tables: {missing_tables}")
+            all_good = False
         else:
-            print(f"\n[ERROR] Some tables are missing on {target.upper()}!")
-        
-        return all_good
+            log(f"    [SUCCESS] All {len(expected_tables)} tables present")
         
-    except Exception as e:
-        print(f"[ERROR] Failed to connect to {target.upper()}: {e}")
-        return False
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            connection.close()
+        if found_tables is not None:
+            extra_tables = found_tables[db_name] - expected_tables
+            if extra_tables:
+                log(f"    Additional tables not checked: {sorted(extra_tables)}")
+    
+    if all_good:
+        log(f"\n[SUCCESS] All tables verified successfully on {target.upper()}!")
+    else:
+        log(f"\n[ERROR] Some tables are missing on {target.upper()}!")
+    
+    return all_good
+
+def _missing_tables_from_procedure(cursor, db_config):
+    """
+    Ask the server for missing tables via the sim_verify_tables procedure.
+
+    Returns:
+        Dict of database name -> set of missing tables, or None if the
+        procedure (or the simulations database holding it) does not exist
+    """
+    try:
+        cursor.callproc(
+            f"`{db_config['sim_name']}`.{VERIFY_PROCEDURE}",
+            (db_config['agents_name'], db_config['firms_name'], db_config['sim_name'])
+        )
+    except mysql.connector.Error as e:
+        if e.errno in (errorcode.ER_SP_DOES_NOT_EXIST, errorcode.ER_BAD_DB_ERROR):
+            return None
+        raise
+    
+    missing_by_db = defaultdict(set)
+    for result in cursor.stored_results():
+        for table_schema, table_name in result.fetchall():
+            missing_by_db[table_schema].add(table_name)
+    return missing_by_db
 
 def main():
     """Main function."""
@@ -113,13 +158,22 @@ def main():
         print("VERIFYING DATABASE TABLES ON BOTH TARGETS")
         print("=" * 60)
         
-        # Verify Docker
+        # Each target is latency-bound on its own MySQL server, so probe both at
+        # once and print each target's buffered output in order afterwards
+        outputs = {'docker': [], 'nas': []}
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {
+                target: executor.submit(verify_database_tables, target, outputs[target].append)
+                for target in outputs
+            }
+        
         print("\n1. Verifying Docker...")
-        docker_ok = verify_database_tables('docker')
+        print("\n".join(outputs['docker']))
+        docker_ok = futures['docker'].result()
         
-        # Verify NAS
         print("\n2. Verifying NAS...")
-        nas_ok = verify_database_tables('nas')
+        print("\n".join(outputs['nas']))
+        nas_ok = futures['nas'].result()
         
         print("\n" + "=" * 60)
         if docker_ok and nas_ok:
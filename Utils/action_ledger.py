@@ -1,20 +1,120 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import gzip
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+LEDGER_FORMATS = ("jsonl", "msgpack")
+
+# First bytes of a msgpack ledger; records follow as <u32 little-endian length><payload>
+_MSGPACK_MAGIC = b"WSLEDGER/msgpack/1\n"
+
+# JSONL ledgers up to this size are parsed from a single read in read_all()
+_BULK_READ_MAX_BYTES = 256 << 20
+
+# Reused stdlib encoder (compact separators) for when orjson is unavailable
+_json_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _dumps_line(rec: Dict[str, Any]) -> bytes:
+    """Encode one ledger record as a UTF-8 JSON line."""
+    if orjson is not None:
+        # Matches json.dumps: non-string keys are stringified, output is UTF-8 (no ASCII escaping)
+        return orjson.dumps(rec, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (_json_encode(rec) + "\n").encode("utf-8")
+
+
+def _msgpack_default(obj: Any) -> Any:
+    # Same rendering orjson gives datetimes in the JSONL format
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Type is not msgpack serializable: {type(obj).__name__}")
+
+
+def _pack_frame(rec: Dict[str, Any]) -> bytes:
+    """Encode one ledger record as a length-prefixed msgpack frame."""
+    buf = msgpack.packb(rec, use_bin_type=True, default=_msgpack_default)
+    return len(buf).to_bytes(4, "little") + buf
+
+
+def _open_read(path: Path):
+    """Open a ledger file for reading, decompressing .gz segments."""
+    return gzip.open(path, "rb") if path.suffix == ".gz" else path.open("rb")
+
+
+def _detect_format(path: Path) -> Optional[str]:
+    """Return the format of an existing, non-empty ledger file, else None."""
+    try:
+        with _open_read(path) as f:
+            head = f.read(len(_MSGPACK_MAGIC))
+    except (FileNotFoundError, EOFError):
+        return None
+    if not head:
+        return None
+    return "msgpack" if head == _MSGPACK_MAGIC else "jsonl"
 
 
 class ActionLedger:
-    def __init__(self, path: str = "logs/action_ledger.jsonl") -> None:
+    def __init__(self, path: str = "logs/action_ledger.jsonl", flush_every: int = 1, fmt: str = "jsonl",
+                 compress: bool = False, rotate_bytes: Optional[int] = None) -> None:
+        """
+        Append-only ledger of agent actions.
+
+        The file is opened once. By default every record is flushed to the OS
+        as it is written. ``flush_every=N`` batches N records per flush, which
+        is faster but loses up to N-1 records if the process dies without
+        ``close()``; buffered records are also flushed before any read.
+
+        ``fmt`` selects JSONL text (default) or length-prefixed msgpack frames,
+        which are smaller and faster to scan; use ``export_jsonl()`` to inspect
+        a msgpack ledger. An existing non-empty file keeps its own format.
+
+        ``compress`` writes gzip (level 1) to ``<path>.gz``; each flush closes a
+        gzip member so the file is always readable. With ``rotate_bytes`` set,
+        a new numbered segment (``action_ledger.00002.jsonl``) is started at
+        the first flush after the current one reaches that on-disk size.
+        """
         self.path = Path(path)
+        if compress and self.path.suffix != ".gz":
+            self.path = self.path.with_name(self.path.name + ".gz")
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.compress = self.path.suffix == ".gz"
+        self.rotate_bytes = rotate_bytes
+        self.flush_every = max(1, flush_every)
+        self._pending = 0
+        existing = _detect_format(self.path)
+        self.fmt = existing or fmt
+        if self.fmt not in LEDGER_FORMATS:
+            raise ValueError(f"Unknown ledger format: {self.fmt}. Must be one of {LEDGER_FORMATS}")
+        if self.fmt == "msgpack" and msgpack is None:
+            raise ImportError("msgpack is required for the msgpack ledger format")
+        self._encode = _pack_frame if self.fmt == "msgpack" else _dumps_line
+        # Resume appending to the newest segment
+        self._segment = max(1, len(self._segment_paths()))
+        self._fh = self._open_segment()
+        # Many records share one tick; format its timestamp once
+        self._last_now: Optional[datetime] = None
+        self._last_iso = ""
 
     def record(self, now: datetime, seed: Optional[int], agent_id: str, action: str, params: Dict[str, Any], events: List[Dict[str, Any]], journal: List[Dict[str, Any]]) -> None:
+        if now is not self._last_now:
+            self._last_now = now
+            self._last_iso = now.isoformat()
         rec = {
-            "ts": now.isoformat(),
+            "ts": self._last_iso,
             "seed": seed,
             "agent_id": agent_id,
             "action": action,
@@ -22,20 +122,143 @@ class ActionLedger:
             "events": events,
             "journal": journal,
         }
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self._fh.write(self._encode(rec))
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def _segment_path(self, n: int) -> Path:
+        """Path of segment n; segment 1 is the ledger path itself."""
+        if n == 1:
+            return self.path
+        stem, dot, suffixes = self.path.name.partition(".")
+        return self.path.with_name(f"{stem}.{n:05d}{dot}{suffixes}")
+
+    def _segment_paths(self) -> List[Path]:
+        """Existing ledger segments in write order."""
+        stem, dot, suffixes = self.path.name.partition(".")
+        rotated = sorted(self.path.parent.glob(f"{stem}.{'[0-9]' * 5}{dot}{suffixes}"))
+        return ([self.path] if self.path.exists() else []) + rotated
+
+    def _open_segment(self):
+        path = self._segment_path(self._segment)
+        is_new = not path.exists() or path.stat().st_size == 0
+        if self.compress:
+            fh = gzip.open(path, "ab", compresslevel=1)
+        else:
+            fh = path.open("ab", buffering=1 << 20)
+        if self.fmt == "msgpack" and is_new:
+            fh.write(_MSGPACK_MAGIC)
+        return fh
+
+    def flush(self) -> None:
+        """Push buffered records to the OS, rotating segments if configured."""
+        if not self._fh.closed and self._pending:
+            if self.compress:
+                # Finish the gzip member so readers never see a truncated stream
+                self._fh.close()
+            else:
+                self._fh.flush()
+            if self.rotate_bytes and self._segment_path(self._segment).stat().st_size >= self.rotate_bytes:
+                self._fh.close()
+                self._segment += 1
+            if self._fh.closed:
+                self._fh = self._open_segment()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Flush and close the ledger file."""
+        if not self._fh.closed:
+            self._fh.flush()
+            self._fh.close()
+        self._pending = 0
+
+    def __enter__(self) -> "ActionLedger":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield ledger records one at a time.
+
+        Scans that only count or filter should use this instead of read_all()
+        so memory stays constant regardless of ledger size.
+        """
+        self.flush()
+        for path in self._segment_paths():
+            with _open_read(path) as f:
+                if f.read(len(_MSGPACK_MAGIC)) == _MSGPACK_MAGIC:
+                    yield from self._iter_msgpack(f)
+                else:
+                    f.seek(0)
+                    yield from self._iter_jsonl(f)
+
+    @staticmethod
+    def _iter_jsonl(f) -> Iterator[Dict[str, Any]]:
+        loads = orjson.loads if orjson is not None else json.loads
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError as e:
+                print(f"Warning: Could not parse ledger line: {line.strip().decode('utf-8', 'replace')} - {e}")
+
+    @staticmethod
+    def _iter_msgpack(f) -> Iterator[Dict[str, Any]]:
+        if msgpack is None:
+            raise ImportError("msgpack is required to read a msgpack ledger")
+        while True:
+            header = f.read(4)
+            if not header:
+                return
+            size = int.from_bytes(header, "little")
+            payload = f.read(size)
+            if len(header) < 4 or len(payload) < size:
+                print("Warning: Truncated record at end of ledger")
+                return
+            try:
+                yield msgpack.unpackb(payload, raw=False, strict_map_key=False)
+            except ValueError as e:
+                print(f"Warning: Could not parse ledger record - {e}")
 
     def read_all(self) -> List[Dict[str, Any]]:
         """Reads all records from the ledger."""
         if not self.path.exists():
             return []
-        records = []
-        with self.path.open('r', encoding='utf-8') as f:
-            for line in f:
-                try:
-                    records.append(json.loads(line))
-                except json.JSONDecodeError as e:
-                    print(f"Warning: Could not parse ledger line: {line.strip()} - {e}")
-        return records
+        self.flush()
+        if (self.fmt != "jsonl" or self.compress or len(self._segment_paths()) > 1
+                or self.path.stat().st_size > _BULK_READ_MAX_BYTES):
+            return list(self.iter_records())
+        lines = self.path.read_bytes().splitlines()
+        loads = orjson.loads if orjson is not None else json.loads
+        try:
+            return [loads(line) for line in lines if line.strip()]
+        except ValueError:
+            # Re-parse line by line to skip (and report) the bad lines
+            return list(self._iter_jsonl(lines))
+
+    def export_jsonl(self, dest: Optional[str] = None) -> Path:
+        """
+        Write the ledger's records as JSONL for human inspection.
 
+        Args:
+            dest: Output path (defaults to ``<stem>.export.jsonl`` next to the
+                ledger, e.g. ``action_ledger.export.jsonl``)
 
+        Returns:
+            Path of the written JSONL file
+        """
+        if dest is not None:
+            out = Path(dest)
+        else:
+            stem = self.path.name.partition(".")[0]
+            out = self.path.with_name(f"{stem}.export.jsonl")
+        if out.resolve() == self.path.resolve():
+            raise ValueError("export_jsonl() would overwrite the ledger itself")
+        with out.open("wb") as f:
+            for rec in self.iter_records():
+                f.write(_dumps_line(rec))
+        return out
@@ -7,24 +7,58 @@ pre-loading in the agents table.
 """
 
 from __future__ import annotations
+import functools
+import itertools
 import os
+import pickle
+import sqlite3
 import sys
+import threading
 from pathlib import Path
-from typing import Optional, Dict, List, Any, TYPE_CHECKING
+from typing import Optional, Dict, Iterator, List, Any, TYPE_CHECKING
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+import mysql.connector
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from Utils.path_manager import initialize_paths
 initialize_paths()
 
 from Utils.l2_data.l2_data_parser import L2DataParser
+from Utils.l2_data.l2_data_objects import L2DataRow
+from Utils.bulk_l2_loader import load_bulk_l2_data
 
 from Database.database_manager import execute_query as dm_execute_query
+from Utils.db_pool import get_pool, execute_pooled
 import os as _os
 _agents_db = _os.getenv('DB_AGENTS_NAME', 'world_sim_agents')
+# Read once at import; timing output (level 3) is gated on this constant
+_VERBOSITY = int(_os.getenv('VERBOSITY', _os.getenv('VERBOSITY_LEVEL', '1')))
+
+def execute_agents_query(query: str, params=None, fetch: bool = True, prepared: bool = False):
+    """
+    Compatibility wrapper that returns list[dict] when fetch=True.
 
-def execute_agents_query(query: str, params=None, fetch: bool = True):
-    """Compatibility wrapper that returns list[dict] when fetch=True."""
+    prepared=True runs fixed, frequently repeated queries as server-side
+    prepared statements cached on each pooled connection.
+    """
+    pool = get_pool(_agents_db)
+    if pool is not None:
+        try:
+            return execute_pooled(pool, query, params, fetch=fetch, prepared=prepared)
+        except Exception as e:
+            print(f"Warning: agents query failed: {e}")
+            return [] if fetch else False
+    # No pool (e.g. connector misconfigured): use the shared database manager
     result = dm_execute_query(query, params, database=_agents_db, fetch=fetch)
     if fetch:
         if hasattr(result, 'success') and hasattr(result, 'data'):
@@ -35,6 +69,230 @@ def execute_agents_query(query: str, params=None, fetch: bool = True):
         return result.success
     return bool(result)
 
+# MySQL ER_NO_SUCH_TABLE: a missing L2 partition, as opposed to a failed query
+_ER_NO_SUCH_TABLE = 1146
+
+def _fetch_l2_rows(query: str, params) -> List[Dict[str, Any]]:
+    """
+    Run a prepared L2 lookup, raising on database errors.
+
+    Unlike execute_agents_query, a failed query is not reported as an empty
+    result, so callers can tell a missing voter from a pool/network error.
+    """
+    pool = get_pool(_agents_db)
+    if pool is not None:
+        return execute_pooled(pool, query, params, fetch=True, prepared=True)
+    result = dm_execute_query(query, params, database=_agents_db, fetch=True)
+    if hasattr(result, 'success') and hasattr(result, 'data'):
+        if not result.success:
+            raise RuntimeError(f"agents query failed: {getattr(result, 'error', 'unknown error')}")
+        return result.data or []
+    return result or []
+
+# L2 tables keyed by LALVOTERID (vertical splits of the L2 file), in merge order;
+# LALVOTERID is the only column they share
+L2_POLITICAL_TABLES = ('l2_political_part_1', 'l2_political_part_2', 'l2_political_part_3')
+L2_OTHER_TABLES = ('l2_other_part_1', 'l2_other_part_2', 'l2_other_part_3', 'l2_other_part_4')
+L2_TABLES = ('l2_agent_core', 'l2_location') + L2_POLITICAL_TABLES + L2_OTHER_TABLES + ('l2_geo',)
+
+def _select_list(columns) -> str:
+    """Column list for an L2 query; None selects every column."""
+    if columns is None:
+        return "*"
+    return ", ".join(["LALVOTERID"] + [f"`{column}`" for column in columns])
+
+def _build_l2_lookup_query(tables, columns=None) -> str:
+    """Build a single-row query joining every L2 table for one LALVOTERID."""
+    joins = " ".join(f"LEFT JOIN {table} USING (LALVOTERID)" for table in tables)
+    found = " + ".join(f"({table}.LALVOTERID IS NOT NULL)" for table in tables)
+    # USING coalesces LALVOTERID into one column; the derived row keeps it even on a miss
+    return f"SELECT {_select_list(columns)}, {found} AS _l2_tables_found FROM (SELECT %s AS LALVOTERID) AS v {joins}"
+
+def _build_per_table_query(source: str, columns=None) -> str:
+    return f"SELECT {_select_list(columns)} FROM {source} WHERE LALVOTERID = %s"
+
+_L2_LOOKUP_QUERY = _build_l2_lookup_query(L2_TABLES)
+
+# Sources for the per-table fallback, in merge order (core -> location -> political -> other -> geo).
+# Partitions are queried one by one so a missing partition only drops its own columns.
+_L2_PER_TABLE_SOURCES = ('l2_agent_core', 'l2_location') + L2_POLITICAL_TABLES + L2_OTHER_TABLES + ('l2_geo',)
+_L2_PER_TABLE_QUERIES = tuple(_build_per_table_query(source) for source in _L2_PER_TABLE_SOURCES)
+_l2_executor = ThreadPoolExecutor(max_workers=len(_L2_PER_TABLE_SOURCES), thread_name_prefix='l2_lookup')
+
+_VOTER_ID_PAGE_QUERY = "SELECT LALVOTERID FROM l2_agent_core WHERE LALVOTERID > %s ORDER BY LALVOTERID LIMIT %s"
+_VOTER_ID_BATCH_SIZE = 10_000
+
+# L2 fields read downstream: everything L2DataRow parses plus the summary extractors below
+_L2_SUMMARY_FIELDS = frozenset({'Voters_Education', 'Voters_Income', 'Voters_Party'})
+
+_l2_queries = None
+_l2_queries_lock = threading.Lock()
+
+def _get_l2_queries():
+    """
+    Return the (joined lookup, per-table fallback) L2 queries, built once.
+
+    Queries select only the fields read downstream; set L2_SELECT_STAR=1 to
+    fetch every column (e.g. when debugging raw L2 rows).
+    """
+    global _l2_queries
+    if _l2_queries is not None:
+        return _l2_queries
+    with _l2_queries_lock:
+        if _l2_queries is None:
+            _l2_queries = _build_projected_queries()
+    return _l2_queries
+
+def _build_projected_queries():
+    """Project the L2 queries onto the used columns that exist in each table."""
+    if os.getenv('L2_SELECT_STAR', 'false').lower() in ('1', 'true'):
+        return _L2_LOOKUP_QUERY, _L2_PER_TABLE_QUERIES
+    
+    placeholders = ", ".join(["%s"] * len(L2_TABLES))
+    rows = execute_agents_query(
+        "SELECT table_name AS table_name, column_name AS column_name, column_key AS column_key "
+        "FROM information_schema.columns "
+        f"WHERE table_schema = %s AND table_name IN ({placeholders}) ORDER BY table_name, ordinal_position",
+        (_agents_db,) + L2_TABLES, fetch=True
+    )
+    if not rows:
+        print("Warning: Could not read L2 table columns; L2 lookups will select all columns")
+        return _L2_LOOKUP_QUERY, _L2_PER_TABLE_QUERIES
+    
+    used = L2DataRow.fields_read() | _L2_SUMMARY_FIELDS
+    columns = {}
+    for row in rows:
+        table_columns = columns.setdefault(row['table_name'], [])
+        if row['column_name'] == 'LALVOTERID':
+            # The schemas make it the primary key; without an index every lookup scans the table
+            if row['table_name'] in L2_TABLES and row['column_key'] not in ('PRI', 'UNI'):
+                print(f"Warning: {row['table_name']}.LALVOTERID is not indexed; L2 lookups will scan the table")
+        elif row['column_name'] in used:
+            table_columns.append(row['column_name'])
+    
+    # A source missing from information_schema keeps SELECT * (and fails as before)
+    lookup_query = _build_l2_lookup_query(L2_TABLES, [c for table in L2_TABLES for c in columns.get(table, ())])
+    if any(table not in columns for table in L2_TABLES):
+        lookup_query = _L2_LOOKUP_QUERY
+    per_table_queries = tuple(
+        _build_per_table_query(source, columns.get(source)) for source in _L2_PER_TABLE_SOURCES
+    )
+    return lookup_query, per_table_queries
+
+def _fetch_table_times(query: str, params) -> List[Dict[str, Any]]:
+    """
+    Read information_schema.TABLES with table statistics caching turned off.
+
+    MySQL 8 serves UPDATE_TIME/CREATE_TIME from a cache refreshed every
+    information_schema_stats_expiry seconds (a day by default), so a table
+    reloaded since then would still look unchanged. The pooled connection's
+    setting is restored afterwards.
+    """
+    pool = get_pool(_agents_db)
+    if pool is None:
+        return execute_agents_query(query, params, fetch=True)
+    try:
+        with pool.connection() as pooled, closing(pooled.cnx.cursor(dictionary=True)) as cursor:
+            try:
+                cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+            except mysql.connector.Error:
+                # Servers before 8.0 have no stats cache (or the variable)
+                cursor.execute(query, params)
+                return cursor.fetchall()
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+            finally:
+                cursor.execute("SET SESSION information_schema_stats_expiry = DEFAULT")
+    except Exception as e:
+        print(f"Warning: agents query failed: {e}")
+        return []
+
+class _L2DiskCache:
+    """
+    SQLite store of L2 lookups that persists across runs.
+
+    Entries are tagged with the L2 tables' create/update time at open, so
+    re-ingesting the L2 tables invalidates them.
+    """
+    
+    def __init__(self, path: Path, version: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.version = version
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS l2_cache(voter TEXT PRIMARY KEY, data BLOB, version TEXT)")
+        self._conn.commit()
+    
+    def get(self, l2_voter_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM l2_cache WHERE voter = ? AND version = ?", (l2_voter_id, self.version)
+            ).fetchone()
+        return pickle.loads(row[0]) if row else None
+    
+    def put(self, l2_voter_id: str, l2_data: Dict[str, Any]) -> None:
+        blob = pickle.dumps(l2_data, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO l2_cache VALUES (?, ?, ?)", (l2_voter_id, blob, self.version))
+            self._conn.commit()
+
+_disk_cache: Optional[_L2DiskCache] = None
+_disk_cache_checked = False
+_disk_cache_lock = threading.Lock()
+
+def _get_disk_cache() -> Optional[_L2DiskCache]:
+    """Open the persistent L2 cache once if L2_DISK_CACHE is enabled."""
+    global _disk_cache, _disk_cache_checked
+    if _disk_cache_checked:
+        return _disk_cache
+    with _disk_cache_lock:
+        if _disk_cache_checked:
+            return _disk_cache
+        try:
+            if os.getenv('L2_DISK_CACHE', 'false').lower() in ('1', 'true'):
+                placeholders = ", ".join(["%s"] * len(L2_TABLES))
+                rows = _fetch_table_times(
+                    "SELECT MAX(COALESCE(UPDATE_TIME, CREATE_TIME)) AS version FROM information_schema.tables "
+                    f"WHERE table_schema = %s AND table_name IN ({placeholders})",
+                    (_agents_db,) + L2_TABLES
+                )
+                version = rows[0]['version'] if rows else None
+                if version is not None:
+                    path = Path(os.getenv('L2_DISK_CACHE_PATH', Path.home() / '.cache' / 'worldsim' / 'l2cache.db'))
+                    _disk_cache = _L2DiskCache(path, str(version))
+                else:
+                    print("Warning: L2 tables not found; persistent L2 cache disabled")
+        except Exception as e:
+            print(f"Warning: Could not open persistent L2 cache: {e}")
+        _disk_cache_checked = True
+    return _disk_cache
+
+class _L2NotFound(Exception):
+    """Raised inside the memo for unknown voters so they are not cached alongside hits."""
+
+@functools.lru_cache(maxsize=65536)
+def _get_l2_data_cached(l2_voter_id: str) -> Dict[str, Any]:
+    """Process-wide memo of L2 lookups; L2 data is read-only during a simulation."""
+    l2_data = AgentInitializer._load_l2_data(l2_voter_id)
+    if l2_data is None:
+        raise _L2NotFound(l2_voter_id)
+    return l2_data
+
+# Voter IDs with no L2 row, kept apart from the memo so retried misses cannot
+# evict real records; oldest entries are dropped past the cap
+_MISSING_CACHE_SIZE = 65536
+_missing_voter_ids: Dict[str, None] = {}
+_missing_lock = threading.Lock()
+
+def _remember_missing(l2_voter_id: str) -> None:
+    with _missing_lock:
+        _missing_voter_ids[l2_voter_id] = None
+        if len(_missing_voter_ids) > _MISSING_CACHE_SIZE:
+            del _missing_voter_ids[next(iter(_missing_voter_ids))]
+
 # Use TYPE_CHECKING to avoid circular imports
 if TYPE_CHECKING:
     from Agent.agent import Agent
@@ -43,6 +301,21 @@ if TYPE_CHECKING:
 class AgentInitializer:
     """Utility class for initializing agents from L2 data."""
     
+    # Voting performance columns per election type, highest precedence first
+    # (current registration before the moved-from registration)
+    _VOTING_FIELDS = {
+        'general': (
+            'Voters_VotingPerformanceEvenYearGeneralAndPrimary',
+            'Voters_VotingPerformanceEvenYearGeneral',
+            'Voters_MovedFrom_VotingPerformanceEvenYearGeneral',
+            'Voters_MovedFrom_VotingPerformanceEvenYearGeneralAndPrimary',
+        ),
+        'primary': (
+            'Voters_VotingPerformanceEvenYearPrimary',
+            'Voters_MovedFrom_VotingPerformanceEvenYearPrimary',
+        ),
+    }
+    
     def __init__(self):
         """Initialize the agent initializer."""
         pass
@@ -57,79 +330,97 @@ class AgentInitializer:
         Returns:
             Complete L2 data dictionary or None if not found
         """
-        verbosity = int(os.getenv('VERBOSITY', os.getenv('VERBOSITY_LEVEL', '1')))
-        t_total = time.perf_counter() if verbosity >= 3 else None
+        if l2_voter_id in _missing_voter_ids:
+            return None
         try:
-            # Start with basic data
-            enriched_data = {'LALVOTERID': l2_voter_id}
-            
-            # Load from l2_agent_core
-            t0 = time.perf_counter() if verbosity >= 3 else None
-            core_query = "SELECT * FROM l2_agent_core WHERE LALVOTERID = %s"
-            core_data = execute_agents_query(core_query, (l2_voter_id,), fetch=True)
-            if core_data:
-                enriched_data.update(core_data[0])
-            if verbosity >= 3:
-                print(f"[agent_init] {l2_voter_id}: l2_agent_core query {time.perf_counter() - t0:.3f}s")
-            
-            # Load from l2_location
-            t0 = time.perf_counter() if verbosity >= 3 else None
-            location_query = "SELECT * FROM l2_location WHERE LALVOTERID = %s"
-            location_data = execute_agents_query(location_query, (l2_voter_id,), fetch=True)
-            if location_data:
-                enriched_data.update(location_data[0])
-            if verbosity >= 3:
-                print(f"[agent_init] {l2_voter_id}: l2_location query {time.perf_counter() - t0:.3f}s")
-            
-            # Load from l2_political (check only existing partitions: 1, 2, 3)
-            t0 = time.perf_counter() if verbosity >= 3 else None
-            political_data = {}
-            for i in range(1, 4):  # Only check partitions 1, 2, 3
-                partition_query = f"SELECT * FROM l2_political_part_{i} WHERE LALVOTERID = %s"
-                try:
-                    partition_data = execute_agents_query(partition_query, (l2_voter_id,), fetch=True)
-                    if partition_data:
-                        political_data.update(partition_data[0])
-                except Exception as e:
-                    print(f"Warning: Could not access l2_political_part_{i}: {e}")
-                    break  # No more partitions
-            enriched_data.update(political_data)
-            if verbosity >= 3:
-                print(f"[agent_init] {l2_voter_id}: l2_political queries {time.perf_counter() - t0:.3f}s")
-            
-            # Load from l2_other (check only existing partitions: 1, 2, 3, 4)
-            t0 = time.perf_counter() if verbosity >= 3 else None
-            other_data = {}
-            for i in range(1, 5):  # Only check partitions 1, 2, 3, 4
-                partition_query = f"SELECT * FROM l2_other_part_{i} WHERE LALVOTERID = %s"
-                try:
-                    partition_data = execute_agents_query(partition_query, (l2_voter_id,), fetch=True)
-                    if partition_data:
-                        other_data.update(partition_data[0])
-                except Exception as e:
-                    print(f"Warning: Could not access l2_other_part_{i}: {e}")
-                    break  # No more partitions
-            enriched_data.update(other_data)
-            if verbosity >= 3:
-                print(f"[agent_init] {l2_voter_id}: l2_other queries {time.perf_counter() - t0:.3f}s")
-            
-            # Load from l2_geo
-            t0 = time.perf_counter() if verbosity >= 3 else None
-            geo_query = "SELECT * FROM l2_geo WHERE LALVOTERID = %s"
-            geo_data = execute_agents_query(geo_query, (l2_voter_id,), fetch=True)
-            if geo_data:
-                enriched_data.update(geo_data[0])
-            if verbosity >= 3:
-                print(f"[agent_init] {l2_voter_id}: l2_geo query {time.perf_counter() - t0:.3f}s")
-            
-            if verbosity >= 3:
-                print(f"[agent_init] {l2_voter_id}: TOTAL L2 data load {time.perf_counter() - t_total:.3f}s")
-            
-            return enriched_data if len(enriched_data) > 1 else None
-            
+            l2_data = _get_l2_data_cached(l2_voter_id)
+        except _L2NotFound:
+            _remember_missing(l2_voter_id)
+            return None
         except Exception as e:
             print(f"Error retrieving L2 data for {l2_voter_id}: {e}")
             return None
+        # Hand out a copy so callers cannot alter the cached record
+        return dict(l2_data)
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all memoized L2 lookups (e.g. after reloading L2 tables, or in tests)."""
+        _get_l2_data_cached.cache_clear()
+        with _missing_lock:
+            _missing_voter_ids.clear()
+    
+    @staticmethod
+    def _load_l2_data(l2_voter_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Query the database for a voter's L2 data, bypassing the in-process memo.
+        
+        Returns None only when the lookup succeeded and found no L2 row; database
+        errors raise, so the memo and the missing-voter set never record them.
+        """
+        disk_cache = _get_disk_cache()
+        if disk_cache is not None:
+            cached = disk_cache.get(l2_voter_id)
+            if cached is not None:
+                return cached
+        
+        t_total = time.perf_counter() if _VERBOSITY >= 3 else None
+        
+        # One round trip: every L2 table joined on LALVOTERID
+        lookup_query, _ = _get_l2_queries()
+        try:
+            rows = _fetch_l2_rows(lookup_query, (l2_voter_id,))
+        except Exception as e:
+            # Usually a missing partition table; query tables one by one, which
+            # re-raises anything other than a missing table
+            if _VERBOSITY >= 2:
+                print(f"Warning: joined L2 lookup failed ({e}); querying L2 tables one by one")
+            rows = None
+        if rows:
+            enriched_data = dict(rows[0])
+            if not enriched_data.pop('_l2_tables_found', 0):
+                enriched_data = {'LALVOTERID': l2_voter_id}
+        else:
+            enriched_data = AgentInitializer._get_l2_data_per_table(l2_voter_id)
+        
+        if _VERBOSITY >= 3:
+            print(f"[agent_init] {l2_voter_id}: TOTAL L2 data load {time.perf_counter() - t_total:.3f}s")
+        
+        if len(enriched_data) <= 1:
+            return None
+        if disk_cache is not None:
+            disk_cache.put(l2_voter_id, enriched_data)
+        return enriched_data
+    
+    @staticmethod
+    def _get_l2_data_per_table(l2_voter_id: str) -> Dict[str, Any]:
+        """Fallback for get_l2_data_by_voter_id issuing one query per L2 table."""
+        # Start with basic data
+        enriched_data = {'LALVOTERID': l2_voter_id}
+        
+        # The lookups are independent, so run them concurrently (each worker
+        # checks out its own pooled connection); map() keeps merge order
+        t0 = time.perf_counter() if _VERBOSITY >= 3 else None
+        _, per_table_queries = _get_l2_queries()
+        
+        def fetch(source_and_query):
+            source, query = source_and_query
+            try:
+                return _fetch_l2_rows(query, (l2_voter_id,))
+            except Exception as e:
+                if getattr(e, 'errno', None) != _ER_NO_SUCH_TABLE:
+                    raise
+                print(f"Warning: Could not access {source}: {e}")
+                return []
+        
+        results = _l2_executor.map(fetch, zip(_L2_PER_TABLE_SOURCES, per_table_queries))
+        for rows in results:
+            if rows:
+                enriched_data.update(rows[0])
+        if _VERBOSITY >= 3:
+            print(f"[agent_init] {l2_voter_id}: per-table L2 queries {time.perf_counter() - t0:.3f}s")
+        
+        return enriched_data
     
     def create_agent_from_l2(self, l2_voter_id: str, agent_id: Optional[str] = None, 
                             api_key: Optional[str] = None, simulation_id: Optional[str] = None) -> Optional['Agent']:
@@ -145,46 +436,88 @@ class AgentInitializer:
         Returns:
             Agent instance or None if creation failed
         """
-        verbosity = int(os.getenv('VERBOSITY', os.getenv('VERBOSITY_LEVEL', '1')))
-        t_total = time.perf_counter() if verbosity >= 3 else None
+        t_total = time.perf_counter() if _VERBOSITY >= 3 else None
         try:
-            # Import here to avoid circular dependency
-            from Agent.agent import Agent
-            
             # Get L2 data
-            t0 = time.perf_counter() if verbosity >= 3 else None
+            t0 = time.perf_counter() if _VERBOSITY >= 3 else None
             l2_data = self.get_l2_data_by_voter_id(l2_voter_id)
-            if verbosity >= 3:
+            if _VERBOSITY >= 3:
                 print(f"[agent_init] {l2_voter_id}: get_l2_data_by_voter_id {time.perf_counter() - t0:.3f}s")
             if not l2_data:
                 print(f"No L2 data found for voter ID: {l2_voter_id}")
                 return None
             
-            # Parse L2 data
-            t0 = time.perf_counter() if verbosity >= 3 else None
-            l2_row = L2DataParser.parse_row(l2_data)
-            if verbosity >= 3:
-                print(f"[agent_init] {l2_voter_id}: L2DataParser.parse_row {time.perf_counter() - t0:.3f}s")
-            
-            # Use provided agent_id or default to l2_voter_id
-            final_agent_id = agent_id or l2_voter_id
+            agent = self._create_agent_from_data(l2_voter_id, l2_data, agent_id, simulation_id)
             
-            # Create agent
-            t0 = time.perf_counter() if verbosity >= 3 else None
-            agent = Agent(agent_id=final_agent_id, l2_data=l2_row, simulation_id=simulation_id)
-            if verbosity >= 3:
-                print(f"[agent_init] {l2_voter_id}: Agent() constructor {time.perf_counter() - t0:.3f}s")
-            
-            if verbosity >= 3:
+            if _VERBOSITY >= 3:
                 print(f"[agent_init] {l2_voter_id}: TOTAL create_agent_from_l2 {time.perf_counter() - t_total:.3f}s")
-            if verbosity >= 2:
-                print(f"Created agent {final_agent_id} from L2 data for {l2_voter_id}")
             return agent
             
         except Exception as e:
             print(f"Error creating agent from L2 data: {e}")
             return None
     
+    def create_agent_from_l2_data(self, l2_data: Dict[str, Any], agent_id: Optional[str] = None,
+                                  api_key: Optional[str] = None, simulation_id: Optional[str] = None) -> Optional['Agent']:
+        """
+        Create an agent from L2 data the caller already holds, skipping the database lookup.
+        
+        Args:
+            l2_data: Raw L2 data dictionary (e.g. from get_l2_data_by_voter_id or get_l2_data_bulk)
+            agent_id: Optional custom agent ID (defaults to the record's LALVOTERID)
+            api_key: Optional API key for LLM operations
+            simulation_id: Optional simulation ID for database operations
+            
+        Returns:
+            Agent instance or None if creation failed
+        """
+        l2_voter_id = l2_data.get('LALVOTERID') if l2_data else None
+        if not l2_voter_id:
+            print("No LALVOTERID in L2 data; cannot create agent")
+            return None
+        
+        try:
+            return self._create_agent_from_data(l2_voter_id, l2_data, agent_id, simulation_id)
+        except Exception as e:
+            print(f"Error creating agent from L2 data: {e}")
+            return None
+    
+    def _create_agent_from_data(self, l2_voter_id: str, l2_data: Dict[str, Any], agent_id: Optional[str],
+                                simulation_id: Optional[str]) -> 'Agent':
+        """Parse already-loaded L2 data and construct the Agent."""
+        # Import here to avoid circular dependency
+        from Agent.agent import Agent
+        
+        # Use provided agent_id or default to l2_voter_id
+        final_agent_id = agent_id or l2_voter_id
+        
+        if _VERBOSITY >= 3:
+            # Timed path: parse and construct separately
+            t0 = time.perf_counter()
+            l2_row = L2DataParser.parse_row(l2_data)
+            print(f"[agent_init] {l2_voter_id}: L2DataParser.parse_row {time.perf_counter() - t0:.3f}s")
+            t0 = time.perf_counter()
+            agent = Agent(agent_id=final_agent_id, l2_data=l2_row, simulation_id=simulation_id)
+            print(f"[agent_init] {l2_voter_id}: Agent() constructor {time.perf_counter() - t0:.3f}s")
+        else:
+            agent = Agent(agent_id=final_agent_id, l2_data=L2DataParser.parse_row(l2_data), simulation_id=simulation_id)
+        
+        if _VERBOSITY >= 2:
+            print(f"Created agent {final_agent_id} from L2 data for {l2_voter_id}")
+        return agent
+    
+    def get_l2_data_bulk(self, voter_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve L2 data for many voter IDs with a fixed number of IN (...) queries.
+        
+        Args:
+            voter_ids: L2 voter IDs to look up
+            
+        Returns:
+            Dictionary mapping voter ID -> L2 data for the voters that were found
+        """
+        return load_bulk_l2_data(list(voter_ids))
+    
     def create_agents_from_l2_list(self, l2_voter_ids: List[str], 
                                   agent_ids: Optional[List[str]] = None,
                                   api_key: Optional[str] = None) -> List['Agent']:
@@ -201,11 +534,19 @@ class AgentInitializer:
         """
         agents = []
         
+        # Fetch every voter's L2 data up front instead of ~10 queries per voter
+        l2_data_by_id = self.get_l2_data_bulk(l2_voter_ids)
+        
         for i, l2_voter_id in enumerate(l2_voter_ids):
             agent_id = agent_ids[i] if agent_ids and i < len(agent_ids) else None
-            agent = self.create_agent_from_l2(l2_voter_id, agent_id, api_key)
-            if agent:
-                agents.append(agent)
+            l2_data = l2_data_by_id.get(l2_voter_id)
+            if not l2_data:
+                print(f"No L2 data found for voter ID: {l2_voter_id}")
+                continue
+            try:
+                agents.append(self._create_agent_from_data(l2_voter_id, l2_data, agent_id, None))
+            except Exception as e:
+                print(f"Error creating agent from L2 data: {e}")
         
         print(f"Created {len(agents)} agents from L2 data")
         return agents
@@ -221,13 +562,35 @@ class AgentInitializer:
             List of available L2 voter IDs
         """
         try:
-            query = "SELECT LALVOTERID FROM l2_agent_core LIMIT %s"
-            results = execute_agents_query(query, (limit,), fetch=True)
-            return [row['LALVOTERID'] for row in results]
+            batch_size = max(1, min(limit, _VOTER_ID_BATCH_SIZE))
+            return list(itertools.islice(self.iter_available_l2_voter_ids(batch_size), limit))
         except Exception as e:
             print(f"Error retrieving available L2 voter IDs: {e}")
             return []
     
+    def iter_available_l2_voter_ids(self, batch_size: int = _VOTER_ID_BATCH_SIZE) -> Iterator[str]:
+        """
+        Stream every L2 voter ID in LALVOTERID order without holding them all in memory.
+        
+        Pages with keyset pagination on the primary key (WHERE LALVOTERID > last seen),
+        so each batch is an index range read and no connection stays checked out
+        between batches.
+        
+        Args:
+            batch_size: Number of voter IDs fetched per query
+            
+        Yields:
+            L2 voter IDs
+        """
+        last_id = ''
+        while True:
+            rows = execute_agents_query(_VOTER_ID_PAGE_QUERY, (last_id, batch_size), fetch=True, prepared=True)
+            for row in rows:
+                yield row['LALVOTERID']
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]['LALVOTERID']
+    
     def get_agent_summary(self, l2_voter_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a summary of agent information from L2 data.
@@ -257,6 +620,75 @@ class AgentInitializer:
         
         return summary
     
+    def get_agent_summaries_bulk(self, voter_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get agent summaries for many voters with bulk L2 queries and column-wise extraction.
+        
+        Args:
+            voter_ids: L2 voter IDs to summarize
+            
+        Returns:
+            Dictionary mapping voter ID -> summary (same keys as get_agent_summary)
+            for the voters that were found
+        """
+        l2_data_by_id = self.get_l2_data_bulk(voter_ids)
+        if not l2_data_by_id:
+            return {}
+        df = pd.DataFrame.from_dict(l2_data_by_id, orient='index')
+        
+        def column(name: str) -> pd.Series:
+            # Mirrors l2_data.get(name, 'Unknown'): default only when the field is absent
+            if name not in df.columns:
+                return pd.Series('Unknown', index=df.index, dtype=object)
+            return df[name]
+        
+        if 'Voters_Age' in df.columns:
+            age = np.trunc(pd.to_numeric(df['Voters_Age'], errors='coerce'))
+        else:
+            age = pd.Series(np.nan, index=df.index)
+        summaries = pd.DataFrame({
+            'l2_voter_id': df.index.to_series(),
+            'name': self._join_present(df, ('Voters_FirstName', 'Voters_MiddleName', 'Voters_LastName'), ' ', 'Unknown'),
+            'age': age.where(age != 0).astype('Int64'),
+            'gender': column('Voters_Gender'),
+            'address': self._join_present(df, ('Residence_Addresses_HouseNumber', 'Residence_Addresses_StreetName',
+                                               'Residence_Addresses_Designator', 'Residence_Addresses_City',
+                                               'Residence_Addresses_Zip'), ', ', 'Address Unknown'),
+            'education': column('Voters_Education'),
+            'income_tier': column('Voters_Income'),
+            'political_party': column('Voters_Party'),
+        }, index=df.index).astype(object)
+        summaries = summaries.where(summaries.notna(), None)
+        
+        # First non-empty voting performance field per election type (see _extract_voting_history)
+        history = {}
+        for category, keys in self._VOTING_FIELDS.items():
+            present = df.reindex(columns=list(keys))
+            present = present.where(present.notna() & present.astype(bool))
+            history[category] = present.bfill(axis=1).iloc[:, 0]
+        
+        result = summaries.to_dict('index')
+        for category, values in history.items():
+            for voter_id, value in values.dropna().items():
+                result[voter_id].setdefault('voting_history', {})[category] = value
+        for summary in result.values():
+            summary.setdefault('voting_history', {})
+        return result
+    
+    @staticmethod
+    def _join_present(df: pd.DataFrame, columns, sep: str, default: str) -> pd.Series:
+        """Join the non-empty values of the given columns row-wise, or default if none are set."""
+        joined = pd.Series('', index=df.index, dtype=object)
+        for name in columns:
+            if name not in df.columns:
+                continue
+            values = df[name]
+            present = values.notna() & values.astype(bool)
+            # An INT column with NULLs in the batch loads as float64; render 12345.0 as 12345
+            text = values.map(lambda v: str(int(v)) if isinstance(v, float) and v.is_integer() else str(v))
+            joined = joined.mask(present, joined.where(joined == '', joined + sep) + text)
+        return joined.where(joined != '', default)
+    
     def _extract_name(self, l2_data: Dict[str, Any]) -> str:
         """Extract full name from L2 data."""
         first_name = l2_data.get('Voters_FirstName', '')
@@ -318,32 +750,41 @@ class AgentInitializer:
         """Extract voting history from L2 data."""
         history = {}
         
-        # Look for voting performance fields
-        for key, value in l2_data.items():
-            if 'VotingPerformance' in key and value:
-                # Extract election type and participation
-                if 'Presidential' in key:
-                    history['presidential'] = value
-                elif 'General' in key:
-                    history['general'] = value
-                elif 'Primary' in key:
-                    history['primary'] = value
+        # First non-empty voting performance field per election type
+        for category, keys in self._VOTING_FIELDS.items():
+            for key in keys:
+                value = l2_data.get(key)
+                if value:
+                    history[category] = value
+                    break
         
         return history
 
 
+_SINGLETON: Optional[AgentInitializer] = None
+_singleton_lock = threading.Lock()
+
+
+def get_initializer() -> AgentInitializer:
+    """Return the shared AgentInitializer, creating it on first use."""
+    global _SINGLETON
+    if _SINGLETON is None:
+        with _singleton_lock:
+            if _SINGLETON is None:
+                _SINGLETON = AgentInitializer()
+    return _SINGLETON
+
+
 # Convenience functions
 def create_agent_from_l2(l2_voter_id: str, agent_id: Optional[str] = None, 
                          api_key: Optional[str] = None) -> Optional['Agent']:
     """Convenience function to create an agent from L2 data."""
-    initializer = AgentInitializer()
-    return initializer.create_agent_from_l2(l2_voter_id, agent_id, api_key)
+    return get_initializer().create_agent_from_l2(l2_voter_id, agent_id, api_key)
 
 
 def get_agent_summary(l2_voter_id: str) -> Optional[Dict[str, Any]]:
     """Convenience function to get agent summary from L2 data."""
-    initializer = AgentInitializer()
-    return initializer.get_agent_summary(l2_voter_id)
+    return get_initializer().get_agent_summary(l2_voter_id)
 
 
 if __name__ == '__main__':
@@ -362,4 +803,8 @@ if __name__ == '__main__':
             
             # Get summary
             summary = initializer.get_agent_summary(available_ids[0])
-            print(f"Agent summary: {json.dumps(summary, indent=2, default=str)}")
+            if orjson is not None:
+                summary_json = orjson.dumps(summary, default=str, option=orjson.OPT_INDENT_2).decode()
+            else:
+                summary_json = json.dumps(summary, indent=2, default=str)
+            print(f"Agent summary: {summary_json}")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Async L2 Lookups for World_Sim
+
+aiomysql-backed counterpart of AgentInitializer.get_l2_data_by_voter_id. An
+orchestrator can keep hundreds of voter lookups in flight on one event loop,
+bounded by the size of the async connection pool.
+"""
+
+from __future__ import annotations
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import aiomysql
+
+from Utils.path_manager import initialize_paths
+initialize_paths()
+
+from Utils.environment_config import get_database_config
+from Utils.agent_initializer import _agents_db, _get_l2_queries
+from Utils.db_pool import POOL_SIZE
+
+
+class AsyncL2Client:
+    """
+    Async L2 lookups over an aiomysql pool; use as an async context manager.
+
+    Runs the same (column-projected) queries as AgentInitializer: one joined
+    query per voter, falling back to concurrent per-table queries.
+    """
+
+    def __init__(self, pool_size: int = POOL_SIZE):
+        """
+        Args:
+            pool_size: Maximum open connections (caps concurrent lookups)
+        """
+        self.pool_size = pool_size
+        self._pool = None
+        self._queries = None
+
+    async def __aenter__(self) -> 'AsyncL2Client':
+        # Building the projected queries may probe information_schema (sync), so keep it off the loop
+        self._queries = await asyncio.to_thread(_get_l2_queries)
+        db_config = get_database_config()
+        self._pool = await aiomysql.create_pool(
+            host=db_config['host'],
+            port=db_config['port'],
+            user=db_config['user'],
+            password=db_config['password'],
+            db=_agents_db,
+            charset='utf8mb4',
+            autocommit=True,
+            minsize=1,
+            maxsize=self.pool_size
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._pool.close()
+        await self._pool.wait_closed()
+
+    async def _fetch(self, query: str, params) -> List[Dict[str, Any]]:
+        """Run one query on a pooled connection; returns [] on error."""
+        try:
+            async with self._pool.acquire() as conn:
+                async with conn.cursor(aiomysql.DictCursor) as cursor:
+                    await cursor.execute(query, params)
+                    return list(await cursor.fetchall())
+        except Exception as e:
+            print(f"Warning: async agents query failed: {e}")
+            return []
+
+    async def get_l2_data_by_voter_id(self, l2_voter_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve complete L2 data for a given voter ID.
+
+        Args:
+            l2_voter_id: The L2 voter ID to look up
+
+        Returns:
+            Complete L2 data dictionary or None if not found
+        """
+        lookup_query, per_table_queries = self._queries
+        rows = await self._fetch(lookup_query, (l2_voter_id,))
+        if rows:
+            enriched_data = dict(rows[0])
+            if not enriched_data.pop('_l2_tables_found', 0):
+                return None
+            return enriched_data
+
+        # The join always yields a row, so no rows means it failed; query tables one by one
+        enriched_data = {'LALVOTERID': l2_voter_id}
+        results = await asyncio.gather(*(self._fetch(query, (l2_voter_id,)) for query in per_table_queries))
+        for table_rows in results:
+            if table_rows:
+                enriched_data.update(table_rows[0])
+        return enriched_data if len(enriched_data) > 1 else None
+
+    async def get_l2_data_bulk(self, voter_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up many voters concurrently (the pool limits how many run at once).
+
+        Args:
+            voter_ids: L2 voter IDs to look up
+
+        Returns:
+            Dictionary mapping voter ID -> L2 data for the voters that were found
+        """
+        results = await asyncio.gather(*(self.get_l2_data_by_voter_id(voter_id) for voter_id in voter_ids))
+        return {voter_id: l2_data for voter_id, l2_data in zip(voter_ids, results) if l2_data}
+
+
+async def get_l2_data_by_voter_id_async(l2_voter_id: str) -> Optional[Dict[str, Any]]:
+    """Convenience coroutine for a one-off lookup (opens and closes its own pool)."""
+    async with AsyncL2Client(pool_size=1) as client:
+        return await client.get_l2_data_by_voter_id(l2_voter_id)
+
+
+def load_l2_data_concurrently(voter_ids: List[str], pool_size: int = POOL_SIZE) -> Dict[str, Dict[str, Any]]:
+    """
+    Synchronous wrapper: look up many voters concurrently on a fresh event loop.
+
+    Args:
+        voter_ids: L2 voter IDs to look up
+        pool_size: Maximum concurrent connections
+
+    Returns:
+        Dictionary mapping voter ID -> L2 data for the voters that were found
+    """
+    async def _run() -> Dict[str, Dict[str, Any]]:
+        async with AsyncL2Client(pool_size=pool_size) as client:
+            return await client.get_l2_data_bulk(voter_ids)
+    return asyncio.run(_run())
@@ -9,6 +9,12 @@ from __future__ import annotations
 
 from typing import Optional
 import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from Utils.path_manager import initialize_paths
 initialize_paths()
@@ -39,15 +45,55 @@ def get_summary(agent_id: str) -> Optional[str]:
         return None
 
 
+_UPSERT_SUMMARY_CALL = "CALL upsert_agent_personal_summary(%s, %s, %s, %s, %s, %s)"
+
+
+def _dumps_metadata(metadata: dict) -> str:
+    """Serialize summary metadata for the JSON column (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(metadata, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(metadata, default=str)
+
+
+def _upsert_summary_procedure(agent_id: str, summary: str, reasoning: str, metadata: Optional[dict],
+                              name: Optional[str]) -> bool:
+    """
+    Ensure the agent row and insert its summary (unless one exists) in one round trip.
+
+    Returns:
+        True if the upsert_agent_personal_summary procedure ran, False if it
+        (or the connection pool) is unavailable
+    """
+    import mysql.connector
+    from mysql.connector import errorcode
+    from Utils.db_pool import get_pool, execute_pooled
+
+    pool = get_pool(os.getenv('DB_AGENTS_NAME', 'world_sim_agents'))
+    if pool is None:
+        return False
+    params = (agent_id, name, 'llm_personal', reasoning or "", summary,
+              _dumps_metadata(metadata) if metadata is not None else None)
+    try:
+        execute_pooled(pool, _UPSERT_SUMMARY_CALL, params, fetch=False)
+    except mysql.connector.Error as e:
+        if e.errno == errorcode.ER_SP_DOES_NOT_EXIST:
+            return False
+        raise
+    return True
+
+
 def upsert_summary(agent_id: str, summary: str, reasoning: str = "", metadata: dict = None, 
                   model: Optional[str] = None, *, 
                   name: Optional[str] = None, age: Optional[int] = None, 
                   l2_voter_id: Optional[str] = None) -> None:
     """
     Upsert agent personal summary.
-    Delegates to AgentsDatabaseManager.
+    Uses the upsert_agent_personal_summary procedure when installed, otherwise
+    delegates to AgentsDatabaseManager.
     """
     try:
+        if _upsert_summary_procedure(agent_id, summary, reasoning, metadata, name):
+            return
         from Database.managers import get_agents_manager
         mgr = get_agents_manager()
         # Ensure agent row exists first
@@ -6,11 +6,15 @@ Handles model selection, API requests, and response processing.
 """
 
 import os
+import atexit
 import json
-import requests
+import re
+import sys
 import time
 import threading
 from typing import Dict, Any, Optional, List
+# requests/urllib3, asyncio, httpx, numpy and openai are imported where first needed,
+# so importing this module stays cheap for code that never talks to the API
 # Load environment variables using centralized loader
 try:
     from Utils.env_loader import load_environment
@@ -25,6 +29,135 @@ except ImportError:
 
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# Transient OpenRouter statuses worth retrying (timeouts / rate limit / upstream errors),
+# with exponential backoff of _RETRY_BACKOFF * 2**attempt seconds unless Retry-After says otherwise
+_RETRY_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+_RETRY_TOTAL = 5
+_RETRY_BACKOFF = 0.5
+# Upper bound on a server-sent Retry-After delay (seconds)
+_RETRY_AFTER_MAX = 30
+
+# OpenRouter provider routing sent with every request (never mutated)
+_PROVIDER_PREFS = {'sort': 'throughput'}
+
+# Cached LLM responses also kept in memory (per APIManager)
+_MEMORY_CACHE_SIZE = 8192
+_MOCK_EMBEDDING_SIZE = 384  # standard embedding size
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+_PERCEPTION_RE = re.compile(r'^(ANALYSIS_TYPE|IMPACT_SCORE|REASONING):(.*)$', re.MULTILINE)
+
+
+def _pretty_json(obj: Any) -> str:
+    """Indented JSON for prompts (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTS | orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+
+
+def _session_retry():
+    """
+    urllib3 retry policy for the sync session.
+    
+    LLM requests are billed POSTs, so only retry statuses and connection
+    failures (the request never reached the server); a read timeout may be a
+    slow but successful call and is not replayed. Retry-After is capped at
+    _RETRY_AFTER_MAX seconds.
+    """
+    from urllib3.util.retry import Retry
+    
+    class _CappedRetry(Retry):
+        def get_retry_after(self, response):
+            retry_after = super().get_retry_after(response)
+            return None if retry_after is None else min(retry_after, _RETRY_AFTER_MAX)
+    
+    return _CappedRetry(
+        total=_RETRY_TOTAL,
+        read=0,
+        backoff_factor=_RETRY_BACKOFF,
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=frozenset(["POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+def _write_report(title: str, fields) -> None:
+    """Print a REPORT_LLM_MODEL_CONFIG block with one stdout write, so concurrent reports don't interleave."""
+    rule = "=" * 80
+    body = "".join(f"{name}: {value}\n" for name, value in fields)
+    sys.stdout.write(f"\n{rule}\n{title}\n{rule}\n{body}{rule}\n\n")
+
+
+class _LLMLogBuffer:
+    """
+    Thread-safe buffered JSONL writer for LLM request/response records.
+    
+    Records go to one file per day and process
+    (llm_responses_YYYYMMDD.<pid>.jsonl), opened once and flushed every
+    ``flush_every`` records and on close.
+    """
+    
+    def __init__(self, log_dir: Path, flush_every: int = 64):
+        self.log_dir = log_dir
+        self.flush_every = max(1, flush_every)
+        self._lock = threading.Lock()
+        self._buf: List[bytes] = []
+        self._day: Optional[str] = None
+        self._fh = None
+    
+    def append(self, record: Dict[str, Any]) -> None:
+        if orjson is not None:
+            line = orjson.dumps(record, default=str, option=_ORJSON_OPTS | orjson.OPT_APPEND_NEWLINE)
+        else:
+            line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode('utf-8')
+        with self._lock:
+            day = record['ts'][:10]
+            if day != self._day:
+                # New day: drain into the old day's file, then switch files
+                self._flush_locked()
+                if self._fh is not None:
+                    self._fh.close()
+                stamp = day.replace('-', '')
+                self._fh = open(self.log_dir / f"llm_responses_{stamp}.{os.getpid()}.jsonl", 'ab')
+                self._day = day
+            self._buf.append(line)
+            if len(self._buf) >= self.flush_every:
+                self._flush_locked()
+    
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+    
+    def _flush_locked(self) -> None:
+        if not self._buf or self._fh is None:
+            return
+        try:
+            self._fh.write(b"".join(self._buf))
+            self._fh.flush()
+        except OSError as e:
+            print(f"Warning: Failed to log LLM responses: {e}")
+        self._buf.clear()
+    
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+                self._day = None
+
 class APIManager:
     """
     Centralized API manager for all external API calls.
@@ -62,6 +195,17 @@ class APIManager:
         if x_title:
             self.headers["X-Title"] = x_title
         
+        # One keep-alive session for every OpenRouter call, so the TCP/TLS
+        # connection is reused instead of re-handshaking per request
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=32,
+                                                    max_retries=_session_retry()))
+        atexit.register(self.close)
+        
         # Model mapping based on intelligence level, loaded from .env if available
         # default to openai models unless overridden in .env
         self.model_mapping = {
@@ -71,6 +215,18 @@ class APIManager:
             4: os.getenv("OPEN_ROUTER_SEARCH_MODEL", "openai/gpt-oss-20b"),  # For intelligent search
         }
         
+        # Request defaults, resolved once (the environment does not change at runtime)
+        self._default_intelligence = int(os.getenv('DEFAULT_INTELLIGENCE_LEVEL', '2'))
+        self._default_max_tokens = int(os.getenv('DEFAULT_MAX_TOKENS', '1000'))
+        self._default_temperature = float(os.getenv('DEFAULT_TEMPERATURE', '0.7'))
+        self._test_intelligence = int(os.getenv('TEST_CONNECTION_INTELLIGENCE_LEVEL', '2'))
+        self._test_max_tokens = int(os.getenv('TEST_CONNECTION_MAX_TOKENS', '10'))
+        
+        # Prompts shorter than these (approximate) token counts go to a smaller model
+        # in perceive_event / generate_agent_summary; 0 keeps the reasoning model
+        self._perceive_small_model_tokens = int(os.getenv('PERCEIVE_SMALL_MODEL_TOKENS', '0'))
+        self._summary_small_model_tokens = int(os.getenv('SUMMARY_SMALL_MODEL_TOKENS', '0'))
+        
         # Provider debugging - enable to print provider info for each request
         self.debug_provider = os.getenv("DEBUG_PROVIDER_INFO", "false").lower() == "true"
         
@@ -86,38 +242,61 @@ class APIManager:
         # Embedding configuration
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         self.use_mock_embeddings = os.getenv('USE_MOCK_EMBEDDINGS', 'false').lower() in ('true', '1', 'yes')
+        self._openai_client = None
         
         if self.enable_llm_logging:
             self._setup_logging_directory()
+        
+        # Prompt -> response cache (opt-in: sampled responses are otherwise fresh per call)
+        self._use_cache = os.getenv('LLM_CACHE', 'false').lower() in ('true', '1', 'yes')
+        self.cache_dir = Path(os.getenv('LLM_CACHE_DIR', 'logs/llm_cache'))
+        self._memory_cache: Dict[str, tuple] = {}
+        self._cache_lock = threading.Lock()
+        if self._use_cache:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
     
     @classmethod
     def get_instance(cls, api_key: Optional[str] = None) -> 'APIManager':
         """
         Get the singleton instance of APIManager.
         This is the ONLY way to access the API manager.
+        
+        Once created, the instance is returned without taking the lock.
         """
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = cls(api_key)
-        return cls._instance
+        instance = cls._instance
+        if instance is not None:
+            return instance
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls(api_key)
+            return cls._instance
     
     @classmethod
     def reset_instance(cls) -> None:
-        """Reset the singleton instance. Useful for testing."""
+        """Reset the singleton instance, closing its session and LLM log. Useful for testing."""
         with cls._lock:
-            cls._instance = None
+            instance, cls._instance = cls._instance, None
+        if instance is not None:
+            instance.close()
+    
+    def close(self) -> None:
+        """Close the pooled HTTP connections and flush the LLM log held by this manager."""
+        self._session.close()
+        if self.enable_llm_logging:
+            self._llm_log.close()
     
     def _setup_logging_directory(self):
-        """Set up the logging directory for LLM responses."""
+        """Set up the logging directory and buffered log writer for LLM responses."""
         log_path = Path(self.llm_log_dir)
         log_path.mkdir(parents=True, exist_ok=True)
+        self._llm_log = _LLMLogBuffer(log_path, int(os.getenv('LLM_LOG_BUFFER', '64')))
+        atexit.register(self._llm_log.close)
         print(f"LLM Response logging enabled. Logs will be saved to: {log_path.absolute()}")
     
     def _log_llm_response(self, prompt: str, response: str, model_name: str, intelligence_level: int, 
                           max_tokens: int, temperature: float, metadata: Dict[str, Any] = None):
         """
-        Log LLM request and response to a file.
+        Log an LLM request and response as one record in the buffered JSONL log.
         
         Args:
             prompt: The input prompt
@@ -130,40 +309,17 @@ class APIManager:
         """
         if not self.enable_llm_logging:
             return
-            
-        try:
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            filename = f"llm_response_{timestamp}_{intelligence_level}_{model_name.replace('/', '_')}.txt"
-            filepath = Path(self.llm_log_dir) / filename
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write("=" * 80 + "\n")
-                f.write("LLM REQUEST/RESPONSE LOG\n")
-                f.write("=" * 80 + "\n\n")
-                
-                f.write(f"Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Model: {model_name}\n")
-                f.write(f"Intelligence Level: {intelligence_level}\n")
-                f.write(f"Max Tokens: {max_tokens}\n")
-                f.write(f"Temperature: {temperature}\n")
-                
-                if metadata:
-                    f.write(f"Metadata: {json.dumps(metadata, indent=2)}\n")
-                
-                f.write("\n" + "=" * 40 + "\n")
-                f.write("PROMPT\n")
-                f.write("=" * 40 + "\n")
-                f.write(prompt)
-                f.write("\n\n" + "=" * 40 + "\n")
-                f.write("RESPONSE\n")
-                f.write("=" * 40 + "\n")
-                f.write(response)
-                f.write("\n\n" + "=" * 80 + "\n")
-                
-            print(f"LLM response logged to: {filepath}")
-            
-        except Exception as e:
-            print(f"Warning: Failed to log LLM response: {e}")
+        
+        self._llm_log.append({
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'model': model_name,
+            'intelligence_level': intelligence_level,
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'prompt': prompt,
+            'response': response,
+            'metadata': metadata,
+        })
 
     def get_model_name(self, intelligence_level: int) -> str:
         """
@@ -178,10 +334,111 @@ class APIManager:
         Raises:
             ValueError: If intelligence level is not 1, 2, 3, or 4
         """
-        if intelligence_level not in self.model_mapping:
+        # One lookup on the hot path; a miss is the only validation needed
+        model_name = self.model_mapping.get(intelligence_level)
+        if model_name is None:
             raise ValueError(f"Intelligence level must be 1, 2, 3, or 4. Got: {intelligence_level}")
+        return model_name
+    
+    def _cache_key(self, prompt: str, model_name: str, max_tokens: int, temperature: float) -> str:
+        """Content hash identifying a request for the response cache."""
+        import hashlib
+        return hashlib.sha256(f"{model_name}|{max_tokens}|{temperature:.3f}|{prompt}".encode('utf-8')).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[tuple]:
+        """Return a cached (response_text, reasoning_text, model_name, metadata), or None."""
+        cached = self._memory_cache.get(key)
+        if cached is not None:
+            return cached
+        path = self.cache_dir / f"{key}.json"
+        try:
+            cached = tuple(json.loads(path.read_text(encoding='utf-8')))
+        except (OSError, ValueError):
+            return None
+        self._memory_put(key, cached)
+        return cached
+    
+    def _cache_put(self, key: str, result: tuple) -> None:
+        """Store a successful response in memory and on disk (atomic rename)."""
+        self._memory_put(key, result)
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(list(result), default=str), encoding='utf-8')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Failed to cache LLM response: {e}")
+    
+    def _memory_put(self, key: str, result: tuple) -> None:
+        with self._cache_lock:
+            self._memory_cache[key] = result
+            if len(self._memory_cache) > _MEMORY_CACHE_SIZE:
+                # Dicts keep insertion order: drop the oldest entry
+                del self._memory_cache[next(iter(self._memory_cache))]
+    
+    def _build_payload(self, prompt: str, model_name: str, max_tokens: int, temperature: float) -> Dict[str, Any]:
+        """Build the chat-completions request body for one prompt."""
+        # The provider preferences are the same for every request, so share one (read-only) dict
+        return {
+            "model": model_name,
+            "messages": ({"role": "user", "content": prompt},),
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "provider": _PROVIDER_PREFS
+        }
+    
+    def _process_response_data(self, response_data: Dict[str, Any], prompt: str, model_name: str,
+                               intelligence_level: int, max_tokens: int, temperature: float) -> tuple:
+        """
+        Turn a decoded API response into (response_text, reasoning_text, model_name, metadata).
         
-        return self.model_mapping[intelligence_level]
+        Raises:
+            Exception: If the response has no choices
+        """
+        # check if the response is valid
+        if 'choices' in response_data and len(response_data['choices']) > 0:
+            response_text = response_data['choices'][0]['message']['content']
+            reasoning_text = response_data['choices'][0]['message']['reasoning']
+
+            # Extract metadata from response
+            usage = response_data.get('usage', {})
+            actual_model = response_data.get('model', model_name)
+            provider = response_data.get('provider', None)
+            finish_reason = response_data['choices'][0].get('finish_reason', 'unknown')
+            
+            # Report response details if enabled
+            if self.report_model_config:
+                _write_report("LLM API RESPONSE RECEIVED", (
+                    ("Actual Model Used", actual_model),
+                    ("Finish Reason", finish_reason),
+                    ("Prompt Tokens", usage.get('prompt_tokens', 'unknown')),
+                    ("Completion Tokens", usage.get('completion_tokens', 'unknown')),
+                    ("Total Tokens", usage.get('total_tokens', 'unknown')),
+                    ("Response Length", f"{len(response_text)} characters"),
+                ))
+
+            
+            # Log the LLM response if logging is enabled
+            metadata = {
+                'api_url': self.base_url,
+                'provider': provider,
+                'provider_sort': 'throughput',
+                'actual_model_used': actual_model,
+                'requested_model': model_name,
+                'intelligence_level': intelligence_level,
+                'max_tokens': max_tokens,
+                'temperature': temperature,
+                'prompt_tokens': usage.get('prompt_tokens', 'unknown'),
+                'completion_tokens': usage.get('completion_tokens', 'unknown'),
+                'total_tokens': usage.get('total_tokens', 'unknown'),
+                'finish_reason': finish_reason
+            }
+            self._log_llm_response(prompt, response_text, model_name, intelligence_level, 
+                                 max_tokens, temperature, metadata)
+            
+            return response_text, reasoning_text, model_name, metadata
+        else:
+            raise Exception("No response content found in API response")
     
     def make_request(self, 
                         prompt: str, 
@@ -206,50 +463,42 @@ class APIManager:
         """
         # Use environment defaults if not specified
         if intelligence_level is None:
-            intelligence_level = int(os.getenv('DEFAULT_INTELLIGENCE_LEVEL', '2'))
+            intelligence_level = self._default_intelligence
         if max_tokens is None:
-            max_tokens = int(os.getenv('DEFAULT_MAX_TOKENS', '1000'))
+            max_tokens = self._default_max_tokens
         if temperature is None:
-            temperature = float(os.getenv('DEFAULT_TEMPERATURE', '0.7'))
+            temperature = self._default_temperature
 
         # the model that we are going to use for the intelligence level that we care about
         # Use the fastest model for better throughput
         model_name = self.get_model_name(intelligence_level)
         
+        cache_key = None
+        if self._use_cache:
+            cache_key = self._cache_key(prompt, model_name, max_tokens, temperature)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+        
         # Report model configuration if enabled
         if self.report_model_config:
-            print(f"\n{'='*80}")
-            print("LLM API REQUEST CONFIGURATION")
-            print(f"{'='*80}")
-            print(f"Model: {model_name}")
-            print(f"Intelligence Level: {intelligence_level}")
-            print(f"Max Tokens: {max_tokens}")
-            print(f"Temperature: {temperature}")
-            print(f"API Endpoint: {self.base_url}")
-            print(f"{'='*80}\n")
+            _write_report("LLM API REQUEST CONFIGURATION", (
+                ("Model", model_name),
+                ("Intelligence Level", intelligence_level),
+                ("Max Tokens", max_tokens),
+                ("Temperature", temperature),
+                ("API Endpoint", self.base_url),
+            ))
 
         # the payload that we are going to send to the api
-        payload: Dict[str, Any] = {
-            "model": model_name,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            'provider': {
-                'sort': 'throughput'
-            }
-        }
+        payload = self._build_payload(prompt, model_name, max_tokens, temperature)
+        from requests.exceptions import RequestException
 
         # send the request to the api
         try:
             # make the request to the api
-            response = requests.post(
+            response = self._session.post(
                 self.base_url,
-                headers=self.headers,
                 json=payload,
                 timeout=30
             )
@@ -261,55 +510,14 @@ class APIManager:
             response_data = response.json()
             # print(json.dumps(response_data, indent=2))
 
-            # check if the response is valid
-            if 'choices' in response_data and len(response_data['choices']) > 0:
-                response_text = response_data['choices'][0]['message']['content']
-                reasoning_text = response_data['choices'][0]['message']['reasoning']
-
-                # Extract metadata from response
-                usage = response_data.get('usage', {})
-                actual_model = response_data.get('model', model_name)
-                provider = response_data.get('provider', None)
-                finish_reason = response_data['choices'][0].get('finish_reason', 'unknown')
-                
-                # Report response details if enabled
-                if self.report_model_config:
-                    print(f"\n{'='*80}")
-                    print("LLM API RESPONSE RECEIVED")
-                    print(f"{'='*80}")
-                    print(f"Actual Model Used: {actual_model}")
-                    print(f"Finish Reason: {finish_reason}")
-                    print(f"Prompt Tokens: {usage.get('prompt_tokens', 'unknown')}")
-                    print(f"Completion Tokens: {usage.get('completion_tokens', 'unknown')}")
-                    print(f"Total Tokens: {usage.get('total_tokens', 'unknown')}")
-                    print(f"Response Length: {len(response_text)} characters")
-                    print(f"{'='*80}\n")
-
-                
-                # Log the LLM response if logging is enabled
-                metadata = {
-                    'api_url': self.base_url,
-                    'provider': provider,
-                    'provider_sort': 'throughput',
-                    'actual_model_used': actual_model,
-                    'requested_model': model_name,
-                    'intelligence_level': intelligence_level,
-                    'max_tokens': max_tokens,
-                    'temperature': temperature,
-                    'prompt_tokens': usage.get('prompt_tokens', 'unknown'),
-                    'completion_tokens': usage.get('completion_tokens', 'unknown'),
-                    'total_tokens': usage.get('total_tokens', 'unknown'),
-                    'finish_reason': finish_reason
-                }
-                self._log_llm_response(prompt, response_text, model_name, intelligence_level, 
-                                     max_tokens, temperature, metadata)
-                
-                return response_text, reasoning_text, model_name, metadata
-            else:
-                raise Exception("No response content found in API response")
+            result = self._process_response_data(response_data, prompt, model_name, intelligence_level,
+                                                 max_tokens, temperature)
+            if cache_key is not None:
+                self._cache_put(cache_key, result)
+            return result
 
         # raise an error if the request fails
-        except requests.exceptions.RequestException as e:
+        except RequestException as e:
             if hasattr(e, 'response') and e.response is not None:
                 try:
                     error_detail = e.response.json()
@@ -332,6 +540,109 @@ class APIManager:
             raise Exception(f"Unexpected error in API request: {str(e)}")
     
     
+    def make_requests_batch(self,
+                            prompts: List[str],
+                            intelligence_level: int = None,
+                            max_tokens: int = None,
+                            temperature: float = None,
+                            concurrency: int = 32
+                            ) -> List[Any]:
+        """
+        Send many prompts to OpenRouter concurrently and wait for all of them.
+        
+        Blocking entry point (runs its own event loop); call it from synchronous
+        code, not from inside a running event loop.
+        
+        Args:
+            prompts (List[str]): Prompts to send
+            intelligence_level (int): Intelligence level for every prompt (defaults to env setting)
+            max_tokens (int): Maximum number of tokens to generate (defaults to env setting)
+            temperature (float): Sampling temperature (defaults to env setting)
+            concurrency (int): Maximum requests in flight at once
+            
+        Returns:
+            List[Any]: One entry per prompt, in order: the same
+            (response_text, reasoning_text, model_name, metadata) tuple make_request
+            returns, or the Exception that request failed with
+        """
+        if intelligence_level is None:
+            intelligence_level = self._default_intelligence
+        if max_tokens is None:
+            max_tokens = self._default_max_tokens
+        if temperature is None:
+            temperature = self._default_temperature
+        model_name = self.get_model_name(intelligence_level)
+        
+        results: List[Any] = [None] * len(prompts)
+        pending = list(range(len(prompts)))
+        if self._use_cache:
+            # Answer cached prompts locally; only the rest go over the network
+            keys = [self._cache_key(prompt, model_name, max_tokens, temperature) for prompt in prompts]
+            pending = []
+            for i, key in enumerate(keys):
+                results[i] = self._cache_get(key)
+                if results[i] is None:
+                    pending.append(i)
+        
+        if pending:
+            import asyncio
+            fetched = asyncio.run(self._request_batch([prompts[i] for i in pending], model_name, intelligence_level,
+                                                      max_tokens, temperature, concurrency))
+            for i, result in zip(pending, fetched):
+                results[i] = result
+                if self._use_cache and not isinstance(result, BaseException):
+                    self._cache_put(keys[i], result)
+        return results
+    
+    async def _request_batch(self, prompts: List[str], model_name: str, intelligence_level: int,
+                             max_tokens: int, temperature: float, concurrency: int) -> List[Any]:
+        """Fan the prompts out over one async HTTP client, at most `concurrency` at a time."""
+        import asyncio
+        import httpx
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        # HTTP/2 multiplexes the in-flight requests over one TLS connection (needs httpx[http2])
+        async with httpx.AsyncClient(headers=self.headers, limits=limits, timeout=30,
+                                     http2=_HTTP2_AVAILABLE) as client:
+            async def run(prompt: str):
+                async with semaphore:
+                    return await self._arequest(client, prompt, model_name, intelligence_level,
+                                                max_tokens, temperature)
+            return await asyncio.gather(*(run(prompt) for prompt in prompts), return_exceptions=True)
+    
+    async def _arequest(self, client, prompt: str, model_name: str, intelligence_level: int,
+                        max_tokens: int, temperature: float, retries: int = _RETRY_TOTAL) -> tuple:
+        """
+        Async counterpart of make_request's HTTP step, retrying 429/5xx with exponential backoff.
+        
+        Like the sync session (see _session_retry), only connection failures are
+        retried among transport errors, and Retry-After is capped.
+        """
+        import asyncio
+        import httpx
+        
+        payload = self._build_payload(prompt, model_name, max_tokens, temperature)
+        for attempt in range(retries + 1):
+            delay = _RETRY_BACKOFF * (2 ** attempt)
+            try:
+                response = await client.post(self.base_url, json=payload)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                if attempt == retries:
+                    raise Exception(f"API request failed: {str(e)}")
+            except httpx.TransportError as e:
+                raise Exception(f"API request failed: {str(e)}")
+            else:
+                if response.status_code not in _RETRY_STATUSES or attempt == retries:
+                    if response.is_error:
+                        raise Exception(f"API request failed: Status: {response.status_code} - Details: {response.text}")
+                    return self._process_response_data(response.json(), prompt, model_name, intelligence_level,
+                                                       max_tokens, temperature)
+                retry_after = response.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    delay = min(int(retry_after), _RETRY_AFTER_MAX)
+            await asyncio.sleep(delay)
+    
     # === TASK-SPECIFIC METHODS ===
     # These methods provide high-level interfaces for specific tasks,
     # abstracting away model selection and prompt engineering details.
@@ -347,11 +658,12 @@ class APIManager:
         Returns:
             Generated summary text
         """
-        # Use reasoning model for comprehensive summaries
+        # Use reasoning model for comprehensive summaries (non-reasoning for short prompts if configured)
         prompt = self._build_summary_prompt(agent_data)
+        level = 2 if len(prompt) // 4 < self._summary_small_model_tokens else 3
         response, reasoning, _, _ = self.make_request(
             prompt=prompt,
-            intelligence_level=3,  # Reasoning model
+            intelligence_level=level,
             max_tokens=max_tokens,
             temperature=0.7
         )
@@ -368,11 +680,12 @@ class APIManager:
         Returns:
             Dictionary with perception, impact_score, and analysis_type
         """
-        # Use reasoning model for perception
+        # Use reasoning model for perception (smallest model for short prompts if configured)
         prompt = self._build_perception_prompt(event_data, agent_context)
+        level = 1 if len(prompt) // 4 < self._perceive_small_model_tokens else 3
         response, *_ = self.make_request(
             prompt=prompt,
-            intelligence_level=3,  # Reasoning model
+            intelligence_level=level,
             max_tokens=300,
             temperature=0.3
         )
@@ -411,7 +724,7 @@ Occupation: {occupation}
 Education: {education}
 
 Additional Information:
-{json.dumps(agent_data, indent=2)}
+{_pretty_json(agent_data)}
 
 Generate a narrative summary that captures their personality, values, lifestyle, and key characteristics.
 Write in third person, as if you're describing this person to someone who has never met them."""
@@ -430,7 +743,7 @@ Type: {event_type}
 Content: {event_content}
 
 YOUR CURRENT STATE:
-{json.dumps(agent_context, indent=2)}
+{_pretty_json(agent_context)}
 
 ANALYSIS TASK:
 1. Determine if this event should be analyzed in historical context or as an immediate reaction
@@ -451,43 +764,30 @@ REASONING: <brief explanation in first person>"""
             'analysis_type': 'immediate_reaction'
         }
         
-        for line in response.split('\n'):
-            if line.startswith('ANALYSIS_TYPE:'):
-                result['analysis_type'] = line.split(':', 1)[1].strip()
-            elif line.startswith('IMPACT_SCORE:'):
+        for match in _PERCEPTION_RE.finditer(response):
+            field, value = match.group(1), match.group(2).strip()
+            if field == 'ANALYSIS_TYPE':
+                result['analysis_type'] = value
+            elif field == 'IMPACT_SCORE':
                 try:
-                    result['impact_score'] = int(line.split(':', 1)[1].strip())
+                    result['impact_score'] = int(value)
                 except ValueError:
                     pass
-            elif line.startswith('REASONING:'):
-                result['perception'] = line.split(':', 1)[1].strip()
+            else:
+                result['perception'] = value
         
         return result
     
     def _get_mock_embedding(self, text: str) -> List[float]:
         """Generate a simple hash-based embedding for testing."""
         import hashlib
-        import struct
+        import numpy as np
         
-        # Create a hash of the text
+        # Reinterpret the hash bytes as big-endian floats, zero-padded to 384 dimensions
         text_hash = hashlib.sha256(text.encode('utf-8')).digest()
-        
-        # Convert to float values
-        embedding = []
-        for i in range(0, len(text_hash), 4):
-            if i + 4 <= len(text_hash):
-                # Convert 4 bytes to float
-                value = struct.unpack('>f', text_hash[i:i+4])[0]
-                embedding.append(value)
-        
-        # Pad to 384 dimensions (standard embedding size)
-        target_size = 384
-        if len(embedding) < target_size:
-            embedding.extend([0.0] * (target_size - len(embedding)))
-        elif len(embedding) > target_size:
-            embedding = embedding[:target_size]
-        
-        return embedding
+        embedding = np.zeros(_MOCK_EMBEDDING_SIZE, dtype=np.float32)
+        embedding[:len(text_hash) // 4] = np.frombuffer(text_hash, dtype='>f4')
+        return embedding.tolist()
     
     def _get_openai_embedding(self, text: str) -> List[float]:
         """Get embedding using OpenAI API."""
@@ -495,9 +795,10 @@ REASONING: <brief explanation in first person>"""
             raise ValueError("OPENAI_API_KEY not set. Cannot generate embeddings.")
         
         try:
-            import openai
-            client = openai.OpenAI(api_key=self.openai_api_key)
-            response = client.embeddings.create(
+            if self._openai_client is None:
+                import openai
+                self._openai_client = openai.OpenAI(api_key=self.openai_api_key)
+            response = self._openai_client.embeddings.create(
                 model="text-embedding-ada-002",
                 input=text
             )
@@ -518,11 +819,11 @@ REASONING: <brief explanation in first person>"""
             bool: True if connection successful, False otherwise
         """
         if intelligence_level is None:
-            intelligence_level = int(os.getenv('TEST_CONNECTION_INTELLIGENCE_LEVEL', '2'))
+            intelligence_level = self._test_intelligence
         
         try:
             test_prompt = "Hello, this is a test message. Please respond with 'Test successful.'"
-            max_tokens = int(os.getenv('TEST_CONNECTION_MAX_TOKENS', '10'))
+            max_tokens = self._test_max_tokens
             response, *_ = self.make_request(test_prompt, intelligence_level, max_tokens=max_tokens)
             return "Test successful" in response
         except Exception as e:
@@ -10,6 +10,8 @@ from typing import Dict, List, Set, Tuple
 from collections import Counter
 import csv
 
+import pandas as pd
+
 # Ensure project root is on sys.path
 _PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(_PROJECT_ROOT) not in sys.path:
@@ -43,102 +45,84 @@ def analyze_file_structure(file_path: Path, max_rows: int = 10000) -> Dict:
         return {}
     
     with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-        reader = csv.reader(f)
-        headers = next(reader)
-        num_cols = len(headers)
-        
-        print(f"  Columns: {num_cols}")
-        print(f"  First 5 columns: {headers[:5]}")
-        if num_cols > 5:
-            print(f"  Last 5 columns: {headers[-5:]}")
-        
-        # Track column value patterns
-        rows_processed = 0
-        column_values: Dict[str, Set] = {h: set() for h in headers}
-        column_nulls: Dict[str, int] = {h: 0 for h in headers}
-        
-        for row in reader:
-            if rows_processed >= max_rows:
-                break
-            
-            # Pad row if needed
-            while len(row) < num_cols:
-                row.append("")
-            
-            for idx, val in enumerate(row[:num_cols]):
-                col_name = headers[idx]
-                val_stripped = val.strip()
-                
-                # Track unique values (limit to avoid memory issues)
-                if len(column_values[col_name]) < 1000:
-                    column_values[col_name].add(val_stripped)
-                
-                # Track nulls/missing (-1 is common null indicator in ATUS)
-                if val_stripped in ("", "-1"):
-                    column_nulls[col_name] += 1
-            
-            rows_processed += 1
-        
-        print(f"  Rows analyzed: {rows_processed}")
-        
-        # Identify potential key columns
-        print(f"\n  Potential Key Analysis:")
-        
-        # Check TUCASEID uniqueness
-        if "TUCASEID" in column_values:
-            tucaseid_count = len(column_values["TUCASEID"])
-            print(f"    TUCASEID: {tucaseid_count} unique values (rows: {rows_processed})")
-            if tucaseid_count == rows_processed:
-                print(f"      -> TUCASEID is UNIQUE (potential PK)")
-            else:
-                print(f"      -> TUCASEID has duplicates")
-        
-        # Check common composite key candidates
-        composite_candidates = [
-            ("TUCASEID", "TULINENO"),
-            ("TUCASEID", "TUACTIVITY_N"),
-            ("TUCASEID", "TUECLNO"),
-            ("TUCASEID", "weight_number"),
-        ]
-        
-        for combo in composite_candidates:
-            if all(c in headers for c in combo):
-                # Count unique combinations
-                combo_set = set()
-                f.seek(0)
-                reader = csv.reader(f)
-                next(reader)  # skip header
-                count = 0
-                for row in reader:
-                    if count >= max_rows:
-                        break
-                    while len(row) < num_cols:
-                        row.append("")
-                    combo_vals = tuple(row[headers.index(c)] for c in combo)
-                    combo_set.add(combo_vals)
-                    count += 1
-                
-                combo_count = len(combo_set)
-                print(f"    {' + '.join(combo)}: {combo_count} unique (rows: {count})")
-                if combo_count == count:
-                    print(f"      -> Composite key is UNIQUE (potential PK)")
-        
-        # Report columns with high null rates
-        print(f"\n  Columns with >50% nulls/missing:")
-        high_null_cols = [(col, cnt / rows_processed) for col, cnt in column_nulls.items() 
-                          if rows_processed > 0 and (cnt / rows_processed) > 0.5]
-        high_null_cols.sort(key=lambda x: x[1], reverse=True)
-        for col, null_rate in high_null_cols[:10]:
-            print(f"    {col}: {column_nulls[col]}/{rows_processed} ({null_rate*100:.1f}%)")
-        
-        return {
-            "file": file_path.name,
-            "columns": headers,
-            "num_cols": num_cols,
-            "rows_analyzed": rows_processed,
-            "column_values": column_values,
-            "column_nulls": column_nulls,
-        }
+        headers = next(csv.reader(f))
+    num_cols = len(headers)
+    
+    print(f"  Columns: {num_cols}")
+    print(f"  First 5 columns: {headers[:5]}")
+    if num_cols > 5:
+        print(f"  Last 5 columns: {headers[-5:]}")
+    
+    # Parse the sample in C as raw strings; short rows are padded with "" and extra fields dropped
+    try:
+        data = pd.read_csv(
+            file_path, header=None, skiprows=1, nrows=max_rows, usecols=range(num_cols),
+            dtype=str, keep_default_na=False, skip_blank_lines=False,
+            encoding='utf-8', encoding_errors='ignore'
+        )
+    except pd.errors.EmptyDataError:
+        # Header-only file: analyze zero rows
+        data = pd.DataFrame(columns=range(num_cols), dtype=str)
+    data = data.reindex(columns=range(num_cols)).fillna("")
+    rows_processed = len(data)
+    
+    # Check common composite key candidates
+    composite_candidates = [
+        ("TUCASEID", "TULINENO"),
+        ("TUCASEID", "TUACTIVITY_N"),
+        ("TUCASEID", "TUECLNO"),
+        ("TUCASEID", "weight_number"),
+    ]
+    col_idx = {h: i for i, h in enumerate(headers)}
+    active_combos = [combo for combo in composite_candidates if all(c in col_idx for c in combo)]
+    
+    # Track column value patterns
+    column_values: Dict[str, Set] = {}
+    column_nulls: Dict[str, int] = {}
+    for idx, col_name in enumerate(headers):
+        stripped = data[idx].str.strip()
+        # Track unique values (first 1000 seen, to avoid memory issues)
+        column_values.setdefault(col_name, set()).update(stripped.unique()[:1000])
+        # Track nulls/missing (-1 is common null indicator in ATUS)
+        column_nulls[col_name] = column_nulls.get(col_name, 0) + int(stripped.isin(("", "-1")).sum())
+    
+    print(f"  Rows analyzed: {rows_processed}")
+    
+    # Identify potential key columns
+    print(f"\n  Potential Key Analysis:")
+    
+    # Check TUCASEID uniqueness
+    if "TUCASEID" in col_idx:
+        # Exact distinct count (column_values only keeps a capped sample)
+        tucaseid_count = data[col_idx["TUCASEID"]].str.strip().nunique()
+        print(f"    TUCASEID: {tucaseid_count} unique values (rows: {rows_processed})")
+        if tucaseid_count == rows_processed:
+            print(f"      -> TUCASEID is UNIQUE (potential PK)")
+        else:
+            print(f"      -> TUCASEID has duplicates")
+    
+    for combo in active_combos:
+        combo_count = rows_processed - int(data.duplicated(subset=[col_idx[c] for c in combo]).sum())
+        print(f"    {' + '.join(combo)}: {combo_count} unique (rows: {rows_processed})")
+        if combo_count == rows_processed:
+            print(f"      -> Composite key is UNIQUE (potential PK)")
+    
+    # Report columns with high null rates
+    print(f"\n  Columns with >50% nulls/missing:")
+    high_null_cols = [(col, cnt / rows_processed) for col, cnt in column_nulls.items() 
+                      if rows_processed > 0 and (cnt / rows_processed) > 0.5]
+    high_null_cols.sort(key=lambda x: x[1], reverse=True)
+    for col, null_rate in high_null_cols[:10]:
+        print(f"    {col}: {column_nulls[col]}/{rows_processed} ({null_rate*100:.1f}%)")
+    
+    return {
+        "file": file_path.name,
+        "columns": headers,
+        "num_cols": num_cols,
+        "rows_analyzed": rows_processed,
+        "column_values": column_values,
+        "column_nulls": column_nulls,
+    }
 
 
 def main():
@@ -19,12 +19,15 @@ from __future__ import annotations
 
 import argparse
 import json
-import math
+import re
 import sys
 from pathlib import Path
 from collections import defaultdict, OrderedDict
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
 
 try:
 	from tqdm import tqdm
@@ -49,63 +52,62 @@ from Agent.modules.planning.strata import (
 # Operator mapping heuristics
 # -----------------------------------------------------------------------------
 
-def classify_operator(major: str, tier: str, code: str, activity: str) -> str:
-	act_lower = (activity or "").lower()
+# Operator for each ATUS major category; majors listed in _KEYWORD_OPERATORS
+# refine this default by keywords in the activity description
+_MAJOR_OPERATORS: Dict[str, str] = {
+	"01": "personal_care",
+	"02": "household_chore",
+	"03": "childcare",
+	"04": "work_onsite",
+	"05": "attend_class",
+	"06": "retail_shop",
+	"07": "personal_care_out",
+	"08": "leisure_home",
+	"09": "eat_meal",
+	"10": "household_management",
+	"11": "travel_support",
+	"14": "leisure_out",
+	"15": "travel_support",
+	"16": "travel_support",
+	"18": "travel_support",
+}
+
+# (keyword pattern, operator) rules checked in order against the lowercased activity
+_KEYWORD_OPERATORS: Dict[str, Tuple[Tuple[re.Pattern, str], ...]] = {
+	major: tuple((re.compile("|".join(map(re.escape, keywords))), operator) for keywords, operator in rules)
+	for major, rules in {
+		"06": (
+			(("grocery", "food shopping", "supermarket"), "grocery_shop"),
+		),
+		"07": (
+			(("medical", "doctor", "health"), "medical"),
+			(("pharmacy", "prescription"), "pharmacy"),
+		),
+		"08": (
+			(("sports", "exercise"), "exercise"),
+			(("religious", "spiritual"), "religious"),
+			(("volunteer",), "volunteer"),
+			(("socializing",), "socialize"),
+			(("arts", "entertainment", "recreation"), "leisure_out"),
+		),
+	}.items()
+}
+
 
+def classify_operator(major: str, tier: str, code: str, activity: str) -> str:
 	if code.startswith("0101"):
 		return "sleep"
-	if major == "01":
-		return "personal_care"
-	if major == "02":
-		if tier.startswith("0202"):
-			return "meal_prep"
-		return "household_chore"
-	if major == "03":
-		return "childcare"
-	if major == "04":
-		return "work_onsite"
-	if major == "05":
-		return "attend_class"
-	if major == "06":
-		if "grocery" in act_lower or "food shopping" in act_lower or "supermarket" in act_lower:
-			return "grocery_shop"
-		if "shopping" in act_lower:
-			return "retail_shop"
-		return "retail_shop"
-	if major == "07":
-		if "medical" in act_lower or "doctor" in act_lower or "health" in act_lower:
-			return "medical"
-		if "pharmacy" in act_lower or "prescription" in act_lower:
-			return "pharmacy"
-		return "personal_care_out"
-	if major == "08":
-		if "sports" in act_lower or "exercise" in act_lower:
-			return "exercise"
-		if "religious" in act_lower or "spiritual" in act_lower:
-			return "religious"
-		if "volunteer" in act_lower:
-			return "volunteer"
-		if "socializing" in act_lower:
-			return "socialize"
-		if "arts" in act_lower or "entertainment" in act_lower or "recreation" in act_lower:
-			return "leisure_out"
-		return "leisure_home"
-	if major == "09":
-		return "eat_meal"
-	if major == "10":
-		return "household_management"
-	if major == "11":
-		return "travel_support"
-	if major == "14":
-		return "leisure_out"
-	if major == "15":
-		return "travel_support"
-	if major == "16":
-		return "travel_support"
-	if major == "18":
-		return "travel_support"
-
-	return "other"
+	if major == "02" and tier.startswith("0202"):
+		return "meal_prep"
+
+	operator = _MAJOR_OPERATORS.get(major, "other")
+	rules = _KEYWORD_OPERATORS.get(major)
+	if rules:
+		act_lower = (activity or "").lower()
+		for pattern, keyword_operator in rules:
+			if pattern.search(act_lower):
+				return keyword_operator
+	return operator
 
 
 def default_location_for_operator(operator: str) -> Optional[str]:
@@ -216,7 +218,10 @@ def fetch_who_data(db) -> Dict[Tuple[str, int], List[int]]:
 	return companion_map
 
 
-def fetch_activities(db) -> Iterable[Dict[str, Any]]:
+ACTIVITY_COLUMNS = ["TUCASEID", "TUACTIVITY_N", "TUSTARTTIM", "TRCODEP", "TUACTDUR24", "TEWHERE"]
+
+
+def fetch_activities(db) -> pd.DataFrame:
 	query = """
 		SELECT
 			TUCASEID,
@@ -231,34 +236,39 @@ def fetch_activities(db) -> Iterable[Dict[str, Any]]:
 	result = db.execute_query(query, fetch=True)
 	if not result.success:
 		raise RuntimeError(f"Failed to fetch activities: {result.error}")
-	return result.data
+	# Columnar from the start: one array per field instead of millions of row dicts
+	return pd.DataFrame.from_records(result.data, columns=ACTIVITY_COLUMNS)
 
 
 # -----------------------------------------------------------------------------
 # Aggregation helpers
 # -----------------------------------------------------------------------------
 
-def weighted_quantiles(values: List[Tuple[float, float]], quantiles: Sequence[float]) -> List[Optional[float]]:
-	if not values:
-		return [None for _ in quantiles]
-	values_sorted = sorted(values, key=lambda x: x[0])
-	total_weight = sum(w for _, w in values_sorted)
-	if total_weight <= 0:
-		return [None for _ in quantiles]
-	cumulative = 0.0
-	results: List[Optional[float]] = []
-	targets = [q * total_weight for q in quantiles]
-	idx = 0
-	for target in targets:
-		while idx < len(values_sorted):
-			duration, weight = values_sorted[idx]
-			cumulative += weight
-			if cumulative >= target:
-				results.append(duration)
-				break
-			idx += 1
-		else:
-			results.append(values_sorted[-1][0])
+def weighted_quantiles(
+	group_ids: np.ndarray,
+	durations: np.ndarray,
+	weights: np.ndarray,
+	quantiles: Sequence[float],
+) -> np.ndarray:
+	"""
+	Weighted quantiles of every group in one pass: for each q, the smallest value
+	whose cumulative weight within its group reaches q * the group's total weight.
+
+	Returns an array of shape (number of groups, len(quantiles)); group ids must be 0..n-1.
+	"""
+	order = np.lexsort((durations, group_ids))
+	sorted_groups = group_ids[order]
+	sorted_durations = durations[order]
+	running = pd.Series(weights[order]).groupby(sorted_groups).cumsum().to_numpy()
+	starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+	ends = np.r_[starts[1:], order.size]
+	totals = running[ends - 1]
+
+	results = np.empty((starts.size, len(quantiles)))
+	for col, q in enumerate(quantiles):
+		reached = np.flatnonzero(running >= np.repeat(q * totals, ends - starts))
+		first = reached[np.minimum(np.searchsorted(reached, starts), reached.size - 1)]
+		results[:, col] = sorted_durations[np.minimum(first, ends - 1)]
 	return results
 
 
@@ -280,20 +290,41 @@ def is_home_location(tewhere: Optional[int]) -> bool:
 	return int(tewhere) in {1, 2}
 
 
+# TUWHO_CODE -> companion bitmask (bit 0 spouse, bit 1 child, bit 2 friend)
+COMPANION_FLAG_BITS = (("with_spouse", 1), ("with_child", 2), ("with_friend", 4))
+COMPANION_BITS = np.zeros(256, dtype=np.uint8)
+COMPANION_BITS[18] = 1
+COMPANION_BITS[[20, 21, 22, 40]] = 2
+COMPANION_BITS[30:38] = 4
+
+
+def companion_mask(codes: Sequence[int]) -> int:
+	"""OR of the companion bits for one activity's TUWHO codes."""
+	codes = np.asarray(codes, dtype=np.int64)
+	codes = codes[(codes >= 0) & (codes < COMPANION_BITS.size)]
+	return int(np.bitwise_or.reduce(COMPANION_BITS[codes], initial=0))
+
+
 def companion_flags(codes: List[int]) -> Dict[str, bool]:
-	flags = {
-		"with_spouse": False,
-		"with_child": False,
-		"with_friend": False,
-	}
-	for code in codes:
-		if code == 18:
-			flags["with_spouse"] = True
-		elif code in {20, 21, 22, 40}:
-			flags["with_child"] = True
-		elif code in {30, 31, 32, 33, 34, 35, 36, 37}:
-			flags["with_friend"] = True
-	return flags
+	mask = companion_mask(codes)
+	return {flag: bool(mask & bit) for flag, bit in COMPANION_FLAG_BITS}
+
+
+def companion_masks(companion_map: Dict[Tuple[str, int], List[int]]) -> pd.Series:
+	"""Companion bitmask for every (TUCASEID, TUACTIVITY_N) with at least one companion code."""
+	keys = [key for key, codes in companion_map.items() if codes]
+	if not keys:
+		index = pd.MultiIndex.from_arrays([[], []], names=["TUCASEID", "TUACTIVITY_N"])
+		return pd.Series([], index=index, dtype=np.uint8, name="companions")
+	counts = np.fromiter((len(companion_map[key]) for key in keys), dtype=np.int64, count=len(keys))
+	codes = np.fromiter(
+		(code for key in keys for code in companion_map[key]), dtype=np.int64, count=int(counts.sum())
+	)
+	bits = np.where((codes >= 0) & (codes < COMPANION_BITS.size), COMPANION_BITS[codes & 0xFF], 0).astype(np.uint8)
+	# One OR-reduction per activity over its contiguous run of codes
+	offsets = np.r_[0, np.cumsum(counts)[:-1]]
+	index = pd.MultiIndex.from_tuples(keys, names=["TUCASEID", "TUACTIVITY_N"])
+	return pd.Series(np.bitwise_or.reduceat(bits, offsets), index=index, name="companions")
 
 
 # -----------------------------------------------------------------------------
@@ -337,11 +368,63 @@ def build_strata(case_rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]],
 	return strata_rows, case_stratum_rows, case_to_stratum
 
 
+def _map_distinct(column: pd.Series, mapping: Any) -> np.ndarray:
+	"""Like column.map(mapping), but looks up each distinct value once (unmatched/null keys give NaN)."""
+	codes, uniques = pd.factorize(column)
+	return np.append(pd.Index(uniques).map(mapping).to_numpy(), np.nan)[codes]
+
+
+def _build_activity_frame(
+	case_rows: List[Dict[str, Any]],
+	case_to_stratum: Dict[str, int],
+	operator_lookup: Dict[str, str],
+	activities: Union[pd.DataFrame, List[Dict[str, Any]]],
+	companion_map: Dict[Tuple[str, int], List[int]],
+) -> pd.DataFrame:
+	"""Columnar view of the usable activities (weighted case, mapped operator, positive duration)."""
+	cases = pd.DataFrame({
+		"TUCASEID": [row["TUCASEID"] for row in case_rows],
+		"weight": [float(row.get("TUFNWGTP") or 0.0) for row in case_rows],
+		"dow": [int(row.get("TUDIARYDAY") or 1) for row in case_rows],
+	}).drop_duplicates("TUCASEID", keep="last").set_index("TUCASEID")
+
+	if isinstance(activities, pd.DataFrame):
+		df = activities[ACTIVITY_COLUMNS].copy()
+	else:
+		df = pd.DataFrame.from_records(activities, columns=ACTIVITY_COLUMNS)
+	# Per-case attributes in one pass over the case ids
+	case_codes, case_ids = pd.factorize(df["TUCASEID"])
+	per_case = cases.reindex(case_ids)
+	per_case["stratum_id"] = pd.Index(case_ids).map(case_to_stratum)
+	for column in ("stratum_id", "weight", "dow"):
+		df[column] = np.append(per_case[column].to_numpy(dtype="float64"), np.nan)[case_codes]
+	df["operator"] = _map_distinct(df["TRCODEP"], operator_lookup)
+	df["duration"] = pd.to_numeric(df["TUACTDUR24"]).fillna(0.0).astype("float64")
+
+	keep = df["stratum_id"].notna() & (df["weight"] > 0) & df["operator"].notna() & (df["duration"] > 0)
+	df = df.loc[keep].reset_index(drop=True)
+	df["stratum_id"] = df["stratum_id"].astype("int64")
+	df["dow"] = df["dow"].astype("int64")
+	# A diary has at most a few thousand distinct start times, so parse each one once
+	hours = _map_distinct(df["TUSTARTTIM"], parse_start_hour).astype("float64")
+	df["hour"] = np.nan_to_num(hours).astype("int64")
+	df["weighted_minutes"] = df["duration"] * df["weight"]
+	df["home"] = pd.to_numeric(df["TEWHERE"]).isin((1, 2))
+
+	# Companion flags per (case, activity); activities without companion rows are "alone"
+	df = df.join(companion_masks(companion_map), on=["TUCASEID", "TUACTIVITY_N"])
+	df["alone"] = df["companions"].isna()
+	masks = df["companions"].fillna(0).to_numpy(dtype=np.uint8)
+	for flag, bit in COMPANION_FLAG_BITS:
+		df[flag] = (masks & bit) != 0
+	return df
+
+
 def compute_distributions(
 	case_rows: List[Dict[str, Any]],
 	case_to_stratum: Dict[str, int],
 	operator_lookup: Dict[str, str],
-	activities: List[Dict[str, Any]],
+	activities: Union[pd.DataFrame, List[Dict[str, Any]]],
 	companion_map: Dict[Tuple[str, int], List[int]],
 ) -> Tuple[
 	List[Dict[str, Any]],  # hourly_mix
@@ -350,235 +433,115 @@ def compute_distributions(
 	List[Dict[str, Any]],  # social_where
 	List[Dict[str, Any]],  # weekly_presence
 ]:
+	df = _build_activity_frame(case_rows, case_to_stratum, operator_lookup, activities, companion_map)
+	if df.empty:
+		return [], [], [], [], []
 
-	case_meta = {
-		row["TUCASEID"]: {
-			"weight": float(row.get("TUFNWGTP") or 0.0),
-			"dow": int(row.get("TUDIARYDAY") or 1),
-		}
-		for row in case_rows
-	}
-
-	hourly_minutes: Dict[Tuple[int, int, int, str], float] = defaultdict(float)
-	hourly_totals: Dict[Tuple[int, int, int], float] = defaultdict(float)
-	hourly_samples: Dict[Tuple[int, int, int], set] = defaultdict(set)
-
-	duration_values: Dict[Tuple[int, int, str], List[Tuple[float, float]]] = defaultdict(list)
-	duration_moments: Dict[Tuple[int, int, str], Tuple[float, float, float]] = defaultdict(lambda: (0.0, 0.0, 0.0))
-	duration_counts: Dict[Tuple[int, int, str], Tuple[int, float]] = defaultdict(lambda: (0, 0.0))
-
-	transition_counts: Dict[Tuple[int, int, str, str], float] = defaultdict(float)
-	transition_totals: Dict[Tuple[int, int, str], float] = defaultdict(float)
-	transition_samples: Dict[Tuple[int, int, str], set] = defaultdict(set)
-
-	social_counts: Dict[Tuple[int, int, str], Dict[str, float]] = defaultdict(lambda: defaultdict(float))
-	social_totals: Dict[Tuple[int, int, str], float] = defaultdict(float)
-	social_samples: Dict[Tuple[int, int, str], set] = defaultdict(set)
-
-	case_operator_minutes: Dict[Tuple[str, str], float] = defaultdict(float)
-
-	current_case = None
-	current_sequence: List[Tuple[int, str, float]] = []
-
-	for act in tqdm(activities, desc="  Processing activities", unit="activities"):
-		tucaseid = act["TUCASEID"]
-		if tucaseid not in case_to_stratum or tucaseid not in case_meta:
-			continue
-
-		stratum_id = case_to_stratum[tucaseid]
-		meta = case_meta[tucaseid]
-		weight = meta["weight"]
-		if weight <= 0:
-			continue
-
-		operator = operator_lookup.get(act["TRCODEP"])
-		if not operator:
-			continue
-
-		dow = meta["dow"]
-		hour = parse_start_hour(act["TUSTARTTIM"])
-		duration = float(act.get("TUACTDUR24") or 0.0)
-		if duration <= 0:
-			continue
-
-		key_hourly = (stratum_id, dow, hour, operator)
-		key_hour_total = (stratum_id, dow, hour)
-		weighted_minutes = duration * weight
-		hourly_minutes[key_hourly] += weighted_minutes
-		hourly_totals[key_hour_total] += weighted_minutes
-		hourly_samples[key_hour_total].add(tucaseid)
-
-		key_duration = (stratum_id, dow, operator)
-		duration_values[key_duration].append((duration, weight))
-		sum_w, sum_wx, sum_wx2 = duration_moments[key_duration]
-		duration_moments[key_duration] = (
-			sum_w + weight,
-			sum_wx + duration * weight,
-			sum_wx2 + (duration ** 2) * weight,
-		)
-		count, weight_sum = duration_counts[key_duration]
-		duration_counts[key_duration] = (count + 1, weight_sum + weight)
-
-		comp_key = (tucaseid, act["TUACTIVITY_N"])
-		comp_codes = companion_map.get(comp_key, [])
-		flags = companion_flags(comp_codes)
-		key_social = (stratum_id, hour, operator)
-		social_totals[key_social] += weight
-		if is_home_location(act.get("TEWHERE")):
-			social_counts[key_social]["home"] += weight
-		else:
-			social_counts[key_social]["out"] += weight
-		for flag, value in flags.items():
-			if value:
-				social_counts[key_social][flag] += weight
-		if not comp_codes:
-			social_counts[key_social]["alone"] += weight
-		social_samples[key_social].add(tucaseid)
-
-		# Handle transitions per case
-		if current_case != tucaseid:
-			current_case = tucaseid
-			current_sequence = []
-		current_sequence.append((hour, operator, weight))
-		if len(current_sequence) >= 2:
-			prev_hour, prev_operator, prev_weight = current_sequence[-2]
-			key_transition = (stratum_id, prev_hour, prev_operator, operator)
-			key_transition_total = (stratum_id, prev_hour, prev_operator)
-			transition_counts[key_transition] += weight
-			transition_totals[key_transition_total] += weight
-			transition_samples[key_transition_total].add(tucaseid)
-
-	# Weekly presence aggregated by stratum/operator
-		key_case_operator = (tucaseid, operator)
-		case_operator_minutes[key_case_operator] += duration
-
-	weekly_presence_rows: List[Dict[str, Any]] = []
-	stratum_presence_weight: Dict[Tuple[int, str], float] = defaultdict(float)
-	stratum_minutes_weighted: Dict[Tuple[int, str], float] = defaultdict(float)
-	stratum_weight_sum: Dict[Tuple[int, str], float] = defaultdict(float)
-	stratum_case_counts: Dict[Tuple[int, str], int] = defaultdict(int)
-
-	for (case_id, operator), minutes in tqdm(case_operator_minutes.items(), desc="  Computing weekly presence", unit="cases"):
-		if case_id not in case_to_stratum or case_id not in case_meta:
-			continue
-		stratum_id = case_to_stratum[case_id]
-		weight = case_meta[case_id]["weight"]
-		key = (stratum_id, operator)
-		stratum_minutes_weighted[key] += minutes * weight
-		stratum_weight_sum[key] += weight
-		stratum_case_counts[key] += 1
-		if minutes > 0:
-			stratum_presence_weight[key] += weight
-
-	for key, weight_sum in stratum_weight_sum.items():
-		stratum_id, operator = key
-		if weight_sum <= 0:
-			continue
-		presence_weight = stratum_presence_weight.get(key, 0.0)
-		minutes_weighted = stratum_minutes_weighted.get(key, 0.0)
-		sample_n = stratum_case_counts.get(key, 0)
-		weekly_presence_rows.append({
-			"stratum_id": stratum_id,
-			"operator_group": operator,
-			"presence_rate": presence_weight / weight_sum,
-			"mean_minutes_per_week": minutes_weighted / weight_sum,
-			"sample_n": sample_n,
-			"weight_sum": weight_sum,
-		})
-
-	# Precompute operator counts per (stratum_id, dow, hour) to avoid quadratic scans
-	operator_counts: Dict[Tuple[int, int, int], int] = defaultdict(int)
-	for (sid, d, h, _op) in hourly_minutes.keys():
-		operator_counts[(sid, d, h)] += 1
-
-	# Hourly mix rows
+	# Hourly mix rows (additive smoothing over the operators seen in each hour)
 	alpha = 0.1
-	hourly_mix_rows: List[Dict[str, Any]] = []
-	for (stratum_id, dow, hour, operator), weighted_minutes in hourly_minutes.items():
-		total = hourly_totals[(stratum_id, dow, hour)]
-		operator_count = operator_counts[(stratum_id, dow, hour)]
-		alpha_total = alpha * operator_count
-		probability = (weighted_minutes + alpha) / (total + alpha_total) if total + alpha_total > 0 else 0.0
-		sample_n = len(hourly_samples[(stratum_id, dow, hour)])
-		hourly_mix_rows.append({
-			"stratum_id": stratum_id,
-			"dow": dow,
-			"hour": hour,
-			"operator_group": operator,
-			"probability": probability,
-			"sample_n": sample_n,
-			"weight_sum": total,
-		})
-
-	# Duration stats rows
-	duration_rows: List[Dict[str, Any]] = []
-	for key, values in duration_values.items():
-		stratum_id, dow, operator = key
-		sum_w, sum_wx, sum_wx2 = duration_moments[key]
-		if sum_w <= 0:
-			continue
-		mean = sum_wx / sum_w
-		var = max((sum_wx2 / sum_w) - (mean ** 2), 0.0)
-		sd = math.sqrt(var)
-		p10, p50, p90 = weighted_quantiles(values, [0.1, 0.5, 0.9])
-		count, weight_sum = duration_counts[key]
-		duration_rows.append({
-			"stratum_id": stratum_id,
-			"dow": dow,
-			"operator_group": operator,
-			"mean_minutes": mean,
-			"sd_minutes": sd,
-			"p10_minutes": p10,
-			"p50_minutes": p50,
-			"p90_minutes": p90,
-			"sample_n": count,
-			"weight_sum": weight_sum,
-		})
-
-	# Precompute out-degree counts for (stratum_id, hour, from_operator)
-	outdegree_counts: Dict[Tuple[int, int, str], int] = defaultdict(int)
-	for (sid, hr, from_op, _to_op) in transition_counts.keys():
-		outdegree_counts[(sid, hr, from_op)] += 1
-
-	# Transition rows
-	transition_rows: List[Dict[str, Any]] = []
-	for key, count in transition_counts.items():
-		stratum_id, hour, from_op, to_op = key
-		total = transition_totals.get((stratum_id, hour, from_op), 0.0)
-		if total <= 0:
-			continue
-		alpha_trans = 0.05
-		outdeg = outdegree_counts[(stratum_id, hour, from_op)] or 1
-		probability = (count + alpha_trans) / (total + alpha_trans * outdeg)
-		sample_n = len(transition_samples[(stratum_id, hour, from_op)])
-		transition_rows.append({
-			"stratum_id": stratum_id,
-			"hour": hour,
-			"from_operator": from_op,
-			"to_operator": to_op,
-			"probability": probability,
-			"sample_n": sample_n,
-		})
-
-	# Social where rows
-	social_rows: List[Dict[str, Any]] = []
-	for key, counts in social_counts.items():
-		stratum_id, hour, operator = key
-		total_weight = social_totals.get(key, 0.0)
-		if total_weight <= 0:
-			continue
-		social_rows.append({
-			"stratum_id": stratum_id,
-			"hour": hour,
-			"operator_group": operator,
-			"home_prob": counts.get("home", 0.0) / total_weight,
-			"with_spouse": counts.get("with_spouse", 0.0) / total_weight,
-			"with_child": counts.get("with_child", 0.0) / total_weight,
-			"with_friend": counts.get("with_friend", 0.0) / total_weight,
-			"alone_prob": counts.get("alone", 0.0) / total_weight,
-			"sample_n": len(social_samples.get(key, set())),
-			"weight_sum": total_weight,
-		})
+	hour_keys = ["stratum_id", "dow", "hour"]
+	hourly = df.groupby(hour_keys + ["operator"], sort=False)["weighted_minutes"].sum().reset_index()
+	hour_stats = df.groupby(hour_keys, sort=False).agg(
+		weight_sum=("weighted_minutes", "sum"),
+		sample_n=("TUCASEID", "nunique"),
+	)
+	hourly = hourly.join(hour_stats, on=hour_keys)
+	alpha_total = alpha * hourly.groupby(hour_keys, sort=False)["operator"].transform("size")
+	denominator = hourly["weight_sum"] + alpha_total
+	hourly["probability"] = np.where(
+		denominator > 0,
+		(hourly["weighted_minutes"] + alpha) / denominator.where(denominator > 0, 1.0),
+		0.0,
+	)
+	hourly_mix_rows = hourly.rename(columns={"operator": "operator_group"})[
+		["stratum_id", "dow", "hour", "operator_group", "probability", "sample_n", "weight_sum"]
+	].to_dict("records")
+
+	# Duration stats rows (weighted moments plus weighted quantiles)
+	duration_keys = ["stratum_id", "dow", "operator"]
+	df["wx2"] = df["weighted_minutes"] * df["duration"]
+	duration_groups = df.groupby(duration_keys, sort=False)
+	duration = duration_groups.agg(
+		sum_w=("weight", "sum"),
+		sum_wx=("weighted_minutes", "sum"),
+		sum_wx2=("wx2", "sum"),
+		sample_n=("weight", "size"),
+	).reset_index()
+	p10, p50, p90 = weighted_quantiles(
+		duration_groups.ngroup().to_numpy(),
+		df["duration"].to_numpy(),
+		df["weight"].to_numpy(),
+		[0.1, 0.5, 0.9],
+	).T
+	duration["p10_minutes"], duration["p50_minutes"], duration["p90_minutes"] = p10, p50, p90
+	duration = duration[duration["sum_w"] > 0]
+	mean = duration["sum_wx"] / duration["sum_w"]
+	duration["mean_minutes"] = mean
+	duration["sd_minutes"] = np.sqrt(np.maximum(duration["sum_wx2"] / duration["sum_w"] - mean ** 2, 0.0))
+	duration["weight_sum"] = duration["sum_w"]
+	duration_rows = duration.rename(columns={"operator": "operator_group"})[
+		["stratum_id", "dow", "operator_group", "mean_minutes", "sd_minutes", "p10_minutes", "p50_minutes",
+		 "p90_minutes", "sample_n", "weight_sum"]
+	].to_dict("records")
+
+	# Transition rows: consecutive activities within a case's diary
+	diary = (df["TUCASEID"] != df["TUCASEID"].shift()).cumsum()
+	df["prev_hour"] = df.groupby(diary)["hour"].shift(1)
+	df["prev_operator"] = df.groupby(diary)["operator"].shift(1)
+	steps = df[df["prev_operator"].notna()]
+	alpha_trans = 0.05
+	from_keys = ["stratum_id", "prev_hour", "prev_operator"]
+	transitions = steps.groupby(from_keys + ["operator"], sort=False)["weight"].sum().reset_index()
+	from_stats = steps.groupby(from_keys, sort=False).agg(
+		total=("weight", "sum"),
+		sample_n=("TUCASEID", "nunique"),
+	)
+	transitions = transitions.join(from_stats, on=from_keys)
+	transitions = transitions[transitions["total"] > 0]
+	outdegree = transitions.groupby(from_keys, sort=False)["operator"].transform("size")
+	transitions["probability"] = (transitions["weight"] + alpha_trans) / (transitions["total"] + alpha_trans * outdegree)
+	transitions["hour"] = transitions["prev_hour"].astype("int64")
+	transition_rows = transitions.rename(columns={"prev_operator": "from_operator", "operator": "to_operator"})[
+		["stratum_id", "hour", "from_operator", "to_operator", "probability", "sample_n"]
+	].to_dict("records")
+
+	# Social where rows (weight shares by location and companions)
+	social_flags = ["home", "with_spouse", "with_child", "with_friend", "alone"]
+	for flag in social_flags:
+		df[f"w_{flag}"] = df["weight"].where(df[flag], 0.0)
+	social = df.groupby(["stratum_id", "hour", "operator"], sort=False).agg(
+		weight_sum=("weight", "sum"),
+		sample_n=("TUCASEID", "nunique"),
+		**{flag: (f"w_{flag}", "sum") for flag in social_flags},
+	).reset_index()
+	social = social[social["weight_sum"] > 0]
+	for flag in social_flags:
+		social[flag] = social[flag] / social["weight_sum"]
+	social_rows = social.rename(columns={"operator": "operator_group", "home": "home_prob", "alone": "alone_prob"})[
+		["stratum_id", "hour", "operator_group", "home_prob", "with_spouse", "with_child", "with_friend",
+		 "alone_prob", "sample_n", "weight_sum"]
+	].to_dict("records")
+
+	# Weekly presence aggregated by stratum/operator from per-case operator minutes
+	case_operator = df.groupby(["TUCASEID", "operator"], sort=False).agg(
+		minutes=("duration", "sum"),
+		stratum_id=("stratum_id", "first"),
+		weight=("weight", "first"),
+	)
+	case_operator["minutes_weighted"] = case_operator["minutes"] * case_operator["weight"]
+	case_operator["presence_weight"] = case_operator["weight"].where(case_operator["minutes"] > 0, 0.0)
+	weekly = case_operator.groupby(["stratum_id", "operator"], sort=False).agg(
+		weight_sum=("weight", "sum"),
+		minutes_weighted=("minutes_weighted", "sum"),
+		presence_weight=("presence_weight", "sum"),
+		sample_n=("weight", "size"),
+	).reset_index()
+	weekly = weekly[weekly["weight_sum"] > 0]
+	weekly["presence_rate"] = weekly["presence_weight"] / weekly["weight_sum"]
+	weekly["mean_minutes_per_week"] = weekly["minutes_weighted"] / weekly["weight_sum"]
+	weekly_presence_rows = weekly.rename(columns={"operator": "operator_group"})[
+		["stratum_id", "operator_group", "presence_rate", "mean_minutes_per_week", "sample_n", "weight_sum"]
+	].to_dict("records")
 
 	return hourly_mix_rows, duration_rows, transition_rows, social_rows, weekly_presence_rows
 
@@ -604,11 +567,8 @@ def run_precompute(dry_run: bool = False) -> None:
 	companion_map = fetch_who_data(db)
 
 	print("[atus_precompute] Loading activities...")
-	activities_raw = fetch_activities(db)
-	# Count first for progress bar
-	activities_list = list(activities_raw)
-	print(f"  Loaded {len(activities_list)} activities")
-	activities = activities_list
+	activities = fetch_activities(db)
+	print(f"  Loaded {len(activities)} activities")
 
 	operator_lookup = {
 		row["six_digit_activity_code"]: row["operator_group"]
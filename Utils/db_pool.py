@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Pooled MySQL Connections
+
+Keeps a pool of open connections per database so hot query paths (agent and
+L2 lookups) skip the connect/auth handshake on every call. Each pooled
+connection also keeps its server-side prepared statements, so fixed queries
+are parsed and planned once per connection.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from contextlib import closing, contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import mysql.connector
+
+from Utils.environment_config import get_database_config
+
+POOL_SIZE = max(1, int(os.getenv('DB_AGENTS_POOL_SIZE', '50')))
+
+
+class PooledConnection:
+    """An open connection plus the prepared cursors created on it."""
+    __slots__ = ('cnx', 'statements')
+
+    def __init__(self, cnx):
+        self.cnx = cnx
+        self.statements: Dict[str, Any] = {}
+
+
+class BlockingConnectionPool:
+    """Fixed-size connection pool; checkout waits for a free connection."""
+
+    def __init__(self, database: str, size: int = POOL_SIZE):
+        """
+        Create the pool (connects once up front to validate the configuration).
+
+        Args:
+            database: Default database for pooled connections
+            size: Maximum number of open connections
+        """
+        db_config = get_database_config()
+        self._connect_args = dict(
+            host=db_config['host'],
+            port=db_config['port'],
+            user=db_config['user'],
+            password=db_config['password'],
+            database=database,
+            charset='utf8mb4',
+            collation='utf8mb4_unicode_ci',
+            autocommit=True
+        )
+        # LIFO keeps recently used (warm) connections in play; None = not yet connected
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+        for _ in range(size - 1):
+            self._idle.put(None)
+        self._idle.put(PooledConnection(mysql.connector.connect(**self._connect_args)))
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """Check out a connection, blocking until one is free; returned to the pool on exit."""
+        pooled = self._idle.get()
+        try:
+            if pooled is None:
+                pooled = PooledConnection(mysql.connector.connect(**self._connect_args))
+            yield pooled
+        except (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError):
+            # Drop a broken connection; the slot reconnects on next use
+            if pooled is not None:
+                try:
+                    pooled.cnx.close()
+                except Exception:
+                    pass
+            pooled = None
+            raise
+        finally:
+            self._idle.put(pooled)
+
+
+_pools: Dict[str, Optional[BlockingConnectionPool]] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database: str) -> Optional[BlockingConnectionPool]:
+    """Return the shared pool for a database, or None if it could not be created."""
+    pool = _pools.get(database)
+    if pool is not None or database in _pools:
+        return pool
+    with _pools_lock:
+        if database not in _pools:
+            try:
+                _pools[database] = BlockingConnectionPool(database)
+            except Exception as e:
+                print(f"Warning: Could not create connection pool for {database}: {e}")
+                _pools[database] = None
+    return _pools[database]
+
+
+def execute_pooled(pool: BlockingConnectionPool, query: str, params=None,
+                   fetch: bool = True, prepared: bool = False) -> Union[List[Dict[str, Any]], bool]:
+    """
+    Run one statement on a pooled connection.
+
+    Args:
+        pool: Pool from get_pool()
+        query: SQL statement
+        params: Statement parameters
+        fetch: Return rows (list of dicts) instead of a success flag
+        prepared: Use a server-side prepared statement cached on the connection
+            (for fixed query strings that run many times)
+
+    Returns:
+        Rows when fetch=True, else True; errors propagate as mysql.connector.Error
+    """
+    with pool.connection() as pooled:
+        if not prepared:
+            with closing(pooled.cnx.cursor(dictionary=True)) as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchall() if fetch else True
+
+        # A prepared cursor re-executes its statement while the query string is unchanged
+        cursor = pooled.statements.get(query)
+        if cursor is None:
+            cursor = pooled.statements[query] = pooled.cnx.cursor(prepared=True)
+        cursor.execute(query, params)
+        if not fetch:
+            return True
+        rows = cursor.fetchall()
+        names = cursor.column_names
+        return [dict(zip(names, row)) for row in rows]
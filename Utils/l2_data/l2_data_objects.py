@@ -766,12 +766,30 @@ class MobileAdvertisingInfo:
     maid_ip_4: Optional[str] = None
     maid_ip_5: Optional[str] = None
 
+class _FieldRecorder(dict):
+    """Empty row that records every field name looked up in it."""
+    
+    def __init__(self):
+        super().__init__()
+        self.fields = set()
+    
+    def get(self, key, default=None):
+        self.fields.add(key)
+        return default
+    
+    def __contains__(self, key):
+        self.fields.add(key)
+        return False
+
+
 class L2DataRow:
     """
     Comprehensive L2 data row containing all voter information.
     Based on actual field names from the test data.
     """
     
+    _fields_read: Optional[frozenset] = None
+    
     def __init__(self, data: Dict[str, Any]):
         """
         Initialize with raw L2 data dictionary.
@@ -1802,6 +1820,20 @@ class L2DataRow:
             return [item.strip() for item in value.split(';') if item.strip()]
         return None
     
+    @classmethod
+    def fields_read(cls) -> frozenset:
+        """
+        Return the raw L2 field names this class looks up while parsing.
+        
+        Found by parsing an empty row that records every key requested, so
+        the set follows the _parse_* methods without a separate field list.
+        """
+        if cls._fields_read is None:
+            recorder = _FieldRecorder()
+            cls(recorder)
+            cls._fields_read = frozenset(recorder.fields)
+        return cls._fields_read
+    
     def get_data_point(self, key: str) -> Any:
         """Get a specific data point from raw data."""
         return self.raw_data.get(key, None)
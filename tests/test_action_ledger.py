@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Tests for the append-only action ledger."""
+
+from datetime import datetime
+
+import pytest
+
+from Utils.action_ledger import ActionLedger
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _record(ledger, i):
+    ledger.record(NOW, 7, f"agent-{i}", "move", {"to": i}, [], [])
+
+
+def test_records_reach_disk_immediately_by_default(tmp_path):
+    ledger = ActionLedger(str(tmp_path / "ledger.jsonl"))
+    _record(ledger, 1)
+
+    assert (tmp_path / "ledger.jsonl").read_bytes().count(b"\n") == 1
+    ledger.close()
+
+
+def _agents(records):
+    return [rec["agent_id"] for rec in records]
+
+
+def test_reopen_appends_and_reads_back(tmp_path):
+    path = str(tmp_path / "ledger.jsonl")
+    with ActionLedger(path) as ledger:
+        _record(ledger, 1)
+    with ActionLedger(path, flush_every=10) as ledger:
+        _record(ledger, 2)
+        assert _agents(ledger.read_all()) == ["agent-1", "agent-2"]
+
+
+def test_gzip_ledger_round_trip(tmp_path):
+    with ActionLedger(str(tmp_path / "ledger.jsonl"), compress=True) as ledger:
+        _record(ledger, 1)
+        _record(ledger, 2)
+    assert (tmp_path / "ledger.jsonl.gz").exists()
+
+    with ActionLedger(str(tmp_path / "ledger.jsonl"), compress=True) as ledger:
+        _record(ledger, 3)
+        assert _agents(ledger.iter_records()) == ["agent-1", "agent-2", "agent-3"]
+
+
+def test_msgpack_ledger_round_trip_keeps_format_on_reopen(tmp_path):
+    pytest.importorskip("msgpack")
+    path = str(tmp_path / "ledger.jsonl")
+    with ActionLedger(path, fmt="msgpack") as ledger:
+        _record(ledger, 1)
+    with ActionLedger(path) as ledger:
+        assert ledger.fmt == "msgpack"
+        _record(ledger, 2)
+        assert _agents(ledger.read_all()) == ["agent-1", "agent-2"]
+
+
+def test_rotation_starts_numbered_segments(tmp_path):
+    with ActionLedger(str(tmp_path / "ledger.jsonl"), rotate_bytes=1) as ledger:
+        for i in range(3):
+            _record(ledger, i)
+        assert _agents(ledger.read_all()) == ["agent-0", "agent-1", "agent-2"]
+    assert (tmp_path / "ledger.00002.jsonl").exists()
+
+    # Reopening resumes the newest segment
+    with ActionLedger(str(tmp_path / "ledger.jsonl"), rotate_bytes=1) as ledger:
+        _record(ledger, 3)
+        assert _agents(ledger.read_all())[-1] == "agent-3"
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"compress": True}, {"fmt": "msgpack"}])
+def test_export_jsonl_default_destination(tmp_path, kwargs):
+    if kwargs.get("fmt") == "msgpack":
+        pytest.importorskip("msgpack")
+    with ActionLedger(str(tmp_path / "action_ledger.jsonl"), **kwargs) as ledger:
+        _record(ledger, 1)
+        out = ledger.export_jsonl()
+
+    assert out == tmp_path / "action_ledger.export.jsonl"
+    assert b'"agent_id":"agent-1"' in out.read_bytes()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Tests for AgentInitializer's bulk summary extraction."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+pytest.importorskip("pandas")
+agent_initializer = pytest.importorskip("Utils.agent_initializer")
+AgentInitializer = agent_initializer.AgentInitializer
+
+
+def test_bulk_address_with_null_zip_in_batch(monkeypatch):
+    l2_data = {
+        'V1': {'LALVOTERID': 'V1', 'Residence_Addresses_HouseNumber': '12',
+               'Residence_Addresses_StreetName': 'Main St', 'Residence_Addresses_City': 'Springfield',
+               'Residence_Addresses_Zip': 12345},
+        'V2': {'LALVOTERID': 'V2', 'Residence_Addresses_HouseNumber': '7',
+               'Residence_Addresses_StreetName': 'Oak Ave', 'Residence_Addresses_City': 'Shelbyville',
+               'Residence_Addresses_Zip': None},
+    }
+    monkeypatch.setattr(AgentInitializer, 'get_l2_data_bulk', lambda self, voter_ids: l2_data)
+
+    summaries = AgentInitializer().get_agent_summaries_bulk(['V1', 'V2'])
+
+    assert summaries['V1']['address'] == '12, Main St, Springfield, 12345'
+    assert summaries['V2']['address'] == '7, Oak Ave, Shelbyville'
@@ -0,0 +1,21 @@
+from Utils.atus.analyze_atus_data import analyze_file_structure
+
+
+def test_header_only_file_analyzes_zero_rows(tmp_path):
+    path = tmp_path / "atuswho_0324.dat"
+    path.write_text("TUCASEID,TULINENO\n")
+
+    result = analyze_file_structure(path)
+
+    assert result["rows_analyzed"] == 0
+    assert result["column_nulls"] == {"TUCASEID": 0, "TULINENO": 0}
+
+
+def test_short_rows_are_padded(tmp_path):
+    path = tmp_path / "atuswho_0324.dat"
+    path.write_text("TUCASEID,TULINENO\n1,2\n1\n")
+
+    result = analyze_file_structure(path)
+
+    assert result["rows_analyzed"] == 2
+    assert result["column_nulls"] == {"TUCASEID": 0, "TULINENO": 1}
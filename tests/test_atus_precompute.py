@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""Tests for the ATUS precompute aggregations against the original per-row loop."""
+
+import math
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pandas")
+atus_precompute = pytest.importorskip("Utils.atus.atus_precompute")
+
+
+# -----------------------------------------------------------------------------
+# Reference implementations (the original Python loops)
+# -----------------------------------------------------------------------------
+
+def _reference_classify_operator(major, tier, code, activity):
+    act_lower = (activity or "").lower()
+
+    if code.startswith("0101"):
+        return "sleep"
+    if major == "01":
+        return "personal_care"
+    if major == "02":
+        if tier.startswith("0202"):
+            return "meal_prep"
+        return "household_chore"
+    if major == "03":
+        return "childcare"
+    if major == "04":
+        return "work_onsite"
+    if major == "05":
+        return "attend_class"
+    if major == "06":
+        if "grocery" in act_lower or "food shopping" in act_lower or "supermarket" in act_lower:
+            return "grocery_shop"
+        return "retail_shop"
+    if major == "07":
+        if "medical" in act_lower or "doctor" in act_lower or "health" in act_lower:
+            return "medical"
+        if "pharmacy" in act_lower or "prescription" in act_lower:
+            return "pharmacy"
+        return "personal_care_out"
+    if major == "08":
+        if "sports" in act_lower or "exercise" in act_lower:
+            return "exercise"
+        if "religious" in act_lower or "spiritual" in act_lower:
+            return "religious"
+        if "volunteer" in act_lower:
+            return "volunteer"
+        if "socializing" in act_lower:
+            return "socialize"
+        if "arts" in act_lower or "entertainment" in act_lower or "recreation" in act_lower:
+            return "leisure_out"
+        return "leisure_home"
+    if major == "09":
+        return "eat_meal"
+    if major == "10":
+        return "household_management"
+    if major in ("11", "15", "16", "18"):
+        return "travel_support"
+    if major == "14":
+        return "leisure_out"
+    return "other"
+
+
+def _reference_quantiles(values, quantiles):
+    # Smallest duration whose cumulative weight reaches q * total, scanned per quantile
+    values_sorted = sorted(values, key=lambda x: x[0])
+    total = sum(w for _, w in values_sorted)
+    results = []
+    for q in quantiles:
+        cumulative = 0.0
+        for duration, weight in values_sorted:
+            cumulative += weight
+            if cumulative >= q * total:
+                results.append(duration)
+                break
+        else:
+            results.append(values_sorted[-1][0])
+    return results
+
+
+def _reference_distributions(case_rows, case_to_stratum, operator_lookup, activities, companion_map):
+    case_meta = {
+        row["TUCASEID"]: {"weight": float(row.get("TUFNWGTP") or 0.0), "dow": int(row.get("TUDIARYDAY") or 1)}
+        for row in case_rows
+    }
+
+    hourly_minutes = defaultdict(float)
+    hourly_totals = defaultdict(float)
+    hourly_samples = defaultdict(set)
+    duration_values = defaultdict(list)
+    transition_counts = defaultdict(float)
+    transition_totals = defaultdict(float)
+    transition_samples = defaultdict(set)
+    social_counts = defaultdict(lambda: defaultdict(float))
+    social_totals = defaultdict(float)
+    social_samples = defaultdict(set)
+    case_operator_minutes = defaultdict(float)
+
+    current_case = None
+    current_sequence = []
+    for act in activities:
+        tucaseid = act["TUCASEID"]
+        if tucaseid not in case_to_stratum or tucaseid not in case_meta:
+            continue
+        stratum_id = case_to_stratum[tucaseid]
+        weight = case_meta[tucaseid]["weight"]
+        if weight <= 0:
+            continue
+        operator = operator_lookup.get(act["TRCODEP"])
+        if not operator:
+            continue
+        dow = case_meta[tucaseid]["dow"]
+        hour = atus_precompute.parse_start_hour(act["TUSTARTTIM"])
+        duration = float(act.get("TUACTDUR24") or 0.0)
+        if duration <= 0:
+            continue
+
+        hourly_minutes[(stratum_id, dow, hour, operator)] += duration * weight
+        hourly_totals[(stratum_id, dow, hour)] += duration * weight
+        hourly_samples[(stratum_id, dow, hour)].add(tucaseid)
+
+        duration_values[(stratum_id, dow, operator)].append((duration, weight))
+
+        comp_codes = companion_map.get((tucaseid, act["TUACTIVITY_N"]), [])
+        key_social = (stratum_id, hour, operator)
+        social_totals[key_social] += weight
+        if atus_precompute.is_home_location(act.get("TEWHERE")):
+            social_counts[key_social]["home"] += weight
+        if 18 in comp_codes:
+            social_counts[key_social]["with_spouse"] += weight
+        if set(comp_codes) & {20, 21, 22, 40}:
+            social_counts[key_social]["with_child"] += weight
+        if set(comp_codes) & set(range(30, 38)):
+            social_counts[key_social]["with_friend"] += weight
+        if not comp_codes:
+            social_counts[key_social]["alone"] += weight
+        social_samples[key_social].add(tucaseid)
+
+        if current_case != tucaseid:
+            current_case = tucaseid
+            current_sequence = []
+        current_sequence.append((hour, operator))
+        if len(current_sequence) >= 2:
+            prev_hour, prev_operator = current_sequence[-2]
+            transition_counts[(stratum_id, prev_hour, prev_operator, operator)] += weight
+            transition_totals[(stratum_id, prev_hour, prev_operator)] += weight
+            transition_samples[(stratum_id, prev_hour, prev_operator)].add(tucaseid)
+
+        case_operator_minutes[(tucaseid, operator)] += duration
+
+    hourly_mix = []
+    operator_counts = defaultdict(int)
+    for (sid, d, h, _op) in hourly_minutes:
+        operator_counts[(sid, d, h)] += 1
+    for (sid, d, h, op), minutes in hourly_minutes.items():
+        total = hourly_totals[(sid, d, h)]
+        alpha_total = 0.1 * operator_counts[(sid, d, h)]
+        hourly_mix.append({
+            "stratum_id": sid, "dow": d, "hour": h, "operator_group": op,
+            "probability": (minutes + 0.1) / (total + alpha_total),
+            "sample_n": len(hourly_samples[(sid, d, h)]), "weight_sum": total,
+        })
+
+    duration_rows = []
+    for (sid, d, op), values in duration_values.items():
+        sum_w = sum(w for _, w in values)
+        mean = sum(x * w for x, w in values) / sum_w
+        var = max(sum(x * x * w for x, w in values) / sum_w - mean ** 2, 0.0)
+        p10, p50, p90 = _reference_quantiles(values, [0.1, 0.5, 0.9])
+        duration_rows.append({
+            "stratum_id": sid, "dow": d, "operator_group": op, "mean_minutes": mean, "sd_minutes": math.sqrt(var),
+            "p10_minutes": p10, "p50_minutes": p50, "p90_minutes": p90,
+            "sample_n": len(values), "weight_sum": sum_w,
+        })
+
+    transition_rows = []
+    outdegree = defaultdict(int)
+    for (sid, h, from_op, _to_op) in transition_counts:
+        outdegree[(sid, h, from_op)] += 1
+    for (sid, h, from_op, to_op), count in transition_counts.items():
+        total = transition_totals[(sid, h, from_op)]
+        transition_rows.append({
+            "stratum_id": sid, "hour": h, "from_operator": from_op, "to_operator": to_op,
+            "probability": (count + 0.05) / (total + 0.05 * outdegree[(sid, h, from_op)]),
+            "sample_n": len(transition_samples[(sid, h, from_op)]),
+        })
+
+    social_rows = []
+    for key, total in social_totals.items():
+        sid, h, op = key
+        counts = social_counts[key]
+        social_rows.append({
+            "stratum_id": sid, "hour": h, "operator_group": op,
+            "home_prob": counts.get("home", 0.0) / total,
+            "with_spouse": counts.get("with_spouse", 0.0) / total,
+            "with_child": counts.get("with_child", 0.0) / total,
+            "with_friend": counts.get("with_friend", 0.0) / total,
+            "alone_prob": counts.get("alone", 0.0) / total,
+            "sample_n": len(social_samples[key]), "weight_sum": total,
+        })
+
+    weekly = defaultdict(lambda: [0.0, 0.0, 0.0, 0])
+    for (case_id, op), minutes in case_operator_minutes.items():
+        weight = case_meta[case_id]["weight"]
+        acc = weekly[(case_to_stratum[case_id], op)]
+        acc[0] += weight
+        acc[1] += minutes * weight
+        acc[2] += weight if minutes > 0 else 0.0
+        acc[3] += 1
+    weekly_rows = [
+        {
+            "stratum_id": sid, "operator_group": op, "presence_rate": presence / weight_sum,
+            "mean_minutes_per_week": minutes_weighted / weight_sum, "sample_n": n, "weight_sum": weight_sum,
+        }
+        for (sid, op), (weight_sum, minutes_weighted, presence, n) in weekly.items()
+    ]
+
+    return hourly_mix, duration_rows, transition_rows, social_rows, weekly_rows
+
+
+# -----------------------------------------------------------------------------
+# Synthetic ATUS-shaped input
+# -----------------------------------------------------------------------------
+
+def _synthetic_inputs(seed):
+    rng = np.random.default_rng(seed)
+    codes = [f"{major:02d}{minor:04d}" for major in (1, 2, 5, 6, 8, 11) for minor in (101, 201, 301)]
+    operator_lookup = {code: ("sleep", "eat_meal", "work_onsite", "leisure_home")[i % 4]
+                       for i, code in enumerate(codes[:-3])}
+
+    case_rows = []
+    case_to_stratum = {}
+    for i in range(60):
+        case_id = f"2024{i:06d}"
+        weight = (None, 0.0, "")[i % 3] if i % 11 == 0 else float(rng.uniform(1e3, 3e4))
+        case_rows.append({"TUCASEID": case_id, "TUFNWGTP": weight, "TUDIARYDAY": int(rng.integers(1, 8))})
+        if i % 13 != 5:
+            case_to_stratum[case_id] = int(rng.integers(1, 4))
+    # A repeated case id keeps its last metadata row
+    case_rows.append(dict(case_rows[3], TUFNWGTP=12345.0))
+
+    start_times = ["04:00:00", "07:30:00", "12:15:00", "18:45:00", "23:59:00", "25:10:00", "bad", None]
+    activities = []
+    companion_map = defaultdict(list)
+    for row in case_rows[:-1]:
+        for n in range(1, int(rng.integers(1, 15)) + 1):
+            duration = (None, 0, -5)[n % 3] if rng.random() < 0.05 else int(rng.choice([5, 10, 15, 30, 60, 90, 240]))
+            activities.append({
+                "TUCASEID": row["TUCASEID"],
+                "TUACTIVITY_N": n,
+                "TUSTARTTIM": start_times[int(rng.integers(len(start_times)))],
+                "TRCODEP": None if rng.random() < 0.03 else codes[int(rng.integers(len(codes)))],
+                "TUACTDUR24": duration,
+                "TEWHERE": None if rng.random() < 0.1 else int(rng.integers(-1, 10)),
+            })
+            for _ in range(int(rng.integers(0, 3))):
+                companion_map[(row["TUCASEID"], n)].append(int(rng.choice([18, 20, 22, 31, 37, 40, 52, 300])))
+    return case_rows, case_to_stratum, operator_lookup, activities, dict(companion_map)
+
+
+_ROW_KEYS = (
+    ("stratum_id", "dow", "hour", "operator_group"),
+    ("stratum_id", "dow", "operator_group"),
+    ("stratum_id", "hour", "from_operator", "to_operator"),
+    ("stratum_id", "hour", "operator_group"),
+    ("stratum_id", "operator_group"),
+)
+
+
+def _by_key(rows, keys):
+    return {tuple(row[k] for k in keys): row for row in rows}
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("as_frame", [False, True])
+def test_compute_distributions_matches_reference_loop(seed, as_frame):
+    case_rows, case_to_stratum, operator_lookup, activities, companion_map = _synthetic_inputs(seed)
+    expected = _reference_distributions(case_rows, case_to_stratum, operator_lookup, activities, companion_map)
+    source = atus_precompute.pd.DataFrame.from_records(activities, columns=atus_precompute.ACTIVITY_COLUMNS) \
+        if as_frame else activities
+    actual = atus_precompute.compute_distributions(case_rows, case_to_stratum, operator_lookup, source, companion_map)
+
+    for expected_rows, actual_rows, keys in zip(expected, actual, _ROW_KEYS):
+        assert expected_rows
+        expected_by_key = _by_key(expected_rows, keys)
+        actual_by_key = _by_key(actual_rows, keys)
+        assert len(actual_by_key) == len(actual_rows)
+        assert actual_by_key.keys() == expected_by_key.keys()
+        for key, row in expected_by_key.items():
+            got = actual_by_key[key]
+            assert got.keys() == row.keys()
+            for column, value in row.items():
+                # sd is sqrt(E[x^2] - mean^2), which only agrees to summation noise near zero
+                assert got[column] == pytest.approx(value, rel=1e-9, abs=1e-5 if column == "sd_minutes" else 1e-9), \
+                    (key, column)
+
+
+def test_compute_distributions_empty_inputs():
+    assert atus_precompute.compute_distributions([], {}, {}, [], {}) == ([], [], [], [], [])
+
+
+def test_weighted_quantiles_matches_per_group_scan():
+    rng = np.random.default_rng(7)
+    groups = rng.integers(0, 20, size=500)
+    groups[:20] = np.arange(20)
+    durations = rng.choice([5.0, 10.0, 15.0, 30.0, 60.0, 120.0], size=500)
+    weights = rng.uniform(1e3, 3e4, size=500)
+    quantiles = [0.1, 0.5, 0.9]
+
+    result = atus_precompute.weighted_quantiles(groups, durations, weights, quantiles)
+
+    for group in range(20):
+        members = groups == group
+        expected = _reference_quantiles(list(zip(durations[members], weights[members])), quantiles)
+        assert list(result[group]) == expected
+
+
+def test_classify_operator_matches_reference():
+    tiers = ("0101", "0201", "0202", "0601", "0801")
+    codes = ("010101", "010201", "020201", "060101", "080101")
+    activities = (
+        "", None, "Grocery shopping", "Shopping, except groceries", "Medical and care services",
+        "Using pharmacy services", "Doctor visit for HEALTH", "Sports, exercise, and recreation",
+        "Religious and spiritual activities", "Volunteer activities", "Socializing and communicating",
+        "Arts and entertainment", "Supermarket run", "Filling a prescription",
+    )
+    for major in (f"{n:02d}" for n in range(0, 20)):
+        for tier in tiers:
+            for code in codes:
+                for activity in activities:
+                    assert atus_precompute.classify_operator(major, tier, code, activity) == \
+                        _reference_classify_operator(major, tier, code, activity), (major, tier, code, activity)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Tests for the Qdrant memory store's client-side helpers (no server needed)."""
+
+import json
+from dataclasses import asdict
+from types import SimpleNamespace
+
+from Setup.qdrant_memory_db import Memory, QdrantMemoryDB, _content_minhash, _copy_memories, _decode_minhash
+
+
+def _memory(**overrides):
+    fields = dict(memory_id="m1", agent_id="a1", content="went to the store", memory_type="episodic",
+                  importance=0.5, timestamp=1.0, created_at=1.0)
+    fields.update(overrides)
+    return Memory(**fields)
+
+
+def test_memory_keeps_vector_embedding_as_passed():
+    memory = _memory(vector_embedding=[0.1, 0.2, 0.3])
+
+    assert memory.vector_embedding == [0.1, 0.2, 0.3]
+    assert json.loads(json.dumps(asdict(memory)))["vector_embedding"] == [0.1, 0.2, 0.3]
+
+
+def _db(content_similarity=False):
+    # The payload helpers don't touch the client, so skip connecting
+    db = object.__new__(QdrantMemoryDB)
+    db.content_similarity = content_similarity
+    return db
+
+
+def test_payload_stores_known_enum_values_as_codes_only():
+    payload = _db()._payload_of(_memory(event_type="decision", environment="garage"))
+
+    assert "event_type" not in payload and isinstance(payload["event_type_i"], int)
+    assert payload["environment"] == "garage" and "environment_i" not in payload
+
+
+def test_point_round_trip_and_fallbacks():
+    db = _db()
+    memory = _memory(event_type="decision", emotional_state="happy", environment="garage")
+    restored = db._point_to_memory(SimpleNamespace(id="m1", payload=db._payload_of(memory)))
+    assert (restored.event_type, restored.emotional_state, restored.environment) == ("decision", "happy", "garage")
+
+    # Points written before the codes carry strings; unknown codes fall back to them or the default
+    legacy = db._point_to_memory(SimpleNamespace(id="m2", payload={"event_type": "social", "emotional_state_i": 999}))
+    assert legacy.event_type == "social"
+    assert legacy.emotional_state == "neutral"
+
+
+def test_minhash_only_stored_when_enabled_and_compact():
+    memory = _memory(content="the cat sat on the mat")
+    assert "minhash" not in _db()._payload_of(memory)
+
+    encoded = _db(content_similarity=True)._payload_of(memory)["minhash"]
+    assert len(encoded) < 200
+    assert (_decode_minhash(encoded) == _content_minhash(memory.content)).all()
+    # Signatures in the old hex format are skipped rather than misread
+    assert _decode_minhash("ab" * 512) is None
+
+
+def test_minhash_estimates_jaccard():
+    a = _content_minhash("one two three four five six seven eight")
+    b = _content_minhash("one two three four five six seven nine")
+    c = _content_minhash("alpha beta gamma delta")
+    assert (a == b).mean() > (a == c).mean()
+
+
+def test_copy_memories_does_not_share_mutable_state():
+    cached = [_memory(participants=["bob"])]
+    handed_out = _copy_memories(cached)
+    handed_out[0].content = "changed"
+    handed_out[0].participants.append("eve")
+
+    assert cached[0].content == "went to the store"
+    assert cached[0].participants == ["bob"]
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""Tests for runtime configuration URL helpers."""
+
+from Setup.runtime_config import ServicesConfig
+
+
+def test_service_urls():
+    services = ServicesConfig(qdrant_host="qdrant", qdrant_http_port=1002, qdrant_grpc_port=1003,
+                              phpmyadmin_port=1005, grafana_port=1006)
+
+    assert services.qdrant_base_url == "http://qdrant:1002"
+    assert services.qdrant_collections_url() == "http://qdrant:1002/collections"
+    assert services.qdrant_collection_url("agent_memories") == "http://qdrant:1002/collections/agent_memories"
+    assert services.grafana_url == "http://localhost:1006"
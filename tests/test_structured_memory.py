@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Tests for structured memory construction and the columnar memory containers."""
+
+from Setup.structured_memory import MemoryBuilder, MemoryStore, StructuredMemory
+
+
+def _fields(**overrides):
+    fields = dict(memory_id="m1", agent_id="a1", timestamp=0.0, created_at=0.0, event_type="general",
+                  environment="home", location="unknown", source="agent", target="self", participants=[],
+                  emotional_state="neutral", impact_score=1.0, analysis_type="automatic",
+                  personal_significance=0.0, context_description="", learning_outcome="",
+                  future_implications="", context_tags=[])
+    fields.update(overrides)
+    return fields
+
+
+def test_personal_narrative_can_be_supplied():
+    memory = StructuredMemory(**_fields(personal_narrative="I remember this."))
+
+    assert memory.personal_narrative == "I remember this."
+    assert memory.to_dict()["personal_narrative"] == "I remember this."
+
+
+def test_personal_narrative_built_lazily_from_event_fields():
+    memory = MemoryBuilder("a1").create_memory_from_event(event_description="a parade", impact_score=8.0)
+
+    assert memory.personal_narrative.startswith("This was a highly significant event for me.")
+    assert "The event involved: a parade" in memory.personal_narrative
+
+
+def test_store_row_keeps_supplied_narrative_and_float64_impact():
+    store = MemoryStore()
+    store.append(StructuredMemory(**_fields(personal_narrative="custom")))
+    batch = MemoryBuilder("a1").create_many({"event_description": ["x"], "impact_score": [7.00000001]})
+    store.extend(batch)
+
+    assert store.row(0).personal_narrative == "custom"
+    assert batch[0].personal_narrative.startswith("This was a highly significant event for me.")
+    assert store.row(1).impact_score == 7.00000001
+
+
+def test_create_many_defaults_missing_labels():
+    batch = MemoryBuilder("a1").create_many({
+        "event_description": ["a", "b", "c"],
+        "event_type": ["decision", None, float("nan")],
+        "emotional_state": [3, "happy", None],
+    })
+
+    assert batch.event_types == ["decision", "general", "general"]
+    assert batch.emotional_states == ["neutral", "happy", "neutral"]